@@ -86,6 +86,10 @@ class ActivityAdapter(AdapterBase):
         return [None]
 
     def extra_kwargs(self, message_type, source, sources, **kwargs):
+        if message_type == MESSAGES.NEW_REVIEW:
+            # Not even applicants who are reviewers see reviews in their feed
+            return {"visibility": TEAM, "hidden_from_applicants": True}
+
         if message_type in [
             MESSAGES.OPENED_SEALED,
             MESSAGES.REVIEWERS_UPDATED,
@@ -97,7 +101,6 @@ class ActivityAdapter(AdapterBase):
             MESSAGES.REQUEST_PROJECT_CHANGE,
             MESSAGES.SEND_FOR_APPROVAL,
             MESSAGES.APPROVE_PAF,
-            MESSAGES.NEW_REVIEW,
             MESSAGES.UPDATE_PROJECT_LEAD,
             MESSAGES.UPDATE_LEAD,
             MESSAGES.BATCH_UPDATE_LEAD,
@@ -343,6 +346,7 @@ class ActivityAdapter(AdapterBase):
             timestamp=timezone.now(),
             message=message,
             visibility=visibility,
+            hidden_from_applicants=kwargs.get("hidden_from_applicants", False),
             related_object=related_object,
         )
 
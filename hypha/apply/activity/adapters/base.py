@@ -1,5 +1,11 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
 from django.conf import settings
 from django.contrib import messages
+from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from hypha.apply.activity.options import MESSAGES
@@ -43,10 +49,30 @@ neat_related = {
     MESSAGES.UPDATE_AUTHOR: "old_author",
 }
 
+# Messages already rendered while processing a message, by template and context.
+# Recipients that would get the same message share a single render.
+rendered_messages: ContextVar = ContextVar("rendered_messages", default=None)
+
+
+@contextmanager
+def rendering():
+    if rendered_messages.get() is not None:
+        yield
+        return
+    token = rendered_messages.set({})
+    try:
+        yield
+    finally:
+        rendered_messages.reset(token)
+
 
 class AdapterBase:
     messages: dict = {}
     always_send = False
+    # Deliver through the outbox, by a worker, rather than during the request
+    deliver_async = False
+    # Fold messages of the `MESSAGE_COALESCE_TYPES` into one delivery per recipient
+    can_coalesce = False
 
     def message(self, message_type, **kwargs):
         try:
@@ -103,24 +129,25 @@ class AdapterBase:
     def process_batch(
         self, message_type, events, request, user, sources, related=None, **kwargs
     ):
-        events_by_source = {event.source.id: event for event in events}
-        for recipient in self.batch_recipients(
-            message_type, sources, user=user, **kwargs
-        ):
-            recipients = recipient["recipients"]
-            sources = recipient["sources"]
-            events = [events_by_source[source.id] for source in sources]
-            self.process_send(
-                message_type,
-                recipients,
-                events,
-                request,
-                user,
-                sources=sources,
-                source=None,
-                related=related,
-                **kwargs,
-            )
+        events_by_source = {event.object_id: event for event in events}
+        with rendering():
+            for recipient in self.batch_recipients(
+                message_type, sources, user=user, **kwargs
+            ):
+                recipients = recipient["recipients"]
+                sources = recipient["sources"]
+                events = [events_by_source[source.id] for source in sources]
+                self.process_send(
+                    message_type,
+                    recipients,
+                    events,
+                    request,
+                    user,
+                    sources=sources,
+                    source=None,
+                    related=related,
+                    **kwargs,
+                )
 
     def process(
         self, message_type, event, request, user, source, related=None, **kwargs
@@ -133,16 +160,17 @@ class AdapterBase:
             request=request,
             **kwargs,
         )
-        self.process_send(
-            message_type,
-            recipients,
-            [event],
-            request,
-            user,
-            source,
-            related=related,
-            **kwargs,
-        )
+        with rendering():
+            self.process_send(
+                message_type,
+                recipients,
+                [event],
+                request,
+                user,
+                source,
+                related=related,
+                **kwargs,
+            )
 
     def process_send(
         self,
@@ -184,7 +212,17 @@ class AdapterBase:
 
             message_logs = self.create_logs(message, recipient, *events)
 
-            if settings.SEND_MESSAGES or self.always_send:
+            if (settings.SEND_MESSAGES or self.always_send) and self.coalesces(
+                message_type
+            ):
+                status = self.coalesce_message(
+                    message_type,
+                    message,
+                    recipient=recipient,
+                    logs=message_logs,
+                    **kwargs,
+                )
+            elif settings.SEND_MESSAGES or self.always_send:
                 status = self.send_message(
                     message, recipient=recipient, logs=message_logs, **kwargs
                 )
@@ -224,3 +262,54 @@ class AdapterBase:
         # Process the message, should return the result of the send
         # Returning None will not record this action
         raise NotImplementedError()
+
+    def coalesces(self, message_type):
+        return (
+            self.can_coalesce
+            and settings.MESSAGE_COALESCE_WINDOW > 0
+            and message_type.name in settings.MESSAGE_COALESCE_TYPES
+        )
+
+    def delivery(self, recipient, **kwargs):
+        """Where a message is delivered to besides the recipient, messages are only
+        folded together if they go to the same place.
+        """
+        return {}
+
+    def coalesce_message(
+        self, message_type, message, recipient, logs, subject="", **kwargs
+    ):
+        """Hold the message back until the end of the coalescing window, which
+        starts with the first message of its type for the recipient.
+        """
+        from ..models import PendingMessage
+        from ..tasks import send_pending_messages
+
+        delivery = self.delivery(recipient=recipient, **kwargs)
+        pending = PendingMessage.objects.filter(
+            adapter=self.adapter_type,
+            type=message_type.name,
+            recipient=recipient,
+            delivery=delivery,
+        ).first()
+        window = settings.MESSAGE_COALESCE_WINDOW
+        pending_message = PendingMessage.objects.create(
+            adapter=self.adapter_type,
+            type=message_type.name,
+            recipient=recipient,
+            delivery=delivery,
+            subject=subject or "",
+            content=message,
+            due=pending.due if pending else timezone.now() + timedelta(seconds=window),
+        )
+        pending_message.logs.set(logs)
+        if pending is None:
+            transaction.on_commit(
+                lambda: send_pending_messages.apply_async(countdown=window)
+            )
+
+    def send_coalesced(self, recipient, delivery, pending_messages, logs):
+        """Deliver messages held back by `coalesce_message` at once, returns the
+        status like `send_message`.
+        """
+        raise NotImplementedError()
@@ -5,11 +5,13 @@ from typing import List
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch, prefetch_related_objects
 from django.template.loader import render_to_string
 from django.utils.translation import gettext as _
 
 from hypha.apply.activity import tasks
 from hypha.apply.funds.models.co_applicants import (
+    CoApplicant,
     CoApplicantProjectPermission,
     CoApplicantRole,
 )
@@ -35,13 +37,15 @@ from hypha.core.mail import (
 )
 
 from ..options import MESSAGES
-from .base import AdapterBase
+from .base import AdapterBase, rendered_messages
 from .utils import (
+    context_key,
     get_compliance_email,
     get_users_for_groups,
     is_ready_for_review,
     is_reviewer_update,
     is_transition,
+    template_mentions,
 )
 
 logger = logging.getLogger(__name__)
@@ -49,6 +53,8 @@ logger = logging.getLogger(__name__)
 
 class EmailAdapter(AdapterBase):
     adapter_type = "Email"
+    deliver_async = True
+    can_coalesce = True
     messages = {
         MESSAGES.NEW_SUBMISSION: "messages/email/submission_confirmation.html",
         MESSAGES.DRAFT_SUBMISSION: "messages/email/submission_confirmation.html",
@@ -517,15 +523,37 @@ class EmailAdapter(AdapterBase):
         return [source.user.email]
 
     def batch_recipients(self, message_type, sources, **kwargs):
+        if message_type in {
+            MESSAGES.BATCH_TRANSITION,
+            MESSAGES.BATCH_DETERMINATION_OUTCOME,
+        }:
+            sources = list(sources)
+            # Load the applicants for all the sources at once, the templates use
+            # the co-applicants too
+            prefetch_related_objects(
+                sources,
+                "user__groups",
+                Prefetch(
+                    "co_applicants", queryset=CoApplicant.objects.select_related("user")
+                ),
+            )
+            return [
+                {
+                    "recipients": self.applicants(message_type, source),
+                    "sources": [source],
+                }
+                for source in sources
+            ]
+
         if not (is_ready_for_review(message_type) or is_reviewer_update(message_type)):
             return super().batch_recipients(message_type, sources, **kwargs)
 
         added = [reviewer.email for _, reviewer in kwargs.get("added", []) if reviewer]
 
+        reviewers = self.batch_reviewers(sources)
         reviewers_to_message = defaultdict(list)
         for source in sources:
-            reviewers = self.reviewers(source)
-            for reviewer in reviewers:
+            for reviewer in reviewers[source.id]:
                 if not is_reviewer_update(message_type) or reviewer in added:
                     reviewers_to_message[reviewer].append(source)
 
@@ -537,6 +565,21 @@ class EmailAdapter(AdapterBase):
             for reviewer, sources in reviewers_to_message.items()
         ]
 
+    def applicants(self, message_type, source):
+        """The applicant and the co-applicants with edit access to a submission,
+        from the prefetched co-applicants of `batch_recipients`.
+        """
+        if is_transition(message_type):
+            # Only notify the applicant if the new phase can be seen within the workflow
+            if not source.phase.permissions.can_view(source.user):
+                return []
+        co_applicants = [
+            co_applicant.user.email
+            for co_applicant in source.co_applicants.all()
+            if co_applicant.role == CoApplicantRole.EDIT
+        ]
+        return [source.user.email, *co_applicants]
+
     def reviewers(self, source):
         return [
             reviewer.email
@@ -545,22 +588,112 @@ class EmailAdapter(AdapterBase):
             and not reviewer.is_apply_staff
         ]
 
+    def batch_reviewers(self, sources):
+        """The reviewers `reviewers` gives for each of the sources, by source id,
+        loaded for all of them at once.
+        """
+        from hypha.apply.funds.models import AssignedReviewers
+
+        assigned = AssignedReviewers.objects.filter(submission__in=sources)
+        reviewed = set(assigned.reviewed().values_list("submission", "reviewer"))
+        phases = {source.id: source.phase for source in sources}
+
+        # Sources in the same phase share the permission checks
+        can_review = {}
+        reviewers = defaultdict(list)
+        for assignment in (
+            assigned.select_related("reviewer")
+            .prefetch_related("reviewer__groups")
+            .order_by("id")
+        ):
+            reviewer = assignment.reviewer
+            submission_id = assignment.submission_id
+            if (submission_id, reviewer.id) in reviewed:
+                continue
+            if reviewer.email in reviewers[submission_id]:
+                continue
+            phase = phases[submission_id]
+            key = (id(phase), reviewer.id)
+            if key not in can_review:
+                can_review[key] = (
+                    phase.permissions.can_review(reviewer)
+                    and not reviewer.is_apply_staff
+                )
+            if can_review[key]:
+                reviewers[submission_id].append(reviewer.email)
+        return reviewers
+
     def render_message(self, template, **kwargs):
+        rendered = rendered_messages.get()
+        key = None
+        if rendered is not None:
+            # Messages that only differ by recipient are the same if the template
+            # doesn't use it
+            key_kwargs = kwargs
+            if not template_mentions(template, "recipient"):
+                key_kwargs = {
+                    name: value for name, value in kwargs.items() if name != "recipient"
+                }
+            try:
+                key = (template, context_key(key_kwargs))
+            except TypeError:
+                pass
+            else:
+                if key in rendered:
+                    return rendered[key]
+
         with language(settings.LANGUAGE_CODE):
             text = render_to_string(template, kwargs, kwargs["request"])
+        text = remove_extra_empty_lines(text)
 
-        return remove_extra_empty_lines(text)
+        if key is not None:
+            rendered[key] = text
+        return text
 
-    def send_message(self, message, source, subject, recipient, logs, **kwargs):
+    def process(self, *args, **kwargs):
+        with tasks.batch_mail():
+            super().process(*args, **kwargs)
+
+    def process_batch(self, *args, **kwargs):
+        with tasks.batch_mail():
+            super().process_batch(*args, **kwargs)
+
+    def from_email(self, source):
         try:
-            from_email = source.page.specific.from_address
+            return source.page.specific.from_address
         except AttributeError:  # we're dealing with a project
-            from_email = source.submission.page.specific.from_address
+            return source.submission.page.specific.from_address
         except Exception as e:
-            from_email = None
             logger.exception(e)
+            return None
 
+    def send_message(self, message, source, subject, recipient, logs, **kwargs):
+        from_email = self.from_email(source)
         try:
             tasks.send_mail(subject, message, from_email, [recipient], logs=logs)
         except Exception as e:
             return "Error: " + str(e)
+
+    def delivery(self, source, **kwargs):
+        return {"from_email": self.from_email(source)}
+
+    def send_coalesced(self, recipient, delivery, pending_messages, logs):
+        first, *others = pending_messages
+        if others:
+            subject = _("{subject} and {count} more").format(
+                subject=first.subject, count=len(others)
+            )
+            with language(settings.LANGUAGE_CODE):
+                message = render_to_string(
+                    "messages/email/coalesced.html",
+                    {"messages": [pending.content for pending in pending_messages]},
+                )
+        else:
+            subject, message = first.subject, first.content
+
+        try:
+            tasks.send_mail(
+                subject, message, delivery["from_email"], [recipient], logs=logs
+            )
+        except Exception as e:
+            return "Error: " + str(e)
@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -26,6 +27,8 @@ class SlackAdapter(AdapterBase):
 
     adapter_type = "Slack"
     always_send = True
+    deliver_async = True
+    can_coalesce = True
     messages = {
         MESSAGES.NEW_SUBMISSION: _(
             "A new submission has been submitted for {source.page.title}: <{link}|{source.title_text_display}> by {user}"
@@ -224,14 +227,19 @@ class SlackAdapter(AdapterBase):
         return recipients
 
     def batch_recipients(self, message_type, sources, **kwargs):
-        # We group the messages by lead
-        leads = User.objects.filter(id__in=sources.values("lead"))
+        # We group the messages by lead, loaded with the sources
+        leads = {}
+        sources_by_lead = defaultdict(list)
+        for source in sources.select_related("lead"):
+            if source.lead:
+                leads[source.lead_id] = source.lead
+                sources_by_lead[source.lead_id].append(source)
         return [
             {
                 "recipients": [self.slack_id(lead)],
-                "sources": sources.filter(lead=lead),
+                "sources": sources_by_lead[lead_id],
             }
-            for lead in leads
+            for lead_id, lead in leads.items()
         ]
 
     def reviewers_updated(self, source, link, user, added=None, removed=None, **kwargs):
@@ -434,7 +442,16 @@ class SlackAdapter(AdapterBase):
 
     def send_message(self, message, recipient, source, **kwargs):
         target_rooms = self.slack_channels(source, **kwargs)
+        return self.post(message, recipient, target_rooms)
 
+    def delivery(self, source, **kwargs):
+        return {"channels": self.slack_channels(source, **kwargs)}
+
+    def send_coalesced(self, recipient, delivery, pending_messages, logs):
+        message = "\n".join(pending.content for pending in pending_messages)
+        return self.post(message, recipient, delivery["channels"])
+
+    def post(self, message, recipient, target_rooms):
         if not any(target_rooms) or not settings.SLACK_TOKEN:
             errors = []
             if not target_rooms:
@@ -1,6 +1,9 @@
 from collections import defaultdict
+from functools import lru_cache
 
-from django.db.models import Count
+from django.db.models import Count, Model, QuerySet
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
 from django.utils.translation import gettext as _
 
 from hypha.apply.activity.options import MESSAGES
@@ -27,6 +30,55 @@ def link_to(target, request):
         return request.scheme + "://" + request.get_host() + target.get_absolute_url()
 
 
+def context_key(value):
+    """A hashable key for a template context value, equal for values that render
+    the same. Model instances compare by primary key, querysets by their results.
+
+    Raises:
+        TypeError: for values that can't be compared, e.g. unsaved instances
+    """
+    if isinstance(value, QuerySet):
+        return ("queryset", value.model, tuple(obj.pk for obj in value))
+    if isinstance(value, Model):
+        if value.pk is None:
+            raise TypeError(f"Unsaved {value._meta.label} can't be compared")
+        return ("model", value._meta.label, value.pk)
+    if isinstance(value, dict):
+        return ("dict", tuple((key, context_key(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(context_key(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(context_key(item) for item in value))
+    hash(value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def template_mentions(template_name, name):
+    """Whether `name` appears in the source of a template or the templates it
+    extends or includes. Templates only known when rendering count as using it.
+    """
+    seen = set()
+    pending = [template_name]
+    while pending:
+        template_name = pending.pop()
+        if template_name in seen:
+            continue
+        seen.add(template_name)
+        template = get_template(template_name).template
+        if name in template.source:
+            return True
+        for node in template.nodelist.get_nodes_by_type((ExtendsNode, IncludeNode)):
+            if isinstance(node, ExtendsNode):
+                parent = node.parent_name.var
+            else:
+                parent = node.template.var
+            if not isinstance(parent, str):
+                return True
+            pending.append(parent)
+    return False
+
+
 def group_reviewers(reviewers):
     groups = defaultdict(list)
     for reviewer in reviewers:
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from hypha.apply.activity.models import OutboxMessage
+from hypha.apply.activity.tasks import deliver_outbox_message
+
+
+class Command(BaseCommand):
+    help = "Queue the delivery of notifications left pending in the outbox, e.g. when a worker was down"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--minutes",
+            action="store",
+            type=int,
+            default=10,
+            help="Only queue messages overdue for at least this many minutes",
+        )
+        parser.add_argument(
+            "--failed",
+            action="store_true",
+            help="Also retry messages that failed to be delivered",
+        )
+
+    def handle(self, *args, **options):
+        # Messages being sent for that long were left behind by a worker that
+        # stopped, messages waiting to be retried are only due after their
+        # backoff
+        statuses = [OutboxMessage.PENDING, OutboxMessage.SENDING]
+        if options["failed"]:
+            statuses.append(OutboxMessage.FAILED)
+
+        now = timezone.now()
+        with transaction.atomic():
+            outbox_ids = list(
+                OutboxMessage.objects.filter(
+                    status__in=statuses,
+                    next_attempt_at__lte=now - timedelta(minutes=options["minutes"]),
+                )
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+            OutboxMessage.objects.filter(id__in=outbox_ids).update(
+                status=OutboxMessage.PENDING, next_attempt_at=now
+            )
+        for outbox_id in outbox_ids:
+            deliver_outbox_message.delay(outbox_id)
+
+        count = len(outbox_ids)
+        self.stdout.write(f"{count} message{'s' if count != 1 else ''} queued.")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from hypha.apply.activity.messaging import messenger
+
+
+class Command(BaseCommand):
+    help = "Send the notifications held back to be folded together whose coalescing window has ended"
+
+    def handle(self, *args, **options):
+        count = messenger.send_pending()
+        self.stdout.write(f"{count} deliver{'ies' if count != 1 else 'y'} sent.")
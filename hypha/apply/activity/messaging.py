@@ -1,6 +1,12 @@
+import json
 import logging
+import pickle
+from collections import defaultdict
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 
 from .adapters import ActivityAdapter, EmailAdapter, SlackAdapter
 
@@ -26,34 +32,175 @@ class MessengerBackend:
             sources = []
 
         if source:
-            event = Event.objects.create(type=message_type.name, by=user, source=source)
-            for adapter in self.adapters:
-                adapter.process(
-                    message_type,
-                    event,
-                    request=request,
-                    user=user,
-                    source=source,
-                    related=related,
-                    **kwargs,
-                )
-
+            events = [
+                Event.objects.create(type=message_type.name, by=user, source=source)
+            ]
         elif sources:
             events = Event.objects.bulk_create(
                 Event(type=message_type.name, by=user, source=source)
                 for source in sources
             )
-            for adapter in self.adapters:
-                adapter.process_batch(
+        else:
+            return
+
+        queued = []
+        for adapter in self.adapters:
+            if adapter.deliver_async and not settings.CELERY_TASK_ALWAYS_EAGER:
+                queued.append(adapter)
+            else:
+                self.process(
+                    adapter,
                     message_type,
                     events,
                     request=request,
                     user=user,
+                    source=source,
                     sources=sources,
                     related=related,
                     **kwargs,
                 )
 
+        if queued:
+            self.queue(
+                queued,
+                message_type,
+                events,
+                request=request,
+                user=user,
+                source=source,
+                sources=sources,
+                related=related,
+                **kwargs,
+            )
+
+    def process(
+        self, adapter, message_type, events, request, user, source, sources, **kwargs
+    ):
+        if source:
+            adapter.process(
+                message_type,
+                events[0],
+                request=request,
+                user=user,
+                source=source,
+                **kwargs,
+            )
+        else:
+            adapter.process_batch(
+                message_type,
+                events,
+                request=request,
+                user=user,
+                sources=sources,
+                **kwargs,
+            )
+
+    def queue(self, adapters, message_type, events, request, **kwargs):
+        """Record the message in the outbox for a worker to deliver through
+        `adapters`, once the current transaction is committed.
+        """
+        from . import outbox
+        from .models import OutboxMessage
+        from .tasks import deliver_outbox_message
+
+        try:
+            payload = outbox.dumps(
+                {
+                    "adapters": [adapter.adapter_type for adapter in adapters],
+                    "message_type": message_type,
+                    "events": [event.id for event in events],
+                    "request": outbox.snapshot_request(request),
+                    "kwargs": kwargs,
+                }
+            )
+        except (pickle.PicklingError, TypeError, AttributeError, KeyError) as e:
+            # Anything that can't be handed over is still delivered, just inline
+            logger.warning("Delivering %s inline: %s", message_type.name, e)
+            for adapter in adapters:
+                self.process(adapter, message_type, events, request=request, **kwargs)
+            return
+
+        outbox_message = OutboxMessage.objects.create(
+            type=message_type.name, payload=payload
+        )
+        transaction.on_commit(lambda: deliver_outbox_message.delay(outbox_message.id))
+
+    def deliver(self, outbox_message):
+        """Process a message from the outbox through each of its adapters that
+        hasn't delivered it yet.
+        """
+        from . import outbox
+        from .models import Event, OutboxMessage
+
+        payload = outbox.loads(outbox_message.payload)
+        events = Event.objects.in_bulk(payload["events"])
+        events = [events[event_id] for event_id in payload["events"]]
+        request = outbox.rebuild_request(payload["request"])
+
+        adapters = {adapter.adapter_type: adapter for adapter in self.adapters}
+        for adapter_type in payload["adapters"]:
+            if adapter_type in outbox_message.delivered_by:
+                continue
+            self.process(
+                adapters[adapter_type],
+                payload["message_type"],
+                events,
+                request=request,
+                **payload["kwargs"],
+            )
+            outbox_message.delivered_by.append(adapter_type)
+            outbox_message.save(update_fields=["delivered_by"])
+
+        outbox_message.status = OutboxMessage.SENT
+        outbox_message.sent_at = timezone.now()
+        outbox_message.error = ""
+        outbox_message.save(update_fields=["status", "sent_at", "error"])
+
+    def send_pending(self):
+        """Deliver the messages held back for coalescing whose window has ended,
+        all messages of a type for the same recipient at once.
+
+        Returns:
+            int: the number of deliveries
+        """
+        from .models import Message, PendingMessage
+        from .tasks import batch_mail
+
+        adapters = {adapter.adapter_type: adapter for adapter in self.adapters}
+        with transaction.atomic():
+            pending_messages = list(
+                PendingMessage.objects.filter(due__lte=timezone.now())
+                .select_for_update(skip_locked=True)
+                .prefetch_related("logs")
+                .order_by("id")
+            )
+            groups = defaultdict(list)
+            for pending in pending_messages:
+                key = (
+                    pending.adapter,
+                    pending.type,
+                    pending.recipient,
+                    json.dumps(pending.delivery, sort_keys=True),
+                )
+                groups[key].append(pending)
+
+            with batch_mail():
+                for (adapter_type, _, recipient, _), group in groups.items():
+                    logs = Message.objects.filter(
+                        id__in=[
+                            log.id for pending in group for log in pending.logs.all()
+                        ]
+                    )
+                    status = adapters[adapter_type].send_coalesced(
+                        recipient, group[0].delivery, group, logs
+                    )
+                    logs.update_status(status)
+
+            PendingMessage.objects.filter(
+                id__in=[pending.id for pending in pending_messages]
+            ).delete()
+        return len(groups)
+
 
 adapters = [
     ActivityAdapter(),
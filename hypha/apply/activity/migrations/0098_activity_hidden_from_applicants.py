@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:24
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import translation
+from django.utils.translation import gettext
+
+# The message the activity feed logged for a new review
+NEW_REVIEW_MESSAGE = "Submitted a review"
+
+
+def hide_reviews_from_applicants(apps, schema_editor):
+    """Flag the reviews logged before the flag existed, found by their message
+    in any of the languages it could have been saved in.
+    """
+    Activity = apps.get_model("activity", "Activity")
+    messages = set()
+    for language_code, _ in settings.LANGUAGES:
+        with translation.override(language_code):
+            messages.add(gettext(NEW_REVIEW_MESSAGE))
+    Activity.objects.filter(message__in=messages).update(hidden_from_applicants=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activity", "0097_pendingmessage"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activity",
+            name="hidden_from_applicants",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(hide_reviews_from_applicants, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="activity",
+            index=models.Index(
+                fields=[
+                    "source_content_type",
+                    "source_object_id",
+                    "type",
+                    "visibility",
+                    "timestamp",
+                ],
+                include=("current", "user", "hidden_from_applicants"),
+                name="activity_source_visibility_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:52
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_next_attempt_at(apps, schema_editor):
+    # Messages already in the outbox were due when they were created
+    OutboxMessage = apps.get_model("activity", "OutboxMessage")
+    OutboxMessage.objects.update(next_attempt_at=F("created"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activity", "0098_activity_hidden_from_applicants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="next_attempt_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name="outboxmessage",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                ],
+                db_index=True,
+                default="pending",
+                max_length=10,
+            ),
+        ),
+        migrations.RunPython(set_next_attempt_at, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 import os
 import uuid
+from collections import defaultdict
 from typing import List, Optional, Tuple
 
 from django.apps import apps
@@ -52,60 +53,47 @@ class BaseActivityQuerySet(models.QuerySet):
             A QuerySet containing all items visible to the specified user
         """
 
-        # To hide reviews from the applicant's activity feed
-        # Todo: It is just for historic data and not be needed for new data after this.
-        from .messaging import ActivityAdapter
+        user_qs = Q(user=user)
+        visible = Q(visibility__in=self.model.visibility_for(user)) | user_qs
 
-        messages = ActivityAdapter.messages
+        if not user.is_applicant:
+            return self.filter(visible)
 
-        user_qs = Q(user=user)
+        if not user.is_reviewer:
+            return self.filter(visible, hidden_from_applicants=False)
 
-        if user.is_applicant:
-            # Handle the edge case where a reviewer is also an
-            # applicant. Ensures that any applications/projects the user
-            # authored will have comment visibility of applicant while others
-            # will get the appropriate role.
-            if user.is_reviewer:
-                ApplicationSubmission = apps.get_model("funds", "ApplicationSubmission")
-                Project = apps.get_model("application_projects", "Project")
-
-                app_content_type = ContentType.objects.get_for_model(
-                    ApplicationSubmission
-                )
-                proj_content_type = ContentType.objects.get_for_model(Project)
-
-                authored_apps = ApplicationSubmission.objects.filter(user_qs).values(
-                    "id"
-                )
-                authored_projs = Project.objects.filter(user_qs).values("id")
-
-                proj_app_qs = (
-                    Q(source_content_type=app_content_type)
-                    & Q(source_object_id__in=authored_apps)
-                ) | (
-                    Q(source_content_type=proj_content_type)
-                    & Q(source_object_id__in=authored_projs)
-                )
-
-                # Activities the user is the author of the source submission
-                applicant_activity = self.filter(
-                    proj_app_qs
-                    & Q(
-                        Q(visibility__in=self.model.visibility_for(user, True))
-                        | user_qs
-                    )
-                )
-                # All other activities
-                other_activity = self.exclude(
-                    Q(message=messages.get(MESSAGES.NEW_REVIEW)) | proj_app_qs
-                ).filter(Q(visibility__in=self.model.visibility_for(user)) | user_qs)
-                return applicant_activity | other_activity
-            else:
-                return self.exclude(message=messages.get(MESSAGES.NEW_REVIEW)).filter(
-                    Q(visibility__in=self.model.visibility_for(user)) | user_qs
-                )
-
-        return self.filter(Q(visibility__in=self.model.visibility_for(user)) | user_qs)
+        # Handle the edge case where a reviewer is also an applicant. Ensures
+        # that any applications/projects the user authored will have comment
+        # visibility of applicant while others will get the appropriate role.
+        ApplicationSubmission = apps.get_model("funds", "ApplicationSubmission")
+        Project = apps.get_model("application_projects", "Project")
+
+        # The ids are looked up once rather than as a subquery for every row
+        authored_apps = list(
+            ApplicationSubmission.objects.filter(user_qs).values_list("id", flat=True)
+        )
+        authored_projs = list(
+            Project.objects.filter(user_qs).values_list("id", flat=True)
+        )
+        authored = Q(
+            source_content_type=ContentType.objects.get_for_model(
+                ApplicationSubmission
+            ),
+            source_object_id__in=authored_apps,
+        ) | Q(
+            source_content_type=ContentType.objects.get_for_model(Project),
+            source_object_id__in=authored_projs,
+        )
+
+        return self.filter(
+            # Activities the user is the author of the source submission
+            (
+                authored
+                & (Q(visibility__in=self.model.visibility_for(user, True)) | user_qs)
+            )
+            # All other activities
+            | (~authored & Q(hidden_from_applicants=False) & visible)
+        )
 
     def newer(self, activity):
         return self.filter(timestamp__gt=activity.timestamp)
@@ -216,6 +204,9 @@ class Activity(models.Model):
     current = models.BooleanField(default=True)
     previous = models.ForeignKey("self", on_delete=models.CASCADE, null=True)
 
+    # Kept out of the feed of applicants whatever the visibility, e.g. reviews
+    hidden_from_applicants = models.BooleanField(default=False)
+
     # Fields for generic relations to other objects. related_object should implement `get_absolute_url`
     related_content_type = models.ForeignKey(
         ContentType,
@@ -238,6 +229,21 @@ class Activity(models.Model):
         base_manager_name = "objects"
         verbose_name = _("activity")
         verbose_name_plural = _("activities")
+        indexes = [
+            # Feeds and comment counts of a submission or project filtered on
+            # visibility, covering the other columns they filter on
+            models.Index(
+                fields=[
+                    "source_content_type",
+                    "source_object_id",
+                    "type",
+                    "visibility",
+                    "timestamp",
+                ],
+                include=["current", "user", "hidden_from_applicants"],
+                name="activity_source_visibility_idx",
+            ),
+        ]
 
     def get_absolute_url(self):
         # coverup for both submission and project as source.
@@ -365,6 +371,36 @@ class MessagesQueryset(models.QuerySet):
 
     update_status.queryset_only = True
 
+    def update_statuses(self, responses):
+        """Record the responses of the email provider, a dict of the status and id
+        by message pk, with a single query.
+        """
+        if not responses:
+            return
+
+        def by_pk(key, output_field):
+            values = defaultdict(list)
+            for pk, response in responses.items():
+                values[response[key]].append(pk)
+            return Case(
+                *(When(pk__in=pks, then=Value(value)) for value, pks in values.items()),
+                output_field=output_field,
+            )
+
+        status = by_pk("status", models.TextField())
+        return self.update(
+            external_id=by_pk("id", models.CharField()),
+            status=Case(
+                When(status="", then=status),
+                default=Concat(
+                    "status", Value("<br />"), status, output_field=models.TextField()
+                ),
+                output_field=models.TextField(),
+            ),
+        )
+
+    update_statuses.queryset_only = True
+
 
 class Message(models.Model):
     """Model to track content of messages sent from an event"""
@@ -395,3 +431,68 @@ class Message(models.Model):
                 output_field=models.TextField(),
             )
             self.save()
+
+
+class OutboxMessage(models.Model):
+    """Notification waiting for a worker to render and deliver it.
+
+    Created by the messenger for the adapters that deliver in the background, with
+    everything needed to process the message pickled in `payload`.
+    """
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUSES = {
+        PENDING: _("Pending"),
+        SENDING: _("Sending"),
+        SENT: _("Sent"),
+        FAILED: _("Failed"),
+    }
+
+    created = models.DateTimeField(auto_now_add=True)
+    type = models.CharField(_("verb"), choices=MESSAGES.choices, max_length=50)
+    payload = models.BinaryField()
+    status = models.CharField(
+        choices=STATUSES.items(), default=PENDING, max_length=10, db_index=True
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # When a worker is expected to pick the message up, or picked it up when it
+    # is being sent. Later retries are delayed with a backoff.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Adapters that have already delivered the message, skipped on a retry
+    delivered_by = models.JSONField(default=list)
+    error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("outbox message")
+        verbose_name_plural = _("outbox messages")
+
+    def __str__(self):
+        return f"[{self.status}] {self.get_type_display()}"
+
+
+class PendingMessage(models.Model):
+    """Message waiting to be folded with others of the same type for the same
+    recipient into a single delivery, see `MESSAGE_COALESCE_TYPES`.
+    """
+
+    created = models.DateTimeField(auto_now_add=True)
+    due = models.DateTimeField(db_index=True)
+    adapter = models.CharField(max_length=15)
+    type = models.CharField(_("verb"), choices=MESSAGES.choices, max_length=50)
+    recipient = models.CharField(max_length=250)
+    # Where the adapter delivers to, only messages going to the same place are folded
+    delivery = models.JSONField(default=dict)
+    subject = models.TextField(blank=True)
+    content = models.TextField()
+    logs = models.ManyToManyField(Message, related_name="+")
+
+    class Meta:
+        verbose_name = _("pending message")
+        verbose_name_plural = _("pending messages")
+
+    def __str__(self):
+        return f"{self.adapter} [to: {self.recipient}] {self.get_type_display()}"
@@ -0,0 +1,111 @@
+"""
+Serialisation of the notifications handed to the workers through the outbox.
+
+Payloads are pickled: the related objects of a message are model instances,
+querysets and workflow phases. Model instances are stored as the values of their
+fields, so they are delivered as they were when the message was sent even if
+they are changed or deleted before a worker gets to it, without any cached
+values that aren't picklable, e.g. the blocks of a stream field. Workflow phases
+are stored by reference.
+
+The request a message was sent from is reduced to the scheme, host and user
+needed to build links and render templates, and rebuilt by the worker.
+"""
+
+import io
+import pickle
+
+from django.apps import apps
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.db.models import Model
+from django.http import HttpRequest
+
+from hypha.apply.funds.workflows import WORKFLOWS
+from hypha.apply.funds.workflows.models.phase import Phase
+
+PHASE_KEYS = {
+    id(phase): (workflow_name, phase_name)
+    for workflow_name, workflow in WORKFLOWS.items()
+    for phase_name, phase in workflow.items()
+}
+
+
+class PayloadPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if isinstance(obj, Phase):
+            return ("phase", *PHASE_KEYS[id(obj)])
+        if isinstance(obj, Model):
+            values = {
+                field.attname: field.get_prep_value(field.value_from_object(obj))
+                for field in obj._meta.concrete_fields
+            }
+            return ("model", obj._meta.label, values, obj._state.db)
+        return None
+
+
+class PayloadUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind, *key = pid
+        if kind == "phase":
+            workflow_name, phase_name = key
+            return WORKFLOWS[workflow_name][phase_name]
+        if kind == "model":
+            label, values, db = key
+            model = apps.get_model(label)
+            fields = {field.attname: field for field in model._meta.concrete_fields}
+            obj = model(
+                **{
+                    attname: fields[attname].to_python(value)
+                    for attname, value in values.items()
+                }
+            )
+            obj._state.adding = False
+            obj._state.db = db
+            return obj
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}")
+
+
+def dumps(payload) -> bytes:
+    data = io.BytesIO()
+    PayloadPickler(data, protocol=pickle.HIGHEST_PROTOCOL).dump(payload)
+    return data.getvalue()
+
+
+def loads(data: bytes):
+    return PayloadUnpickler(io.BytesIO(data)).load()
+
+
+class OutboxRequest(HttpRequest):
+    """Stand in for the request a message was sent from"""
+
+    def __init__(self, scheme, host, port, user):
+        super().__init__()
+        self._scheme = scheme
+        self.META["HTTP_HOST"] = host
+        self.META["SERVER_NAME"], _, _ = host.partition(":")
+        self.META["SERVER_PORT"] = port
+        self.user = user or AnonymousUser()
+        self.session = {}
+        self._messages = FallbackStorage(self)
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+def snapshot_request(request):
+    if request is None:
+        return None
+    user = getattr(request, "user", None)
+    return {
+        "scheme": request.scheme,
+        "host": request.get_host(),
+        "port": request.get_port(),
+        "user": user if user and user.is_authenticated else None,
+    }
+
+
+def rebuild_request(snapshot):
+    if snapshot is None:
+        return None
+    return OutboxRequest(**snapshot)
@@ -1,21 +1,49 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
 from celery import shared_task
 from django.conf import settings
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+# Emails waiting to be sent together, see `batch_mail`
+outgoing_mail: ContextVar = ContextVar("outgoing_mail", default=None)
+
+
+@contextmanager
+def batch_mail():
+    """Collect the emails sent with `send_mail` and hand them over to the workers
+    in batches of `EMAIL_BATCH_SIZE` when done, instead of one task per email.
+    """
+    if outgoing_mail.get() is not None:
+        yield
+        return
+    token = outgoing_mail.set([])
+    try:
+        yield
+        emails = outgoing_mail.get()
+    finally:
+        outgoing_mail.reset(token)
+    for start in range(0, len(emails), settings.EMAIL_BATCH_SIZE):
+        send_mails_task.delay(emails[start : start + settings.EMAIL_BATCH_SIZE])
 
 
 def send_mail(subject, message, from_address, recipients, logs=None):
     if settings.EMAIL_SUBJECT_PREFIX:
         subject = str(settings.EMAIL_SUBJECT_PREFIX) + str(subject)
-    # Convenience method to wrap the tasks and handle the callback
-    send_mail_task.apply_async(
-        kwargs={
-            "subject": subject,
-            "body": message,
-            "from_email": from_address,
-            "to": recipients,
-        },
-        link=update_message_status.s([log.pk for log in logs]),
-    )
+    email = {
+        "subject": str(subject),
+        "body": message,
+        "from_email": from_address,
+        "to": recipients,
+        "logs": [log.pk for log in logs or []],
+    }
+    batch = outgoing_mail.get()
+    if batch is None:
+        send_mails_task.delay([email])
+    else:
+        batch.append(email)
 
 
 @shared_task
@@ -45,3 +73,107 @@ def update_message_status(response, message_pks):
     messages = Message.objects.filter(pk__in=message_pks)
     messages.update(external_id=response["id"])
     messages.update_status(response["status"])
+
+
+def is_rate_limited(error):
+    """Whether the email provider refused an email for sending too many"""
+    return getattr(error, "status_code", None) == 429 or (
+        getattr(error, "smtp_code", None) in {421, 450, 451}
+    )
+
+
+@shared_task(bind=True, rate_limit=settings.EMAIL_RATE_LIMIT, max_retries=5)
+def send_mails_task(self, emails):
+    """Send a batch of emails over a single connection to the email backend, then
+    record the outcome on the logs of all of them at once.
+
+    Emails refused because of the provider's rate limit are sent again by a
+    retry of the task, after a backoff.
+    """
+    from .models import Message
+
+    responses = {}
+    rate_limited = []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        responses = {
+            pk: {"status": "Error: " + str(e), "id": None}
+            for email in emails
+            for pk in email["logs"]
+        }
+    else:
+        try:
+            for email in emails:
+                message = EmailMessage(
+                    subject=email["subject"],
+                    body=email["body"],
+                    from_email=email["from_email"],
+                    to=email["to"],
+                    connection=connection,
+                )
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    if is_rate_limited(e) and self.request.retries < self.max_retries:
+                        rate_limited.append(email)
+                        continue
+                    response = {"status": "Error: " + str(e), "id": None}
+                else:
+                    try:
+                        response = {
+                            "status": message.anymail_status.status.pop(),
+                            "id": message.anymail_status.message_id,
+                        }
+                    except AttributeError:
+                        response = {"status": "sent", "id": None}
+                for pk in email["logs"]:
+                    responses[pk] = response
+        finally:
+            connection.close()
+
+    Message.objects.filter(pk__in=responses).update_statuses(responses)
+
+    if rate_limited:
+        raise self.retry(args=(rate_limited,), countdown=60 * 2**self.request.retries)
+
+
+@shared_task(bind=True, max_retries=5)
+def deliver_outbox_message(self, outbox_id):
+    from .messaging import messenger
+    from .models import OutboxMessage
+
+    # Claim the message, so a copy of this task queued again by the
+    # deliver_outbox command never sends it a second time
+    now = timezone.now()
+    if not OutboxMessage.objects.filter(
+        id=outbox_id, status=OutboxMessage.PENDING
+    ).update(status=OutboxMessage.SENDING, next_attempt_at=now):
+        return
+    outbox_message = OutboxMessage.objects.get(id=outbox_id)
+
+    try:
+        messenger.deliver(outbox_message)
+    except Exception as e:
+        countdown = 30 * 2**self.request.retries
+        outbox_message.attempts += 1
+        outbox_message.error = str(e)
+        if self.request.retries >= self.max_retries:
+            outbox_message.status = OutboxMessage.FAILED
+        else:
+            outbox_message.status = OutboxMessage.PENDING
+            outbox_message.next_attempt_at = now + timedelta(seconds=countdown)
+        outbox_message.save(
+            update_fields=["attempts", "error", "status", "next_attempt_at"]
+        )
+        if outbox_message.status == OutboxMessage.FAILED:
+            raise
+        raise self.retry(exc=e, countdown=countdown) from e
+
+
+@shared_task
+def send_pending_messages():
+    from .messaging import messenger
+
+    messenger.send_pending()
@@ -1,6 +1,6 @@
 """Tests for activity/adapters/utils.py pure functions."""
 
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 
 from hypha.apply.activity.options import MESSAGES
 from hypha.apply.projects.models.payment import (
@@ -21,6 +21,7 @@ from ..adapters.utils import (
     is_reviewer_update,
     is_transition,
     reviewers_message,
+    template_mentions,
 )
 
 
@@ -158,3 +159,48 @@ class TestReviewersMessage(SimpleTestCase):
 
     def test_empty_reviewers_returns_empty_list(self):
         self.assertEqual(reviewers_message([]), [])
+
+
+@override_settings(
+    TEMPLATES=[
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "loaders": [
+                    (
+                        "django.template.loaders.locmem.Loader",
+                        {
+                            "base.html": "{% block content %}{% endblock %}",
+                            "greeting.html": "Dear {{ recipient }}",
+                            "extends.html": '{% extends "base.html" %}'
+                            "{% block content %}Dear {{ recipient }}{% endblock %}",
+                            "include.html": '{% extends "base.html" %}'
+                            '{% block content %}{% include "greeting.html" %}'
+                            "{% endblock %}",
+                            "dynamic.html": "{% include template_name %}",
+                            "plain.html": '{% extends "base.html" %}'
+                            '{% block content %}{% include "base.html" %}'
+                            "{% endblock %}",
+                        },
+                    )
+                ]
+            },
+        }
+    ]
+)
+class TestTemplateMentions(SimpleTestCase):
+    def setUp(self):
+        template_mentions.cache_clear()
+        self.addCleanup(template_mentions.cache_clear)
+
+    def test_mentioned_in_template(self):
+        self.assertTrue(template_mentions("extends.html", "recipient"))
+
+    def test_mentioned_in_included_template(self):
+        self.assertTrue(template_mentions("include.html", "recipient"))
+
+    def test_dynamic_include_counts_as_mentioned(self):
+        self.assertTrue(template_mentions("dynamic.html", "recipient"))
+
+    def test_not_mentioned(self):
+        self.assertFalse(template_mentions("plain.html", "recipient"))
@@ -0,0 +1,77 @@
+"""Tests for activity/management/commands/deliver_outbox.py"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import OutboxMessage
+from ..options import MESSAGES
+
+
+class TestDeliverOutboxCommand(TestCase):
+    def create_message(self, status=OutboxMessage.PENDING, minutes_ago=30):
+        outbox_message = OutboxMessage.objects.create(
+            type=MESSAGES.UPDATE_LEAD.name, payload=b"", status=status
+        )
+        OutboxMessage.objects.filter(id=outbox_message.id).update(
+            created=timezone.now() - timedelta(minutes=minutes_ago),
+            next_attempt_at=timezone.now() - timedelta(minutes=minutes_ago),
+        )
+        return outbox_message
+
+    @patch(
+        "hypha.apply.activity.management.commands.deliver_outbox.deliver_outbox_message"
+    )
+    def test_queues_old_pending_messages(self, task):
+        pending = self.create_message()
+        self.create_message(minutes_ago=1)
+        self.create_message(status=OutboxMessage.SENT)
+        self.create_message(status=OutboxMessage.FAILED)
+        self.create_message(status=OutboxMessage.SENDING, minutes_ago=1)
+        out = StringIO()
+
+        call_command("deliver_outbox", stdout=out)
+
+        task.delay.assert_called_once_with(pending.id)
+        self.assertIn("1 message queued.", out.getvalue())
+
+    @patch(
+        "hypha.apply.activity.management.commands.deliver_outbox.deliver_outbox_message"
+    )
+    def test_retries_failed_messages(self, task):
+        failed = self.create_message(status=OutboxMessage.FAILED)
+
+        call_command("deliver_outbox", "--failed", stdout=StringIO())
+
+        task.delay.assert_called_once_with(failed.id)
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, OutboxMessage.PENDING)
+
+    @patch(
+        "hypha.apply.activity.management.commands.deliver_outbox.deliver_outbox_message"
+    )
+    def test_skips_messages_waiting_for_retry(self, task):
+        waiting = self.create_message()
+        OutboxMessage.objects.filter(id=waiting.id).update(
+            next_attempt_at=timezone.now() + timedelta(minutes=5)
+        )
+
+        call_command("deliver_outbox", stdout=StringIO())
+
+        task.delay.assert_not_called()
+
+    @patch(
+        "hypha.apply.activity.management.commands.deliver_outbox.deliver_outbox_message"
+    )
+    def test_queues_messages_left_sending(self, task):
+        stalled = self.create_message(status=OutboxMessage.SENDING)
+
+        call_command("deliver_outbox", stdout=StringIO())
+
+        task.delay.assert_called_once_with(stalled.id)
+        stalled.refresh_from_db()
+        self.assertEqual(stalled.status, OutboxMessage.PENDING)
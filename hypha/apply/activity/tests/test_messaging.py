@@ -1,13 +1,25 @@
 import hashlib
 import hmac
 import json
+from io import StringIO
 from unittest.mock import ANY, Mock, call, patch
 
 import responses
+from celery.exceptions import Retry
 from django.contrib.messages import get_messages
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django_slack.utils import get_backend
 
+from hypha.apply.funds.models import ApplicationSubmission
+from hypha.apply.funds.models.co_applicants import (
+    CoApplicant,
+    CoApplicantInvite,
+    CoApplicantRole,
+)
 from hypha.apply.funds.tests.factories import (
     ApplicationSubmissionFactory,
     AssignedReviewersFactory,
@@ -33,8 +45,11 @@ from ..models import (
     Activity,
     Event,
     Message,
+    OutboxMessage,
+    PendingMessage,
 )
 from ..options import MESSAGES
+from ..tasks import deliver_outbox_message
 from .factories import CommentFactory, EventFactory, MessageFactory
 
 
@@ -222,6 +237,166 @@ class TestMessageBackendProject(TestMessageBackendApplication):
     source_factory = ProjectFactory
 
 
+class AsyncTestAdapter(TestAdapter):
+    adapter_type = "Async Test Adapter"
+    deliver_async = True
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+class TestMessageBackendOutbox(TestCase):
+    def setUp(self):
+        self.adapter = AsyncTestAdapter()
+        self.inline_adapter = TestAdapter()
+        self.messenger = MessengerBackend(self.inline_adapter, self.adapter)
+        # The worker delivers through the messenger of the app
+        patched_messenger = patch(
+            "hypha.apply.activity.messaging.messenger", self.messenger
+        )
+        patched_messenger.start()
+        self.addCleanup(patched_messenger.stop)
+        # Run the delivery in the test instead of queueing it for a worker
+        patched_delay = patch.object(
+            deliver_outbox_message,
+            "delay",
+            side_effect=lambda outbox_id: deliver_outbox_message.apply(
+                args=(outbox_id,)
+            ),
+        )
+        patched_delay.start()
+        self.addCleanup(patched_delay.stop)
+        self.submission = ApplicationSubmissionFactory()
+        self.user = StaffFactory()
+        self.kwargs = {
+            "related": UserFactory(),
+            "request": make_request(self.user),
+            "user": self.user,
+            "source": self.submission,
+        }
+
+    def test_async_adapter_delivers_after_commit(self):
+        with (
+            patch.object(AsyncTestAdapter, "process") as async_process,
+            patch.object(TestAdapter, "process") as inline_process,
+        ):
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.messenger(MESSAGES.UPDATE_LEAD, **self.kwargs)
+
+            inline_process.assert_called_once()
+            async_process.assert_not_called()
+            outbox_message = OutboxMessage.objects.get()
+            self.assertEqual(outbox_message.status, OutboxMessage.PENDING)
+            self.assertEqual(outbox_message.type, MESSAGES.UPDATE_LEAD.name)
+
+            for callback in callbacks:
+                callback()
+
+        async_process.assert_called_once()
+        args, kwargs = async_process.call_args
+        self.assertEqual(args, (MESSAGES.UPDATE_LEAD, Event.objects.get()))
+        self.assertEqual(kwargs["source"], self.submission)
+        self.assertEqual(kwargs["user"], self.user)
+        self.assertEqual(kwargs["request"].user, self.user)
+        self.assertEqual(kwargs["request"].get_host(), "testserver")
+        outbox_message.refresh_from_db()
+        self.assertEqual(outbox_message.status, OutboxMessage.SENT)
+        self.assertEqual(outbox_message.delivered_by, [self.adapter.adapter_type])
+        self.assertIsNotNone(outbox_message.sent_at)
+
+    def test_batch_delivered_after_commit(self):
+        submissions = ApplicationSubmissionFactory.create_batch(2)
+        del self.kwargs["source"]
+        self.kwargs["related"] = None
+
+        with (
+            patch.object(AsyncTestAdapter, "process_batch") as process_batch,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.messenger(
+                MESSAGES.BATCH_REVIEWERS_UPDATED, sources=submissions, **self.kwargs
+            )
+
+        process_batch.assert_called_once()
+        args, kwargs = process_batch.call_args
+        self.assertEqual(list(args[1]), list(Event.objects.order_by("id")))
+        self.assertEqual(kwargs["sources"], submissions)
+
+    def test_phase_in_payload(self):
+        phase = self.submission.phase
+
+        with (
+            patch.object(AsyncTestAdapter, "process") as async_process,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.kwargs["related"] = phase
+            self.messenger(MESSAGES.TRANSITION, **self.kwargs)
+
+        self.assertIs(async_process.call_args.kwargs["related"], phase)
+
+    def test_failed_delivery_is_retried(self):
+        with self.captureOnCommitCallbacks():
+            self.messenger(MESSAGES.UPDATE_LEAD, **self.kwargs)
+        outbox_message = OutboxMessage.objects.get()
+
+        with patch.object(
+            AsyncTestAdapter, "process", side_effect=[Exception("down"), None]
+        ) as async_process:
+            deliver_outbox_message.apply(args=(outbox_message.id,))
+
+        self.assertEqual(async_process.call_count, 2)
+        outbox_message.refresh_from_db()
+        self.assertEqual(outbox_message.status, OutboxMessage.SENT)
+        self.assertEqual(outbox_message.attempts, 1)
+
+    def test_claimed_message_not_delivered_again(self):
+        with self.captureOnCommitCallbacks():
+            self.messenger(MESSAGES.UPDATE_LEAD, **self.kwargs)
+        outbox_message = OutboxMessage.objects.get()
+        # Another worker is delivering it
+        OutboxMessage.objects.update(status=OutboxMessage.SENDING)
+
+        with patch.object(AsyncTestAdapter, "process") as async_process:
+            deliver_outbox_message.apply(args=(outbox_message.id,))
+
+        async_process.assert_not_called()
+
+    def test_failed_delivery_waits_for_backoff(self):
+        with self.captureOnCommitCallbacks():
+            self.messenger(MESSAGES.UPDATE_LEAD, **self.kwargs)
+        outbox_message = OutboxMessage.objects.get()
+
+        with (
+            patch.object(AsyncTestAdapter, "process", side_effect=Exception("down")),
+            patch.object(deliver_outbox_message, "retry", side_effect=Retry),
+        ):
+            with self.assertRaises(Retry):
+                deliver_outbox_message(outbox_message.id)
+
+        outbox_message.refresh_from_db()
+        self.assertEqual(outbox_message.status, OutboxMessage.PENDING)
+        self.assertGreater(outbox_message.next_attempt_at, timezone.now())
+
+    def test_failed_delivery_gives_up(self):
+        with self.captureOnCommitCallbacks():
+            self.messenger(MESSAGES.UPDATE_LEAD, **self.kwargs)
+        outbox_message = OutboxMessage.objects.get()
+
+        with patch.object(AsyncTestAdapter, "process", side_effect=Exception("down")):
+            deliver_outbox_message.apply(args=(outbox_message.id,))
+
+        outbox_message.refresh_from_db()
+        self.assertEqual(outbox_message.status, OutboxMessage.FAILED)
+        self.assertEqual(outbox_message.attempts, 6)
+        self.assertEqual(outbox_message.error, "down")
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_eager_delivers_inline(self):
+        with patch.object(AsyncTestAdapter, "process") as async_process:
+            self.messenger(MESSAGES.UPDATE_LEAD, **self.kwargs)
+
+        async_process.assert_called_once()
+        self.assertFalse(OutboxMessage.objects.exists())
+
+
 @override_settings(SEND_MESSAGES=True)
 class TestActivityAdapter(TestCase):
     def setUp(self):
@@ -294,6 +469,23 @@ class TestActivityAdapter(TestCase):
 
         self.assertEqual(kwargs["visibility"], TEAM)
 
+    def test_review_hidden_from_applicants(self):
+        submission = ApplicationSubmissionFactory()
+        self.adapter.send_message(
+            "Submitted a review",
+            user=submission.user,
+            source=submission,
+            sources=None,
+            related=None,
+            **self.adapter.extra_kwargs(
+                MESSAGES.NEW_REVIEW, source=submission, sources=None
+            ),
+        )
+
+        activity = Activity.objects.get()
+        self.assertEqual(activity.visibility, TEAM)
+        self.assertTrue(activity.hidden_from_applicants)
+
     def test_public_transition_kwargs(self):
         submission = ApplicationSubmissionFactory()
         kwargs = self.adapter.extra_kwargs(
@@ -478,6 +670,30 @@ class TestSlackAdapter(AdapterMixin, TestCase):
         )
         self.assertTrue(submission.lead.slack in recipients[0])
 
+    def test_batch_recipients_grouped_by_lead(self):
+        adapter = SlackAdapter()
+        lead = StaffFactory(slack="@lead")
+        other_lead = StaffFactory(slack="@other")
+        submissions = [
+            ApplicationSubmissionFactory(lead=lead),
+            ApplicationSubmissionFactory(lead=other_lead),
+            ApplicationSubmissionFactory(lead=lead),
+        ]
+        sources = ApplicationSubmission.objects.filter(
+            id__in=[submission.id for submission in submissions]
+        ).order_by("id")
+
+        with self.assertNumQueries(1):
+            recipients = adapter.batch_recipients(MESSAGES.BATCH_UPDATE_LEAD, sources)
+
+        self.assertCountEqual(
+            [(r["recipients"], [s.id for s in r["sources"]]) for r in recipients],
+            [
+                (["<@lead>"], [submissions[0].id, submissions[2].id]),
+                (["<@other>"], [submissions[1].id]),
+            ],
+        )
+
     @override_settings(
         SLACK_ENDPOINT_URL=target_url,
         SLACK_DESTINATION_ROOM=target_room,
@@ -649,6 +865,256 @@ class TestEmailAdapter(AdapterMixin, TestCase):
             ANY, Contains(str(staff_commenter)), ANY, [submission.user.email], logs=ANY
         )
 
+    def add_co_applicant(self, submission, role):
+        user = ApplicantFactory()
+        invite = CoApplicantInvite.objects.create(
+            submission=submission, invited_user_email=user.email, role=role
+        )
+        CoApplicant.objects.create(
+            submission=submission, user=user, invite=invite, role=role
+        )
+        return user
+
+    def test_batch_determination_recipients(self):
+        submissions = ApplicationSubmissionFactory.create_batch(2)
+        editor = self.add_co_applicant(submissions[0], CoApplicantRole.EDIT)
+        self.add_co_applicant(submissions[0], CoApplicantRole.VIEW)
+
+        recipients = self.adapter.batch_recipients(
+            MESSAGES.BATCH_DETERMINATION_OUTCOME,
+            ApplicationSubmission.objects.filter(id__in=[s.id for s in submissions]),
+        )
+
+        self.assertCountEqual(
+            [(r["recipients"], [s.id for s in r["sources"]]) for r in recipients],
+            [
+                ([submissions[0].user.email, editor.email], [submissions[0].id]),
+                ([submissions[1].user.email], [submissions[1].id]),
+            ],
+        )
+
+    def test_batch_recipients_queries_dont_grow_with_sources(self):
+        def count_queries(message_type, submissions):
+            sources = ApplicationSubmission.objects.filter(
+                id__in=[submission.id for submission in submissions]
+            )
+            with CaptureQueriesContext(connection) as queries:
+                self.adapter.batch_recipients(message_type, sources)
+            return len(queries)
+
+        for message_type in [
+            MESSAGES.BATCH_DETERMINATION_OUTCOME,
+            MESSAGES.BATCH_READY_FOR_REVIEW,
+        ]:
+            with self.subTest(message_type=message_type):
+                few = [
+                    ApplicationSubmissionFactory(
+                        status="external_review",
+                        workflow_stages=2,
+                        reviewers=ReviewerFactory.create_batch(2),
+                    )
+                    for _ in range(2)
+                ]
+                many = few + [
+                    ApplicationSubmissionFactory(
+                        status="external_review",
+                        workflow_stages=2,
+                        reviewers=ReviewerFactory.create_batch(2),
+                    )
+                    for _ in range(3)
+                ]
+                for submission in many:
+                    self.add_co_applicant(submission, CoApplicantRole.EDIT)
+
+                self.assertEqual(
+                    count_queries(message_type, few),
+                    count_queries(message_type, many),
+                )
+
+    def test_batch_reviewers_match_reviewers(self):
+        reviewers = ReviewerFactory.create_batch(3)
+        submissions = [
+            ApplicationSubmissionFactory(
+                status="external_review", workflow_stages=2, reviewers=reviewers
+            ),
+            ApplicationSubmissionFactory(
+                status="proposal_internal_review",
+                workflow_stages=2,
+                reviewers=reviewers[:1],
+            ),
+        ]
+        ReviewFactory(
+            submission=submissions[0],
+            author__reviewer=reviewers[1],
+            author__submission=submissions[0],
+        )
+
+        batch_reviewers = self.adapter.batch_reviewers(submissions)
+
+        for submission in submissions:
+            self.assertCountEqual(
+                batch_reviewers[submission.id], self.adapter.reviewers(submission)
+            )
+
+    def test_identical_messages_rendered_once(self):
+        reviewers = ReviewerFactory.create_batch(3)
+        submission = ApplicationSubmissionFactory(
+            status="external_review", reviewers=reviewers, workflow_stages=2
+        )
+
+        with patch(
+            "hypha.apply.activity.adapters.emails.render_to_string",
+            return_value="ready to review",
+        ) as render:
+            self.adapter_process(MESSAGES.READY_FOR_REVIEW, source=submission)
+
+        render.assert_called_once()
+        self.assertEqual(self.mock_send_email.call_count, len(reviewers))
+
+    def test_recipient_passed_to_shared_messages(self):
+        reviewers = ReviewerFactory.create_batch(2)
+        submission = ApplicationSubmissionFactory(
+            status="external_review", reviewers=reviewers, workflow_stages=2
+        )
+
+        with patch(
+            "hypha.apply.activity.adapters.emails.render_to_string",
+            return_value="ready to review",
+        ) as render:
+            self.adapter_process(MESSAGES.READY_FOR_REVIEW, source=submission)
+
+        render.assert_called_once()
+        self.assertIn(
+            render.call_args.args[1]["recipient"], {r.email for r in reviewers}
+        )
+
+    def test_messages_using_recipient_rendered_for_each(self):
+        submission = ApplicationSubmissionFactory()
+        self.add_co_applicant(submission, CoApplicantRole.EDIT)
+
+        with patch(
+            "hypha.apply.activity.adapters.emails.render_to_string",
+            return_value="edited",
+        ) as render:
+            self.adapter_process(MESSAGES.EDIT_SUBMISSION, source=submission)
+
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(self.mock_send_email.call_count, 2)
+
+
+@override_settings(
+    SEND_MESSAGES=True,
+    MESSAGE_COALESCE_WINDOW=300,
+    MESSAGE_COALESCE_TYPES=["READY_FOR_REVIEW", "NEW_SUBMISSION"],
+)
+class TestCoalescing(AdapterMixin, TestCase):
+    source_factory = ApplicationSubmissionFactory
+
+    def setUp(self):
+        patched_send_mail = patch("hypha.apply.activity.tasks.send_mail")
+        self.mock_send_email = patched_send_mail.start()
+        self.addCleanup(patched_send_mail.stop)
+        self.messenger = MessengerBackend(EmailAdapter(), SlackAdapter())
+        self.reviewer = ReviewerFactory()
+
+    def ready_for_review(self):
+        submission = ApplicationSubmissionFactory(
+            status="external_review", workflow_stages=2, reviewers=[self.reviewer]
+        )
+        self.adapter_process(
+            MESSAGES.READY_FOR_REVIEW, adapter=EmailAdapter(), source=submission
+        )
+        return submission
+
+    def end_window(self):
+        PendingMessage.objects.update(due=timezone.now())
+
+    def test_messages_held_back(self):
+        self.ready_for_review()
+
+        self.mock_send_email.assert_not_called()
+        pending = PendingMessage.objects.get()
+        self.assertEqual(pending.recipient, self.reviewer.email)
+        self.assertGreater(pending.due, timezone.now())
+
+        # Nothing is due yet
+        self.assertEqual(self.messenger.send_pending(), 0)
+        self.mock_send_email.assert_not_called()
+
+    def test_messages_folded_per_recipient(self):
+        submissions = [self.ready_for_review() for _ in range(3)]
+        self.assertEqual(
+            len({pending.due for pending in PendingMessage.objects.all()}), 1
+        )
+        self.end_window()
+
+        self.assertEqual(self.messenger.send_pending(), 1)
+
+        self.mock_send_email.assert_called_once_with(
+            Contains("and 2 more"), ANY, ANY, [self.reviewer.email], logs=ANY
+        )
+        message = self.mock_send_email.call_args.args[1]
+        self.assertIn("You have 3 new notifications", message)
+        for submission in submissions:
+            self.assertIn(submission.title_text_display, message)
+        self.assertEqual(
+            self.mock_send_email.call_args.kwargs["logs"].count(), len(submissions)
+        )
+        self.assertFalse(PendingMessage.objects.exists())
+
+    def test_single_message_sent_as_is(self):
+        submission = self.ready_for_review()
+        content = PendingMessage.objects.get().content
+        self.end_window()
+
+        self.messenger.send_pending()
+
+        self.mock_send_email.assert_called_once_with(
+            Contains(submission.title_text_display),
+            content,
+            ANY,
+            [self.reviewer.email],
+            logs=ANY,
+        )
+
+    def test_other_types_not_held_back(self):
+        self.adapter_process(MESSAGES.EDIT_SUBMISSION, adapter=EmailAdapter())
+
+        self.mock_send_email.assert_called_once()
+        self.assertFalse(PendingMessage.objects.exists())
+
+    @patch.object(SlackAdapter, "post", return_value="200: OK")
+    def test_slack_messages_folded(self, post):
+        lead = StaffFactory(slack="@lead")
+        for _ in range(2):
+            self.adapter_process(
+                MESSAGES.NEW_SUBMISSION,
+                adapter=SlackAdapter(),
+                source=ApplicationSubmissionFactory(lead=lead),
+            )
+        post.assert_not_called()
+        self.end_window()
+
+        self.messenger.send_pending()
+
+        post.assert_called_once()
+        message, recipient, channels = post.call_args.args
+        self.assertEqual(recipient, "<@lead>")
+        self.assertEqual(len(message.splitlines()), 2)
+        self.assertEqual(
+            set(Message.objects.values_list("status", flat=True)), {"200: OK"}
+        )
+
+    def test_send_pending_messages_command(self):
+        self.ready_for_review()
+        self.end_window()
+        out = StringIO()
+
+        call_command("send_pending_messages", stdout=out)
+
+        self.mock_send_email.assert_called_once()
+        self.assertIn("1 delivery sent.", out.getvalue())
+
 
 @override_settings(
     SEND_MESSAGES=True,
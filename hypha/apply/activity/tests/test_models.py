@@ -3,8 +3,15 @@ from django.test import TestCase
 from hypha.apply.funds.tests.factories import ApplicationSubmissionFactory
 from hypha.apply.projects.reports.tests.factories import ReportFactory
 from hypha.apply.projects.tests.factories import InvoiceFactory, ProjectFactory
+from hypha.apply.users.roles import APPLICANT_GROUP_NAME
+from hypha.apply.users.tests.factories import (
+    ApplicantFactory,
+    GroupFactory,
+    ReviewerFactory,
+    StaffFactory,
+)
 
-from ..models import Activity
+from ..models import ALL, APPLICANT, REVIEWER, TEAM, Activity
 from .factories import ActivityFactory, CommentFactory
 
 
@@ -37,3 +44,57 @@ class TestActivityModel(TestCase):
         other = ReportFactory()
         activity = ActivityFactory(related_object=other)
         self.assertEqual(other, activity.related_object)
+
+
+class TestActivityVisibleTo(TestCase):
+    def visible(self, user):
+        return set(Activity.objects.visible_to(user))
+
+    def test_staff_see_everything(self):
+        activities = {
+            ActivityFactory(visibility=visibility)
+            for visibility in [ALL, APPLICANT, REVIEWER, TEAM]
+        }
+        activities.add(ActivityFactory(hidden_from_applicants=True))
+        self.assertEqual(self.visible(StaffFactory()), activities)
+
+    def test_applicant_sees_applicant_and_own_activities(self):
+        applicant = ApplicantFactory()
+        public = ActivityFactory(visibility=ALL)
+        for_applicant = ActivityFactory(visibility=APPLICANT)
+        own = ActivityFactory(visibility=TEAM, user=applicant)
+        ActivityFactory(visibility=REVIEWER)
+        ActivityFactory(visibility=TEAM)
+        self.assertEqual(self.visible(applicant), {public, for_applicant, own})
+
+    def test_applicant_doesnt_see_hidden_activities(self):
+        applicant = ApplicantFactory()
+        ActivityFactory(visibility=ALL, hidden_from_applicants=True)
+        ActivityFactory(visibility=TEAM, user=applicant, hidden_from_applicants=True)
+        self.assertEqual(self.visible(applicant), set())
+
+    def test_applicant_reviewer(self):
+        user = ReviewerFactory()
+        user.groups.add(GroupFactory(name=APPLICANT_GROUP_NAME))
+        submission = ApplicationSubmissionFactory(user=user)
+        project = ProjectFactory(user=user)
+
+        own_submission = ActivityFactory(source=submission, visibility=APPLICANT)
+        own_project = ActivityFactory(source=project, visibility=APPLICANT)
+        ActivityFactory(source=submission, visibility=REVIEWER)
+        for_reviewers = ActivityFactory(visibility=REVIEWER)
+        ActivityFactory(visibility=APPLICANT)
+        own_review = ActivityFactory(visibility=TEAM, user=user)
+        ActivityFactory(visibility=TEAM, user=user, hidden_from_applicants=True)
+
+        self.assertEqual(
+            self.visible(user),
+            {own_submission, own_project, for_reviewers, own_review},
+        )
+
+    def test_applicant_reviewer_without_authored_sources(self):
+        user = ReviewerFactory()
+        user.groups.add(GroupFactory(name=APPLICANT_GROUP_NAME))
+        for_reviewers = ActivityFactory(visibility=REVIEWER)
+        ActivityFactory(visibility=ALL, hidden_from_applicants=True)
+        self.assertEqual(self.visible(user), {for_reviewers})
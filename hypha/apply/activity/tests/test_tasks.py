@@ -1,8 +1,17 @@
+from smtplib import SMTPResponseException
 from unittest.mock import patch
 
-from django.test import SimpleTestCase, TestCase
-
-from ..tasks import send_mail_task, update_message_status
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..tasks import (
+    batch_mail,
+    send_mail,
+    send_mail_task,
+    send_mails_task,
+    update_message_status,
+)
 from .factories import MessageFactory
 
 
@@ -55,3 +64,83 @@ class TestUpdateMessageStatus(TestCase):
         message.refresh_from_db()
 
         self.assertEqual(message.status, "sent")
+
+
+class TestSendMails(TestCase):
+    def email(self, *logs):
+        return {
+            "subject": "subject",
+            "body": "body",
+            "from_email": "from@example.org",
+            "to": [logs[0].recipient],
+            "logs": [log.pk for log in logs],
+        }
+
+    def test_emails_sent_over_one_connection(self):
+        messages = MessageFactory.create_batch(3)
+
+        with patch.object(EmailBackend, "open", autospec=True) as open_connection:
+            send_mails_task.apply(args=([self.email(m) for m in messages],))
+
+        open_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+        for message in messages:
+            message.refresh_from_db()
+            self.assertEqual(message.status, "sent")
+            self.assertIsNone(message.external_id)
+
+    def test_statuses_updated_with_one_query(self):
+        messages = MessageFactory.create_batch(3)
+
+        with self.assertNumQueries(1):
+            send_mails_task.apply(args=([self.email(m) for m in messages],))
+
+    def test_failed_email_status(self):
+        failed, sent = MessageFactory.create_batch(2)
+        sent.status = "queued"
+        sent.save()
+
+        with patch.object(
+            EmailBackend,
+            "send_messages",
+            autospec=True,
+            side_effect=[Exception("this is an error"), 1],
+        ):
+            send_mails_task.apply(args=([self.email(failed), self.email(sent)],))
+
+        failed.refresh_from_db()
+        sent.refresh_from_db()
+        self.assertEqual(failed.status, "Error: this is an error")
+        self.assertEqual(sent.status, "queued<br />sent")
+
+    def test_rate_limited_email_retried(self):
+        message = MessageFactory()
+
+        with patch.object(
+            EmailBackend,
+            "send_messages",
+            autospec=True,
+            side_effect=[SMTPResponseException(421, "Too many messages"), 1],
+        ) as send_messages:
+            send_mails_task.apply(args=([self.email(message)],))
+
+        self.assertEqual(send_messages.call_count, 2)
+        message.refresh_from_db()
+        self.assertEqual(message.status, "sent")
+
+    @override_settings(EMAIL_BATCH_SIZE=2)
+    @patch("hypha.apply.activity.tasks.send_mails_task")
+    def test_batch_mail(self, task):
+        messages = MessageFactory.create_batch(3)
+
+        with batch_mail():
+            for message in messages:
+                send_mail("subject", "body", None, [message.recipient], logs=[message])
+            task.delay.assert_not_called()
+
+        self.assertEqual(task.delay.call_count, 2)
+        batches = [call.args[0] for call in task.delay.call_args_list]
+        self.assertEqual(
+            [[email["logs"] for email in batch] for batch in batches],
+            [[[messages[0].pk], [messages[1].pk]], [[messages[2].pk]]],
+        )
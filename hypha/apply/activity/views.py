@@ -1,6 +1,5 @@
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.exceptions import PermissionDenied
-from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, render
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
@@ -11,6 +10,7 @@ from rolepermissions.checkers import has_object_permission
 from hypha.apply.funds.models.submissions import ApplicationSubmission
 from hypha.apply.users.decorators import is_apply_staff, staff_required
 from hypha.apply.utils.storage import PrivateMediaView
+from hypha.core.paginator import KeysetPaginator
 
 from . import services
 from .filters import NotificationFilter
@@ -42,7 +42,9 @@ def partial_comments(request, pk: int):
     editable = not submission.is_archive
 
     qs = services.get_related_activities_for_user(submission, request.user)
-    page = Paginator(qs, per_page=10, orphans=5).page(request.GET.get("page", 1))  # type: ignore[var-annotated]
+    page = KeysetPaginator(qs, ["-timestamp", "-id"], per_page=10).page(
+        request.GET.get("cursor")
+    )
 
     ctx = {
         "page": page,
@@ -5,6 +5,7 @@ from django.shortcuts import render
 from django.views.decorators.http import require_GET
 
 from hypha.apply.funds.models.submissions import ApplicationSubmission
+from hypha.apply.funds.permissions import prefetch_permission_data
 from hypha.apply.funds.workflows import active_statuses
 from hypha.apply.projects.models import Project
 
@@ -33,6 +34,7 @@ def applicant_submissions(request):
 
     page = request.GET.get("page", 1)
     page = Paginator(active_submissions, per_page=5, orphans=3).page(page)
+    prefetch_permission_data(request.user, page.object_list)
     return render(
         request,
         template_name="dashboard/partials/applicant_submissions.html",
@@ -1,11 +1,160 @@
 import re
-from difflib import SequenceMatcher
-from typing import Tuple
+from bisect import bisect_left
+from collections import Counter
+from typing import List, Sequence, Tuple
 
 import nh3
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
+# HTML tags, entities, words, runs of whitespace and any other character, so a
+# change never splits a tag or an entity
+TOKEN_RE = re.compile(r"<[^>]*>|&#?\w+;|\w+|\s+|[^\w\s]")
+
+# Paragraph ends and list items, shown on their own line
+LINE_BREAK_RE = re.compile(r"(\.\n)|◦")
+
+# Gaps between unique tokens with more edits than this are shown replaced as a
+# whole, bounding the time spent on answers that were rewritten
+MAX_EDITS = 100
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text)
+
+
+def _unique_anchors(a, alo, ahi, b, blo, bhi) -> List[Tuple[int, int]]:
+    """The longest increasing run of tokens that occur exactly once in both"""
+    a_counts = Counter(a[alo:ahi])
+    b_positions = {}
+    for j in range(blo, bhi):
+        token = b[j]
+        if a_counts[token] == 1:
+            b_positions[token] = None if token in b_positions else j
+
+    pairs = [
+        (i, b_positions[a[i]])
+        for i in range(alo, ahi)
+        if b_positions.get(a[i]) is not None and a_counts[a[i]] == 1
+    ]
+
+    # Patience sorting on the positions in b
+    tails = []
+    tail_index = []
+    previous = [None] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pile = bisect_left(tails, j)
+        if pile == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[pile] = j
+            tail_index[pile] = index
+        previous[index] = tail_index[pile - 1] if pile else None
+
+    anchors = []
+    index = tail_index[-1] if tail_index else None
+    while index is not None:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _myers(a, alo, ahi, b, blo, bhi, matches):
+    """Match the tokens of a gap with the O(ND) algorithm of Myers"""
+    n, m = ahi - alo, bhi - blo
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, MAX_EDITS) + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+    else:
+        # Too different, leave it as a replacement
+        return
+
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[previous_k]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            matches.append((alo + x, blo + y))
+        x, y = previous_x, previous_y
+
+
+def _match(a, alo, ahi, b, blo, bhi, matches):
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        matches.append((alo, blo))
+        alo += 1
+        blo += 1
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        matches.append((ahi, bhi))
+    if alo == ahi or blo == bhi:
+        return
+
+    anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+    if not anchors:
+        _myers(a, alo, ahi, b, blo, bhi, matches)
+        return
+    for i, j in anchors:
+        _match(a, alo, i, b, blo, j, matches)
+        matches.append((i, j))
+        alo, blo = i + 1, j + 1
+    _match(a, alo, ahi, b, blo, bhi, matches)
+
+
+def diff_opcodes(a: Sequence, b: Sequence) -> List[Tuple[str, int, int, int, int]]:
+    """The opcodes turning `a` into `b`, like `SequenceMatcher.get_opcodes`.
+
+    A patience diff: the tokens that occur once in both sequences anchor the
+    matching, the gaps in between are matched with the Myers algorithm.
+    """
+    matches = []
+    _match(a, 0, len(a), b, 0, len(b), matches)
+    matches.sort()
+
+    opcodes = []
+    i = j = 0
+    for match_i, match_j in [*matches, (len(a), len(b))]:
+        if i < match_i and j < match_j:
+            opcodes.append(("replace", i, match_i, j, match_j))
+        elif i < match_i:
+            opcodes.append(("delete", i, match_i, j, j))
+        elif j < match_j:
+            opcodes.append(("insert", i, i, j, match_j))
+        if match_i < len(a):
+            if opcodes and opcodes[-1][0] == "equal" and opcodes[-1][2] == match_i:
+                _, i1, _, j1, _ = opcodes[-1]
+                opcodes[-1] = ("equal", i1, match_i + 1, j1, match_j + 1)
+            else:
+                opcodes.append(("equal", match_i, match_i + 1, match_j, match_j + 1))
+        i, j = match_i + 1, match_j + 1
+    return opcodes
+
 
 def wrap_deleted(text):
     return format_html("<del>{}</del>", mark_safe(text))
@@ -15,6 +164,13 @@ def wrap_added(text):
     return format_html("<ins>{}</ins>", mark_safe(text))
 
 
+def add_line_breaks(text: str) -> str:
+    return LINE_BREAK_RE.sub(
+        lambda match: f"{match.group(1)}<br><br>" if match.group(1) else "<br>◦",
+        text,
+    )
+
+
 def compare(answer_a: str, answer_b: str, should_clean: bool = True) -> Tuple[str, str]:
     """Compare two strings, populate diff HTML and insert it, and return a tuple of the given strings.
 
@@ -36,31 +192,29 @@ def compare(answer_a: str, answer_b: str, should_clean: bool = True) -> Tuple[st
         answer_a = nh3.clean(answer_a, tags=set(), attributes={})
         answer_b = nh3.clean(answer_b, tags=set(), attributes={})
 
-    diff = SequenceMatcher(None, answer_a, answer_b)
+    if answer_a == answer_b:
+        display = mark_safe(add_line_breaks(answer_a))
+        return (display, display)
+
+    a = tokenize(answer_a)
+    b = tokenize(answer_b)
     from_diff = []
     to_diff = []
-    for opcode, a0, a1, b0, b1 in diff.get_opcodes():
+    for opcode, a0, a1, b0, b1 in diff_opcodes(a, b):
+        from_text = "".join(a[a0:a1])
+        to_text = "".join(b[b0:b1])
         if opcode == "equal":
-            from_diff.append(mark_safe(diff.a[a0:a1]))
-            to_diff.append(mark_safe(diff.b[b0:b1]))
+            from_diff.append(from_text)
+            to_diff.append(to_text)
         elif opcode == "insert":
-            from_diff.append(mark_safe(diff.a[a0:a1]))
-            to_diff.append(wrap_added(diff.b[b0:b1]))
+            to_diff.append(wrap_added(to_text))
         elif opcode == "delete":
-            from_diff.append(wrap_deleted(diff.a[a0:a1]))
-            to_diff.append(mark_safe(diff.b[b0:b1]))
+            from_diff.append(wrap_deleted(from_text))
         elif opcode == "replace":
-            from_diff.append(wrap_deleted(diff.a[a0:a1]))
-            to_diff.append(wrap_added(diff.b[b0:b1]))
-
-    from_display = "".join(from_diff)
-
-    to_display = "".join(to_diff)
-    from_display = re.sub("(\\.\n)", r"\1<br><br>", from_display)
-    to_display = re.sub("(\\.\n)", r"\1<br><br>", to_display)
-    from_display = re.sub(r"([◦])", r"<br>\1", from_display)
-    to_display = re.sub(r"([◦])", r"<br>\1", to_display)
-    from_display = mark_safe(from_display)
-    to_display = mark_safe(to_display)
+            from_diff.append(wrap_deleted(from_text))
+            to_diff.append(wrap_added(to_text))
+
+    from_display = mark_safe(add_line_breaks("".join(from_diff)))
+    to_display = mark_safe(add_line_breaks("".join(to_diff)))
 
     return (from_display, to_display)
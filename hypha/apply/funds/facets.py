@@ -0,0 +1,105 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .models import ApplicationSubmission
+
+FACETS_VERSION_KEY = "funds:facets:version"
+
+# Facet name and the submission column it is grouped on
+FACET_COLUMNS = {
+    "status": "status",
+    "fund": "page",
+    "round": "round",
+    "lead": "lead",
+}
+
+
+def _facets_sql(queryset):
+    """
+    One grouped pass over the submissions matched by `queryset`, with a grouping
+    set per facet. Tags are joined in, so submissions are counted distinctly.
+    """
+    opts = ApplicationSubmission._meta
+    meta_terms = opts.get_field("meta_terms")
+    qn = connection.ops.quote_name
+
+    columns = [
+        f"s.{qn(opts.get_field(name).column)}" for name in FACET_COLUMNS.values()
+    ]
+    columns.append(f"t.{qn(meta_terms.m2m_reverse_name())}")
+
+    inner_sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    sql = (
+        f"SELECT {', '.join(columns)}, GROUPING({', '.join(columns)}), "
+        f"COUNT(DISTINCT s.{qn(opts.pk.column)}) "
+        f"FROM {qn(opts.db_table)} s "
+        f"LEFT JOIN {qn(meta_terms.m2m_db_table())} t "
+        f"ON t.{qn(meta_terms.m2m_column_name())} = s.{qn(opts.pk.column)} "
+        f"WHERE s.{qn(opts.pk.column)} IN ({inner_sql}) "
+        f"GROUP BY GROUPING SETS ({', '.join(f'({column})' for column in columns)})"
+    )
+    return sql, params
+
+
+def facet_counts(queryset) -> dict:
+    """
+    Count the submissions in `queryset` per status, fund, round, lead and tag.
+
+    Returns a dict keyed on the facet name ("status", "fund", "round", "lead" and
+    "meta_terms"), each mapping the value (the status name or the related id) to
+    the number of submissions with it. Submissions without a value are left out.
+    """
+    names = [*FACET_COLUMNS, "meta_terms"]
+    # GROUPING() sets a bit, from the left, for every column not in the group
+    all_bits = (1 << len(names)) - 1
+    facet_for_mask = {
+        all_bits ^ (1 << (len(names) - 1 - i)): (i, name)
+        for i, name in enumerate(names)
+    }
+
+    counts = {name: {} for name in names}
+    sql, params = _facets_sql(queryset)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for *values, mask, count in cursor.fetchall():
+            i, name = facet_for_mask[mask]
+            if values[i] is not None:
+                counts[name][values[i]] = count
+    return counts
+
+
+def _facets_version():
+    version = cache.get(FACETS_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(FACETS_VERSION_KEY, version, None)
+    return version
+
+
+def cached_facet_counts(queryset) -> dict:
+    """
+    `facet_counts()` cached for `SUBMISSION_FACETS_CACHE_TIMEOUT` seconds.
+
+    The cache key is a digest of the query, so every combination of filters (and
+    the permissions that narrow the queryset) is cached on its own.
+    """
+    sql, params = _facets_sql(queryset)
+    signature = hashlib.md5(
+        f"{sql}{params}".encode(), usedforsecurity=False
+    ).hexdigest()
+    key = f"funds:facets:{_facets_version()}:{signature}"
+
+    counts = cache.get(key)
+    if counts is None:
+        counts = facet_counts(queryset)
+        cache.set(key, counts, settings.SUBMISSION_FACETS_CACHE_TIMEOUT)
+    return counts
+
+
+def invalidate_facet_counts():
+    """Drop every cached facet count, they expire with the version they were made with."""
+    cache.delete(FACETS_VERSION_KEY)
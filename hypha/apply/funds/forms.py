@@ -69,12 +69,9 @@ class ProgressSubmissionForm(ApplicationSubmissionModelForm):
     def __init__(self, *args, **kwargs):
         self.user = kwargs.pop("user")
         super().__init__(*args, **kwargs)
-        choices = list(self.instance.get_actions_for_user(self.user))
-        # Sort the transitions by the order they are listed.
-        sort_by = list(self.instance.phase.transitions.keys())
-        choices.sort(key=lambda k: sort_by.index(k[0]))
+        # The transitions are in the order they are listed in the workflow
         action_field = self.fields["action"]
-        action_field.choices = choices
+        action_field.choices = list(self.instance.get_actions_for_user(self.user))
 
 
 class UpdateSubmissionLeadForm(ApplicationSubmissionModelForm):
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hypha.apply.funds.models import ApplicationRevision
+
+
+class Command(BaseCommand):
+    help = (
+        "Store the revisions saved as full copies of the form data as patches to "
+        "the previous revision where it is worth it"
+    )
+
+    def handle(self, *args, **options):
+        submission_ids = (
+            ApplicationRevision.objects.filter(base__isnull=True)
+            .order_by("submission_id")
+            .values_list("submission_id", flat=True)
+            .distinct()
+        )
+
+        compressed = 0
+        for submission_id in submission_ids.iterator():
+            with transaction.atomic():
+                previous = None
+                for revision in ApplicationRevision.objects.filter(
+                    submission_id=submission_id
+                ).order_by("id"):
+                    if revision.base_id is None and previous is not None:
+                        revision.store(revision.snapshot, base=previous)
+                        if revision.base_id is not None:
+                            revision.save_stored()
+                            compressed += 1
+                    previous = revision
+
+        self.stdout.write(f"{compressed} revisions compressed.")
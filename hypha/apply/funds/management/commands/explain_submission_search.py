@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from hypha.apply.funds.models import ApplicationSubmission
+from hypha.apply.search.planner import SubmissionSearchPlanner
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Show the Postgres plan and timing of a search on the submission list"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "query", help='The search, as typed in the list, e.g. "lead:@me hello"'
+        )
+        parser.add_argument(
+            "--user",
+            action="store",
+            required=True,
+            help="Email of the user to search as, @me filters refer to them",
+        )
+        parser.add_argument(
+            "--limit",
+            action="store",
+            type=int,
+            default=60,
+            help="Number of rows to fetch, the size of a page by default",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["user"])
+        except User.DoesNotExist as e:
+            raise CommandError(f"No user with the email {options['user']}") from e
+
+        queryset = (
+            ApplicationSubmission.objects.current()
+            .exclude_draft()
+            .for_table(user)
+            .order_by("-submit_time", "-id")
+        )
+        result = SubmissionSearchPlanner(options["query"], user).explain(
+            queryset, limit=options["limit"]
+        )
+
+        self.stdout.write(result["plan"])
+        self.stdout.write(
+            f"Planning: {result['planning_time']} ms, "
+            f"execution: {result['execution_time']} ms"
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from hypha.apply.funds.models import ApplicationSubmission, SubmissionSummary
+
+
+class Command(BaseCommand):
+    help = "Recalculate the summary shown in the submission lists for every submission"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            action="store",
+            type=int,
+            default=500,
+            help="Number of submissions to recalculate per query",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        submission_ids = list(
+            ApplicationSubmission.objects.order_by("id").values_list("id", flat=True)
+        )
+
+        for start in range(0, len(submission_ids), batch_size):
+            SubmissionSummary.objects.refresh(
+                submission_ids[start : start + batch_size]
+            )
+
+        self.stdout.write(f"{len(submission_ids)} submission summaries rebuilt.")
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from hypha.apply.funds.models import ApplicationSubmission
+from hypha.apply.funds.tasks import reindex_submissions
+from hypha.apply.funds.utils import SEARCH_INDEX_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index of submissions waiting to be reindexed, or of all submissions with --all"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Reindex every submission, e.g. after a change to the indexed fields",
+        )
+        parser.add_argument(
+            "--batch-size",
+            action="store",
+            type=int,
+            default=SEARCH_INDEX_BATCH_SIZE,
+            help="Number of submissions to reindex per query",
+        )
+
+    def handle(self, *args, **options):
+        submissions = ApplicationSubmission.objects.order_by("id")
+        if not options["all"]:
+            submissions = submissions.filter(search_index_dirty=True)
+
+        count = reindex_submissions(
+            list(submissions.values_list("id", flat=True)),
+            batch_size=options["batch_size"],
+        )
+
+        self.stdout.write(f"{count} submission{'s' if count != 1 else ''} reindexed.")
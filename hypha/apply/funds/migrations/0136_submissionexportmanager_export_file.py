@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:11
+
+import django.core.files.storage
+import hypha.apply.funds.models.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("funds", "0135_alter_applicationsubmission_user_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="submissionexportmanager",
+            name="export_data",
+        ),
+        migrations.AddField(
+            model_name="submissionexportmanager",
+            name="export_file",
+            field=models.FileField(
+                blank=True,
+                storage=django.core.files.storage.FileSystemStorage(),
+                upload_to=hypha.apply.funds.models.utils.submission_export_path,
+            ),
+        ),
+    ]
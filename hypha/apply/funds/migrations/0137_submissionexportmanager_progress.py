@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("funds", "0136_submissionexportmanager_export_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submissionexportmanager",
+            name="completed_shards",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="submissionexportmanager",
+            name="exported_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="submissionexportmanager",
+            name="total_shards",
+            field=models.IntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("funds", "0137_submissionexportmanager_progress"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubmissionSummary",
+            fields=[
+                (
+                    "submission",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="list_summary",
+                        serialize=False,
+                        to="funds.applicationsubmission",
+                    ),
+                ),
+                ("last_update", models.DateTimeField(db_index=True, null=True)),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("review_staff_count", models.PositiveIntegerField(default=0)),
+                ("review_submitted_count", models.PositiveIntegerField(default=0)),
+                ("review_recommendation", models.IntegerField(null=True)),
+                ("opinion_disagree", models.PositiveIntegerField(default=0)),
+                (
+                    "comment_count",
+                    models.PositiveIntegerField(db_index=True, default=0),
+                ),
+                ("applicant_comment_count", models.PositiveIntegerField(default=0)),
+                ("team_comment_count", models.PositiveIntegerField(default=0)),
+                ("reviewer_comment_count", models.PositiveIntegerField(default=0)),
+                ("all_comment_count", models.PositiveIntegerField(default=0)),
+                (
+                    "last_update_user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "screening_status",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="funds.screeningstatus",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "submission summary",
+                "verbose_name_plural": "submission summaries",
+            },
+        ),
+    ]
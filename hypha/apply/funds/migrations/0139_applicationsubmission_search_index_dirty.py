@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("categories", "0008_alter_category_options_alter_option_options_and_more"),
+        ("funds", "0138_submissionsummary"),
+        ("wagtailcore", "0094_alter_page_locale"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="applicationsubmission",
+            name="search_index_dirty",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name="applicationsubmission",
+            index=models.Index(
+                condition=models.Q(("search_index_dirty", True)),
+                fields=["id"],
+                name="funds_submission_search_dirty",
+            ),
+        ),
+    ]
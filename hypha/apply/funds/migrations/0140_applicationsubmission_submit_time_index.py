@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("categories", "0008_alter_category_options_alter_option_options_and_more"),
+        ("funds", "0139_applicationsubmission_search_index_dirty"),
+        ("wagtailcore", "0094_alter_page_locale"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="applicationsubmission",
+            index=models.Index(
+                fields=["submit_time"], name="funds_submission_submit_time"
+            ),
+        ),
+    ]
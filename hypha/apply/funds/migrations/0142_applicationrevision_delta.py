@@ -0,0 +1,44 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import hypha.apply.stream_forms.files
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("funds", "0141_submission_autocomplete_index"),
+    ]
+
+    operations = [
+        # The existing revisions are kept as full copies, the
+        # compress_revisions command stores them as patches
+        migrations.RenameField(
+            model_name="applicationrevision",
+            old_name="form_data",
+            new_name="snapshot",
+        ),
+        migrations.AlterField(
+            model_name="applicationrevision",
+            name="snapshot",
+            field=models.JSONField(
+                encoder=hypha.apply.stream_forms.files.StreamFieldDataEncoder,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="applicationrevision",
+            name="base",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="+",
+                to="funds.applicationrevision",
+            ),
+        ),
+        migrations.AddField(
+            model_name="applicationrevision",
+            name="delta",
+            field=models.BinaryField(editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,141 @@
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+
+BATCH_SIZE = 500
+
+COMMENT_COUNT_FIELDS = {
+    "applicant": "applicant_comment_count",
+    "team": "team_comment_count",
+    "reviewers": "reviewer_comment_count",
+    "all": "all_comment_count",
+}
+
+AGREE = 1
+DISAGREE = 0
+MAYBE = 1
+
+
+def counts(queryset, key):
+    return dict(queryset.values_list(key).annotate(count=Count("pk", distinct=True)))
+
+
+def fill_submission_summaries(apps, schema_editor):
+    """Fill the summary of the submissions created before the table existed.
+
+    The same figures as `SubmissionSummary.objects.refresh()`, calculated with
+    the models of this migration so it keeps working when the app changes.
+    """
+    Activity = apps.get_model("activity", "Activity")
+    ApplicationSubmission = apps.get_model("funds", "ApplicationSubmission")
+    AssignedReviewers = apps.get_model("funds", "AssignedReviewers")
+    Review = apps.get_model("review", "Review")
+    ReviewOpinion = apps.get_model("review", "ReviewOpinion")
+    SubmissionSummary = apps.get_model("funds", "SubmissionSummary")
+    ScreeningStatuses = ApplicationSubmission.screening_statuses.through
+
+    submission_ids = list(
+        ApplicationSubmission.objects.filter(list_summary__isnull=True)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    # Activities of submissions, the generic relation isn't available here
+    activities = Activity.objects.filter(
+        source_content_type__app_label="funds",
+        source_content_type__model="applicationsubmission",
+    )
+    latest_activity = activities.filter(source_object_id=OuterRef("id")).order_by(
+        "-timestamp"
+    )
+    for start in range(0, len(submission_ids), BATCH_SIZE):
+        batch = submission_ids[start : start + BATCH_SIZE]
+
+        last_updates = ApplicationSubmission.objects.filter(id__in=batch).annotate(
+            last_update=Subquery(latest_activity.values("timestamp")[:1]),
+            last_update_user_id=Subquery(latest_activity.values("user_id")[:1]),
+        )
+        comment_counts = defaultdict(dict)
+        for submission_id, visibility, count in (
+            activities.filter(type="comment", current=True, source_object_id__in=batch)
+            .values_list("source_object_id", "visibility")
+            .annotate(count=Count("pk"))
+        ):
+            if visibility in COMMENT_COUNT_FIELDS:
+                comment_counts[submission_id][COMMENT_COUNT_FIELDS[visibility]] = count
+
+        reviewers = AssignedReviewers.objects.filter(submission_id__in=batch)
+        review_counts = counts(reviewers, "submission_id")
+        review_staff_counts = counts(
+            reviewers.filter(type__name="Staff"), "submission_id"
+        )
+        review_submitted_counts = counts(
+            reviewers.filter(
+                Q(opinions__opinion=AGREE)
+                | Q(review__isnull=False, review__is_draft=False)
+            ),
+            "submission_id",
+        )
+        opinion_disagree = dict(
+            ReviewOpinion.objects.filter(
+                opinion=DISAGREE, review__submission_id__in=batch
+            )
+            .values_list("review__submission_id")
+            .annotate(count=Count("*"))
+        )
+        recommendations = {
+            submission_id: total // count
+            for submission_id, total, count in Review.objects.filter(
+                submission_id__in=batch, is_draft=False
+            )
+            .values_list("submission_id")
+            .annotate(total=Sum("recommendation"), count=Count("recommendation"))
+            if count
+        }
+        screening_statuses = {}
+        for submission_id, screening_status_id in (
+            ScreeningStatuses.objects.filter(applicationsubmission_id__in=batch)
+            .order_by("-screeningstatus_id")
+            .values_list("applicationsubmission_id", "screeningstatus_id")
+        ):
+            screening_statuses[submission_id] = screening_status_id
+
+        summaries = []
+        for submission in last_updates:
+            submission_id = submission.id
+            comments = comment_counts[submission_id]
+            summaries.append(
+                SubmissionSummary(
+                    submission_id=submission_id,
+                    last_update=submission.last_update,
+                    last_update_user_id=submission.last_update_user_id,
+                    review_count=review_counts.get(submission_id, 0),
+                    review_staff_count=review_staff_counts.get(submission_id, 0),
+                    review_submitted_count=review_submitted_counts.get(
+                        submission_id, 0
+                    ),
+                    opinion_disagree=opinion_disagree.get(submission_id, 0),
+                    review_recommendation=(
+                        MAYBE
+                        if opinion_disagree.get(submission_id)
+                        else recommendations.get(submission_id)
+                    ),
+                    screening_status_id=screening_statuses.get(submission_id),
+                    comment_count=sum(comments.values()),
+                    **comments,
+                )
+            )
+        SubmissionSummary.objects.bulk_create(summaries, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activity", "0098_activity_hidden_from_applicants"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("funds", "0142_applicationrevision_delta"),
+        ("review", "0028_alter_review_options_alter_reviewform_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_submission_summaries, migrations.RunPython.noop),
+    ]
@@ -15,6 +15,7 @@ from .reminders import Reminder
 from .reviewer_role import ReviewerRole, ReviewerSettings
 from .screening import ScreeningStatus
 from .submissions import AnonymizedSubmission, ApplicationSubmission
+from .summary import SubmissionSummary
 
 __all__ = [
     "ApplicationForm",
@@ -28,6 +29,7 @@ __all__ = [
     "ReviewerSettings",
     "RoundsAndLabs",
     "ScreeningStatus",
+    "SubmissionSummary",
     "CoApplicant",
     "CoApplicantInvite",
 ]
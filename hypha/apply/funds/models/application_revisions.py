@@ -1,4 +1,7 @@
+import json
+
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -6,10 +9,31 @@ from django.utils.translation import gettext_lazy as _
 from hypha.apply.stream_forms.files import StreamFieldDataEncoder
 from hypha.apply.stream_forms.models import BaseStreamForm
 
+from .. import revision_delta
 from .mixins import AccessFormData
 
+# Every revision this many revisions after a full copy of the form data is
+# stored in full again, bounding the patches to apply to get to a revision
+KEYFRAME_INTERVAL = 10
+
+# Seconds the form data put together from patches is cached
+FORM_DATA_CACHE_TIMEOUT = 60 * 60
+
+
+def normalise(form_data: dict) -> dict:
+    """The form data as it is stored, e.g. with files as their name"""
+    return json.loads(json.dumps(form_data, cls=StreamFieldDataEncoder))
+
 
 class ApplicationRevision(BaseStreamForm, AccessFormData, models.Model):
+    """A version of the form data of a submission.
+
+    Only some revisions store a full copy of the form data, the `snapshot`. The
+    others store the `delta` to the previous revision of the submission, their
+    `base`, see `hypha.apply.funds.revision_delta`. `form_data` puts the data
+    back together when it is first accessed and is saved the same way.
+    """
+
     wagtail_reference_index_ignore = True
 
     submission = models.ForeignKey(
@@ -17,7 +41,15 @@ class ApplicationRevision(BaseStreamForm, AccessFormData, models.Model):
         related_name="revisions",
         on_delete=models.CASCADE,
     )
-    form_data = models.JSONField(encoder=StreamFieldDataEncoder)
+    snapshot = models.JSONField(encoder=StreamFieldDataEncoder, null=True)
+    base = models.ForeignKey(
+        "self",
+        on_delete=models.RESTRICT,
+        null=True,
+        editable=False,
+        related_name="+",
+    )
+    delta = models.BinaryField(null=True, editable=False)
     timestamp = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True
@@ -34,6 +66,120 @@ class ApplicationRevision(BaseStreamForm, AccessFormData, models.Model):
     def __str__(self):
         return f"Revision for {self.submission.title_text_display} by {self.author} "
 
+    @property
+    def form_data(self) -> dict:
+        if "_form_data" not in self.__dict__:
+            data = self.stored_form_data()
+            self.__dict__["_saved_form_data"] = json.dumps(data, sort_keys=True)
+            if data is not None:
+                data = self.deserialised_data(self, data, self.form_fields)
+                data = self.deserialize_form_data(self, data, self.form_fields)
+            self.__dict__["_form_data"] = data
+        return self.__dict__["_form_data"]
+
+    @form_data.setter
+    def form_data(self, value: dict):
+        self.__dict__["_form_data"] = value
+
+    def chain(self) -> list:
+        """The ids of the revisions from this one back to the last full copy"""
+        bases = dict(
+            ApplicationRevision.objects.filter(
+                submission_id=self.submission_id, id__lte=self.id
+            ).values_list("id", "base_id")
+        )
+        chain = [self.id]
+        while bases[chain[-1]] is not None:
+            chain.append(bases[chain[-1]])
+        return chain
+
+    def stored_form_data(self) -> dict:
+        """The form data as stored, put together from the patches if needed"""
+        if self.base_id is None:
+            return self.snapshot
+
+        key = f"funds:revision:{self.id}:{self.timestamp.timestamp()}"
+        data = cache.get(key)
+        if data is None:
+            chain = self.chain()
+            stored = {
+                revision_id: (snapshot, delta)
+                for revision_id, snapshot, delta in ApplicationRevision.objects.filter(
+                    id__in=chain
+                ).values_list("id", "snapshot", "delta")
+            }
+            data, _ = stored[chain[-1]]
+            for revision_id in reversed(chain[:-1]):
+                _, delta = stored[revision_id]
+                data = revision_delta.apply(data, revision_delta.decode(delta))
+            cache.set(key, data, FORM_DATA_CACHE_TIMEOUT)
+        return data
+
+    def store(self, data: dict, base=None):
+        """Store `data` as a patch to `base` where it is worth it, as a full copy
+        otherwise.
+        """
+        self.base, self.snapshot, self.delta = None, data, None
+        if base is None or len(base.chain()) >= KEYFRAME_INTERVAL:
+            return
+        delta = revision_delta.encode(
+            revision_delta.diff(base.stored_form_data(), data)
+        )
+        # The snapshot is compressed by Postgres too, only patches that are
+        # much smaller are worth putting the data back together
+        if len(delta) * 2 < len(json.dumps(data)):
+            self.base, self.snapshot, self.delta = base, None, delta
+
+    def previous_revision(self):
+        revisions = ApplicationRevision.objects.filter(submission_id=self.submission_id)
+        if self.id:
+            revisions = revisions.filter(id__lt=self.id)
+        return revisions.order_by("-id").first()
+
+    def save(self, *args, update_fields=None, **kwargs):
+        form_data = self.__dict__.get("_form_data")
+        if update_fields is not None:
+            if "form_data" not in update_fields:
+                return super().save(*args, update_fields=update_fields, **kwargs)
+            update_fields = set(update_fields) - {"form_data"}
+
+        dependants = []
+        if form_data is not None:
+            data = normalise(form_data)
+            saved = json.dumps(data, sort_keys=True)
+            if saved != self.__dict__.get("_saved_form_data"):
+                if self.id:
+                    # Revisions patching this one are rebased on its new data
+                    dependants = [
+                        (revision, revision.stored_form_data())
+                        for revision in ApplicationRevision.objects.filter(base=self.id)
+                    ]
+                self.store(data, base=self.previous_revision())
+                if update_fields is not None:
+                    update_fields |= {"snapshot", "base", "delta"}
+                self.__dict__["_saved_form_data"] = saved
+
+        super().save(*args, update_fields=update_fields, **kwargs)
+        for revision, revision_data in dependants:
+            revision.store(revision_data, base=self)
+            revision.save_stored()
+
+    def save_stored(self):
+        super().save(update_fields=["snapshot", "base", "delta"])
+
+    def delete(self, *args, **kwargs):
+        # Keep the revisions patching this one by storing them in full
+        for revision in ApplicationRevision.objects.filter(base=self.id):
+            revision.store(revision.stored_form_data())
+            revision.save_stored()
+        return super().delete(*args, **kwargs)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or {"snapshot", "base", "delta"} & set(fields):
+            self.__dict__.pop("_form_data", None)
+            self.__dict__.pop("_saved_form_data", None)
+
     @property
     def form_fields(self):
         return self.submission.form_fields
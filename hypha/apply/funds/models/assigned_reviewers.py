@@ -1,3 +1,4 @@
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.db import models
@@ -136,6 +137,8 @@ class AssignedReviewersQuerySet(models.QuerySet):
             ],
             ignore_conflicts=True,
         )
+        # bulk_create doesn't send post_save, update the review counts here
+        apps.get_model("funds", "SubmissionSummary").objects.refresh([submission.id])
 
     def update_role(self, role, reviewer, *submissions):
         # Remove role who didn't review
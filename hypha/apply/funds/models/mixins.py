@@ -1,7 +1,11 @@
+import hashlib
 import json
 import uuid
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.files import File
+from django.utils import translation
 from django.utils.safestring import mark_safe
 from django_file_form.models import PlaceholderUploadedFile
 
@@ -14,6 +18,7 @@ from hypha.apply.stream_forms.blocks import (
     MultiInputCharFieldBlock,
     UploadableMediaBlock,
 )
+from hypha.apply.stream_forms.schema import form_fields_key, form_schema_cache
 from hypha.apply.utils.blocks import SingleIncludeMixin
 from hypha.apply.utils.storage import PrivateStorage
 
@@ -26,6 +31,75 @@ class UnusedFieldException(Exception):
     pass
 
 
+class FormFieldsIndex:
+    """Lookup tables for a ``form_fields`` stream, built in a single pass.
+
+    Walking ``form_fields`` instantiates every block, so the mappings the
+    mixin needs (fields by id, named blocks, question and file ids) are
+    derived once here. Instances are shared through the form schema cache and
+    must not be modified.
+    """
+
+    def __init__(self, form_fields):
+        raw_fields = {}
+        named_blocks = {}
+        for field in form_fields:
+            raw_fields[field.id] = field
+            if isinstance(field.block, SingleIncludeMixin):
+                named_blocks[field.block.name] = field.id
+
+        fields = raw_fields.copy()
+        for field_name, field_id in named_blocks.items():
+            fields[field_name] = fields.pop(field_id)
+
+        self.raw_fields = raw_fields
+        self.named_blocks = named_blocks
+        self.named_field_ids = {
+            field_id: field_name for field_name, field_id in named_blocks.items()
+        }
+        self.fields = fields
+
+        self.uploadable_field_ids = tuple(
+            field_id
+            for field_id, field in raw_fields.items()
+            if isinstance(field.block, UploadableMediaBlock)
+        )
+        self.question_field_ids = tuple(
+            field_id
+            for field_id, field in fields.items()
+            if isinstance(field.block, FormFieldBlock)
+        )
+        self.file_field_ids = tuple(
+            field_id
+            for field_id, field in fields.items()
+            if isinstance(
+                field.block, (FileFieldBlock, ImageFieldBlock, MultiFileFieldBlock)
+            )
+        )
+        file_fields = set(self.file_field_ids)
+        self.question_text_field_ids = tuple(
+            field_id
+            for field_id in self.question_field_ids
+            if field_id not in file_fields
+        )
+
+        first_group_ids = []
+        for field_id, field in fields.items():
+            if field_id in file_fields:
+                continue
+            elif isinstance(field.block, GroupToggleBlock):
+                break
+            elif isinstance(field.block, FormFieldBlock):
+                first_group_ids.append(field_id)
+        self.first_group_question_text_field_ids = tuple(first_group_ids)
+
+        self.group_toggle_blocks = tuple(
+            (field_id, field)
+            for field_id, field in fields.items()
+            if isinstance(field.block, GroupToggleBlock)
+        )
+
+
 class AccessFormData:
     """Mixin for interacting with form data from streamfields
 
@@ -37,10 +111,21 @@ class AccessFormData:
     stream_file_class = PrivateStreamFieldFile
     storage_class = PrivateStorage
 
+    @property
+    def form_fields_index(self):
+        # Looked up again only when form_fields is assigned a new value, the index
+        # itself is shared by every instance with the same form definition
+        form_fields = self.form_fields
+        cached = self.__dict__.get("_form_fields_index")
+        if cached is None or cached[0] is not form_fields:
+            cached = (form_fields, form_schema_cache.get(form_fields, FormFieldsIndex))
+            self.__dict__["_form_fields_index"] = cached
+        return cached[1]
+
     @property
     def raw_data(self):
         # Returns the data mapped by field id instead of the data stored using the must include
-        # values
+        # values. A new dict is returned each time as callers use it as form initial data.
         data = self.form_data.copy()
         for field_name, field_id in self.named_blocks.items():
             if field_id not in data:
@@ -158,9 +243,8 @@ class AccessFormData:
 
     def extract_files(self):
         files = {}
-        for field in self.form_fields:
-            if isinstance(field.block, UploadableMediaBlock):
-                files[field.id] = self.data(field.id) or []
+        for field_id in self.form_fields_index.uploadable_field_ids:
+            files[field_id] = self.data(field_id) or []
         return files
 
     @classmethod
@@ -177,17 +261,12 @@ class AccessFormData:
     def deserialised_data(cls, instance, data, form_fields):
         # Converts the file dicts into actual file objects
         data = data.copy()
-        # PERFORMANCE NOTE:
-        # Do not attempt to iterate over form_fields - that will fully instantiate the form_fields
-        # including any sub queries that they do
-        for i, field_data in enumerate(form_fields.raw_data):
-            block = form_fields.stream_block.child_blocks[field_data["type"]]
-            if isinstance(block, UploadableMediaBlock):
-                field_id = field_data.get("id")
-                if field_id:
-                    field = form_fields[i]
-                    file = data.get(field_id, [])
-                    data[field_id] = cls.process_file(instance, field, file)
+        index = form_schema_cache.get(form_fields, FormFieldsIndex)
+        for field_id in index.uploadable_field_ids:
+            if field_id:
+                field = index.raw_fields[field_id]
+                file = data.get(field_id, [])
+                data[field_id] = cls.process_file(instance, field, file)
         return data
 
     def get_definitive_id(self, id):
@@ -203,87 +282,65 @@ class AccessFormData:
             raise UnusedFieldException(id) from None
 
     def data(self, id):
+        # Same lookup as raw_data[id] without copying the whole of form_data
         definitive_id = self.get_definitive_id(id)
-        try:
-            return self.raw_data[definitive_id]
-        except KeyError:
-            # We have most likely progressed application forms so the data isn't in form_data
-            return None
+        form_data = self.form_data
+        if definitive_id in form_data:
+            return form_data[definitive_id]
+        field_name = self.form_fields_index.named_field_ids.get(definitive_id)
+        # We have most likely progressed application forms so the data isn't in form_data
+        return form_data.get(field_name) if field_name else None
 
     @property
     def question_field_ids(self):
-        for field_id, field in self.fields.items():
-            if isinstance(field.block, FormFieldBlock):
-                yield field_id
+        return self.form_fields_index.question_field_ids
 
     @property
     def file_field_ids(self):
-        for field_id, field in self.fields.items():
-            if isinstance(
-                field.block, (FileFieldBlock, ImageFieldBlock, MultiFileFieldBlock)
-            ):
-                yield field_id
+        return self.form_fields_index.file_field_ids
 
     @property
     def question_text_field_ids(self):
-        file_fields = set(self.file_field_ids)
-        for field_id, field in self.fields.items():
-            if field_id not in file_fields and isinstance(field.block, FormFieldBlock):
-                yield field_id
+        return self.form_fields_index.question_text_field_ids
 
     @property
     def first_group_question_text_field_ids(self):
-        file_fields = list(self.file_field_ids)
-        for field_id, field in self.fields.items():
-            if field_id in file_fields:
-                continue
-            elif isinstance(field.block, GroupToggleBlock):
-                break
-            elif isinstance(field.block, FormFieldBlock):
-                yield field_id
+        return self.form_fields_index.first_group_question_text_field_ids
 
     @property
     def raw_fields(self):
         # Field ids to field class mapping - similar to raw_data
-        return {field.id: field for field in self.form_fields}
+        return self.form_fields_index.raw_fields
 
     @property
     def fields(self):
         # ALl fields on the application
-        fields = self.raw_fields.copy()
-        for field_name, field_id in self.named_blocks.items():
-            response = fields.pop(field_id)
-            fields[field_name] = response
-        return fields
+        return self.form_fields_index.fields
 
     @property
     def named_blocks(self):
-        return {
-            field.block.name: field.id
-            for field in self.form_fields
-            if isinstance(field.block, SingleIncludeMixin)
-        }
+        return self.form_fields_index.named_blocks
 
     @property
     def normal_blocks(self):
+        named_blocks = self.named_blocks
         return [
             field_id
             for field_id in self.question_field_ids
-            if field_id not in self.named_blocks
+            if field_id not in named_blocks
         ]
 
     @property
     def group_toggle_blocks(self):
-        for field_id, field in self.fields.items():
-            if isinstance(field.block, GroupToggleBlock):
-                yield field_id, field
+        return self.form_fields_index.group_toggle_blocks
 
     @property
     def first_group_normal_text_blocks(self):
+        named_blocks = self.named_blocks
         return [
             field_id
             for field_id in self.first_group_question_text_field_ids
-            if field_id not in self.named_blocks
+            if field_id not in named_blocks
         ]
 
     def get_serialize_multi_inputs_answer(self, field):
@@ -323,7 +380,73 @@ class AccessFormData:
             return joined + "</section>"
         return joined
 
+    # Prefix of the keys rendered answers are cached under, None when they
+    # should not be cached
+    rendered_answers_cache_prefix = None
+
+    def rendered_answer_key(self, prefix, field_id, include_question):
+        """Cache key of a rendered answer.
+
+        It includes a hash of the answer and of the form, so an instance whose
+        data was changed in memory, e.g. to compare revisions, never reads the
+        answers of the saved data.
+        """
+        try:
+            field = self.field(field_id)
+        except UnusedFieldException:
+            answer = None
+        else:
+            if isinstance(field.block, MultiInputCharFieldBlock):
+                number_of_inputs = field.value.get("number_of_inputs")
+                answer = [
+                    self.data(field.id + "_" + str(i)) for i in range(number_of_inputs)
+                ]
+            else:
+                answer = self.data(field_id)
+        content = json.dumps(
+            [form_fields_key(self.form_fields)[2], answer], sort_keys=True, default=str
+        )
+        digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+        language = translation.get_language()
+        return (
+            f"answers:{prefix}:{field_id}:{int(include_question)}:{language}:{digest}"
+        )
+
+    def render_answers_for(self, field_ids, include_question=False):
+        """The rendered answers of the fields, in order.
+
+        Answers are cached when the instance sets a cache prefix, otherwise
+        they are rendered each time.
+        """
+        prefix = self.rendered_answers_cache_prefix
+        if prefix is None:
+            return [
+                self.render_uncached_answer(field_id, include_question)
+                for field_id in field_ids
+            ]
+
+        keys = [
+            self.rendered_answer_key(prefix, field_id, include_question)
+            for field_id in field_ids
+        ]
+        rendered = self.__dict__.setdefault("_rendered_answers", {})
+        if missing := [key for key in keys if key not in rendered]:
+            rendered.update(cache.get_many(missing))
+
+        new_answers = {}
+        for field_id, key in zip(field_ids, keys, strict=True):
+            if key not in rendered:
+                rendered[key] = new_answers[key] = self.render_uncached_answer(
+                    field_id, include_question
+                )
+        if new_answers:
+            cache.set_many(new_answers, settings.RENDERED_ANSWERS_CACHE_TIMEOUT)
+        return [rendered[key] for key in keys]
+
     def render_answer(self, field_id, include_question=False):
+        return self.render_answers_for([field_id], include_question)[0]
+
+    def render_uncached_answer(self, field_id, include_question=False):
         try:
             field = self.field(field_id)
         except UnusedFieldException:
@@ -344,24 +467,23 @@ class AccessFormData:
 
     def render_answers(self):
         # Returns a list of the rendered answers
-        return [
-            self.render_answer(field_id, include_question=True)
-            for field_id in self.normal_blocks
-        ]
+        return self.render_answers_for(self.normal_blocks, include_question=True)
 
     def render_first_group_text_answers(self):
-        return [
-            self.render_answer(field_id, include_question=True)
-            for field_id in self.first_group_normal_text_blocks
-        ]
+        return self.render_answers_for(
+            self.first_group_normal_text_blocks, include_question=True
+        )
 
     def render_text_blocks_answers(self):
         # Returns a list of the rendered answers of type text
-        return [
-            self.render_answer(field_id, include_question=True)
-            for field_id in self.question_text_field_ids
-            if field_id not in self.named_blocks
-        ]
+        return self.render_answers_for(
+            [
+                field_id
+                for field_id in self.question_text_field_ids
+                if field_id not in self.named_blocks
+            ],
+            include_question=True,
+        )
 
     def output_answers(self):
         # Returns a safe string of the rendered answers
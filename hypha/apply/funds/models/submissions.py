@@ -10,10 +10,11 @@ from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.exceptions import PermissionDenied
-from django.db import models
+from django.db import models, transaction
 from django.db.models import (
     Avg,
     Count,
+    F,
     FloatField,
     OuterRef,
     Q,
@@ -39,10 +40,7 @@ from hypha.apply.categories.blocks import CategoryQuestionBlock
 from hypha.apply.categories.models import MetaTerm, Option
 from hypha.apply.determinations.models import Determination
 from hypha.apply.flags.models import Flag
-from hypha.apply.funds.services import (
-    annotate_comments_count,
-    annotate_review_recommendation_and_count,
-)
+from hypha.apply.funds.services import annotate_comments_count
 from hypha.apply.review.options import AGREE
 from hypha.apply.stream_forms.files import StreamFieldDataEncoder
 from hypha.apply.stream_forms.models import BaseStreamForm
@@ -71,6 +69,12 @@ from ..workflows.constants import (
     STAGE_CHANGE_ACTIONS,
     UserPermissions,
 )
+from ..workflows.registry import (
+    FINAL_STAGE_STATUSES,
+    PHASE_LOOKUP,
+    STATUS_CHOICES,
+    get_transition_actions,
+)
 from .mixins import AccessFormData
 from .reviewer_role import ReviewerRole
 from .utils import (
@@ -227,13 +231,26 @@ class ApplicationSubmissionQueryset(JSONOrderable):
             last_update=Subquery(latest_activity.values("timestamp")[:1]),
         )
 
+    def with_summary(self):
+        """Annotate the figures kept on the submission summary, under the names
+        used by `with_latest_update` and `annotate_review_recommendation_and_count`.
+        """
+        return self.annotate(
+            last_update=F("list_summary__last_update"),
+            last_user_update=F("list_summary__last_update_user__full_name"),
+            review_count=F("list_summary__review_count"),
+            review_staff_count=F("list_summary__review_staff_count"),
+            review_submitted_count=F("list_summary__review_submitted_count"),
+            review_recommendation=F("list_summary__review_recommendation"),
+            opinion_disagree=F("list_summary__opinion_disagree"),
+        ).select_related("list_summary__screening_status")
+
     def for_table(self, user):
         roles_for_review = self.model.assigned.field.model.objects.with_roles().filter(
             submission=OuterRef("id"), reviewer=user
         )
 
-        qs = annotate_review_recommendation_and_count(self.with_latest_update())
-        qs = annotate_comments_count(qs, user)
+        qs = annotate_comments_count(self.with_summary(), user)
         return (
             qs.annotate(
                 role_icon=Subquery(roles_for_review[:1].values("role__icon")),
@@ -247,7 +264,6 @@ class ApplicationSubmissionQueryset(JSONOrderable):
                 "previous__round",
                 "previous__lead",
             )
-            .prefetch_related("screening_statuses")
             .defer("search_data", "search_document")
         )
 
@@ -267,6 +283,32 @@ def make_permission_check(users):
     return can_transition
 
 
+def get_transition_roles(instance, user):
+    """The roles of `make_permission_check` the user holds on the submission"""
+    roles = set()
+    if user.is_apply_staff:
+        roles.add(UserPermissions.STAFF)
+    if user.is_superuser:
+        roles.add(UserPermissions.ADMIN)
+    if user.pk is not None and instance.lead_id == user.pk:
+        roles.add(UserPermissions.LEAD)
+    if user.pk is not None and instance.user_id == user.pk:
+        roles.add(UserPermissions.APPLICANT)
+    return frozenset(roles)
+
+
+def get_actions_for_submissions(submissions, user):
+    """The actions the user can take on each submission, by submission id.
+
+    Submissions with the same workflow, status and roles share their actions,
+    only transition conditions are checked for each submission.
+    """
+    return {
+        submission.id: list(submission.get_actions_for_user(user))
+        for submission in submissions
+    }
+
+
 def wrap_method(func):
     def wrapped(*args, **kwargs):
         # Provides a new function that can be wrapped with the viewflow-fsm method
@@ -282,14 +324,6 @@ def transition_id(target, phase):
     return "__".join([transition_prefix, phase.stage.name.lower(), phase.name, target])
 
 
-def get_all_possible_states():
-    all_states = set()
-    for workflow in WORKFLOWS.values():
-        for phase_name, data in workflow.items():
-            all_states.add((phase_name, data.display_name))
-    return sorted(all_states, key=lambda x: x[0])
-
-
 class AddTransitions(models.base.ModelBase):
     def __new__(cls, name, bases, attrs, **kwargs):
         status_field = attrs.get("status_field")
@@ -348,18 +382,14 @@ class AddTransitions(models.base.ModelBase):
         attrs["get_transition"] = get_transition
 
         def get_actions_for_user(self, user):
-            transitions = type(self).status_field.get_available_transitions(
-                self, self.status, user
+            # Same as the transitions available from the status field, without
+            # evaluating the permission of each transition
+            actions = get_transition_actions(
+                self.workflow_name, self.status, get_transition_roles(self, user)
             )
-            actions = [
-                (
-                    transition.target,
-                    self.phase.transitions[transition.target]["display"],
-                )
-                for transition in transitions
-                if self.get_transition(transition.target)
-            ]
-            yield from actions
+            for target, display, conditions in actions:
+                if all(getattr(self, condition)() for condition in conditions):
+                    yield target, display
 
         attrs["get_actions_for_user"] = get_actions_for_user
 
@@ -482,17 +512,19 @@ class ApplicationSubmission(
     )
     search_data = models.TextField()
     search_document = SearchVectorField(null=True)
+    # Set when the search fields are waiting for `update_submission_search_index`
+    search_index_dirty = models.BooleanField(default=False)
 
     # Workflow inherited from WorkflowHelpers
     status = models.CharField(
         _("status"),
         max_length=100,
-        choices=get_all_possible_states(),
+        choices=STATUS_CHOICES,
         default=INITIAL_STATE,
     )
     status_field = State(
         default=INITIAL_STATE,
-        states=get_all_possible_states(),
+        states=STATUS_CHOICES,
     )
 
     screening_statuses = models.ManyToManyField(
@@ -528,6 +560,12 @@ class ApplicationSubmission(
     class Meta:
         indexes = [
             GinIndex(fields=["search_document"]),
+            models.Index(fields=["submit_time"], name="funds_submission_submit_time"),
+            models.Index(
+                fields=["id"],
+                condition=Q(search_index_dirty=True),
+                name="funds_submission_search_dirty",
+            ),
         ]
         verbose_name = _("application submission")
         verbose_name_plural = _("application submissions")
@@ -557,7 +595,7 @@ class ApplicationSubmission(
         return strip_tags(settings.SUBMISSION_TITLE_TEXT_TEMPLATE.format(**ctx))
 
     def not_progressed(self):
-        return not self.next
+        return not self.next_id
 
     @status_field.transition(
         source="*",
@@ -585,7 +623,7 @@ class ApplicationSubmission(
 
     @property
     def phase(self):
-        return self.workflow.get(self.status)
+        return PHASE_LOOKUP.get((self.workflow_name, self.status))
 
     @property
     def active(self):
@@ -751,11 +789,11 @@ class ApplicationSubmission(
                     revision.is_draft = False
                     revision.save()
                 self.live_revision = revision
-                self.search_data = " ".join(list(self.prepare_search_values()))
-                self.search_document = self.prepare_search_vector()
+                self.prepare_search_index()
 
             self.draft_revision = revision
             self.save(skip_custom=True)
+            self.queue_search_index_update()
             return revision
         else:
             revision = self.draft_revision
@@ -767,9 +805,9 @@ class ApplicationSubmission(
                 revision.is_draft = False
                 revision.save()
                 self.live_revision = revision
-                self.search_data = " ".join(list(self.prepare_search_values()))
-                self.search_document = self.prepare_search_vector()
+                self.prepare_search_index()
                 self.save(skip_custom=True)
+                self.queue_search_index_update()
 
                 return revision
             return True
@@ -819,12 +857,10 @@ class ApplicationSubmission(
 
         self.clean_submission()
 
-        # add a denormed version of the answer for searching
-        # @TODO: remove 'search_data' in favour of 'search_document' for FTS
-        self.search_data = " ".join(self.prepare_search_values())
-        self.search_document = self.prepare_search_vector()
+        self.prepare_search_index()
 
         super().save(*args, **kwargs)
+        self.queue_search_index_update()
 
         if self.id and not self.public_id:
             self.public_id = f"{self.get_from_parent('submission_id_prefix')}{self.id}"
@@ -954,6 +990,36 @@ class ApplicationSubmission(
             search_vectors.append(SearchVector(Value(text), weight=weight))
         return reduce(operator.add, search_vectors)
 
+    def update_search_fields(self):
+        """Rebuild the denormalised answers used for searching."""
+        # @TODO: remove 'search_data' in favour of 'search_document' for FTS
+        self.search_data = " ".join(self.prepare_search_values())
+        self.search_document = self.prepare_search_vector()
+        self.search_index_dirty = False
+
+    def prepare_search_index(self):
+        """Refresh the search fields before saving, or mark them as out of date
+
+        Rendering the searchable content of every answer is slow, so with a
+        Celery worker available it is left to `update_submission_search_index`
+        once the submission has been saved.
+        """
+        if settings.CELERY_TASK_ALWAYS_EAGER:
+            self.update_search_fields()
+        else:
+            self.search_index_dirty = True
+
+    def queue_search_index_update(self):
+        if not self.search_index_dirty:
+            return
+
+        from ..tasks import update_submission_search_index
+
+        submission_id = self.id
+        transaction.on_commit(
+            lambda: update_submission_search_index.delay(submission_id)
+        )
+
     def get_absolute_url(self):
         return reverse("funds:submissions:detail", args=(self.id,))
 
@@ -974,14 +1040,7 @@ class ApplicationSubmission(
 
     @property
     def in_final_stage(self):
-        stages = self.workflow.stages
-
-        stage_index = stages.index(self.stage)
-
-        # adjust the index since list.index() is zero-based
-        adjusted_index = stage_index + 1
-
-        return adjusted_index == len(stages)
+        return self.status in FINAL_STAGE_STATUSES[self.workflow_name]
 
     @property
     def in_internal_review_phase(self):
@@ -1010,6 +1069,13 @@ class ApplicationSubmission(
 
         return form_data
 
+    @property
+    def rendered_answers_cache_prefix(self):
+        # Creating a new live revision starts a new set of cached answers
+        if self.pk and self.live_revision_id:
+            return f"{self.pk}:{self.live_revision_id}"
+        return None
+
     # Template methods for metaclass
     def _get_REQUIRED_display(self, name):
         return self.render_answer(name)
@@ -1094,7 +1160,7 @@ class AnonymizedSubmission(models.Model):
 
     status = models.CharField(
         max_length=100,
-        choices=get_all_possible_states(),
+        choices=STATUS_CHOICES,
         default=INITIAL_STATE,
     )
 
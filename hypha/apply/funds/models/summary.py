@@ -0,0 +1,164 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext_lazy as _
+
+from hypha.apply.activity.models import ALL, APPLICANT, REVIEWER, TEAM, Activity
+from hypha.apply.funds.services import annotate_review_recommendation_and_count
+
+from .screening import ScreeningStatus
+from .submissions import ApplicationSubmission
+
+# Comment visibility stored on the summary, mapped to the field holding its count
+COMMENT_COUNT_FIELDS = {
+    APPLICANT: "applicant_comment_count",
+    TEAM: "team_comment_count",
+    REVIEWER: "reviewer_comment_count",
+    ALL: "all_comment_count",
+}
+
+REVIEW_COUNT_FIELDS = (
+    "review_count",
+    "review_staff_count",
+    "review_submitted_count",
+    "opinion_disagree",
+)
+
+
+class SubmissionSummaryManager(models.Manager):
+    def refresh(self, submission_ids, create=True):
+        """Recalculate the summary of the given submissions.
+
+        Rows that don't exist yet are only created when `create` is set, so
+        a refresh triggered while a submission is being deleted can't bring
+        its summary back.
+        """
+        submission_ids = set(submission_ids)
+        if not submission_ids:
+            return
+
+        latest_activity = Activity.objects.filter(submission=OuterRef("id")).order_by(
+            "-timestamp"
+        )
+        comments = (
+            Activity.comments.filter(submission=OuterRef("id"))
+            .values("submission")
+            .order_by()
+        )
+        comment_counts = {
+            field: Coalesce(
+                Subquery(
+                    comments.filter(visibility=visibility)
+                    .annotate(count=Count("pk"))
+                    .values("count"),
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+            for visibility, field in COMMENT_COUNT_FIELDS.items()
+        }
+        submissions = (
+            annotate_review_recommendation_and_count(
+                ApplicationSubmission.objects.filter(id__in=submission_ids)
+            )
+            .prefetch_related(None)
+            .annotate(
+                last_update=Subquery(latest_activity.values("timestamp")[:1]),
+                last_update_user_id=Subquery(latest_activity.values("user_id")[:1]),
+                screening_status_id=Subquery(
+                    ScreeningStatus.objects.filter(submissions=OuterRef("id"))
+                    .order_by("pk")
+                    .values("pk")[:1]
+                ),
+                **comment_counts,
+            )
+            .values(
+                "id",
+                "last_update",
+                "last_update_user_id",
+                "review_recommendation",
+                "screening_status_id",
+                *REVIEW_COUNT_FIELDS,
+                *comment_counts,
+            )
+        )
+
+        summaries = []
+        for row in submissions:
+            submission_id = row.pop("id")
+            # The review subqueries are empty, rather than 0, without reviews
+            for field in REVIEW_COUNT_FIELDS:
+                row[field] = row[field] or 0
+            summaries.append(
+                self.model(
+                    submission_id=submission_id,
+                    comment_count=sum(row[field] for field in comment_counts),
+                    **row,
+                )
+            )
+
+        update_fields = [
+            field.attname
+            for field in self.model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        if create:
+            self.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=["submission"],
+                update_fields=update_fields,
+            )
+        else:
+            self.bulk_update(summaries, update_fields)
+
+
+class SubmissionSummary(models.Model):
+    """Denormalised figures shown in the submission lists.
+
+    Kept up to date by the signals in `hypha.apply.funds.signals` and rebuilt
+    with the `rebuild_submission_summaries` management command, so the lists
+    can filter and sort on indexed columns instead of correlated subqueries.
+    """
+
+    wagtail_reference_index_ignore = True
+
+    submission = models.OneToOneField(
+        "funds.ApplicationSubmission",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="list_summary",
+    )
+    last_update = models.DateTimeField(null=True, db_index=True)
+    last_update_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    review_staff_count = models.PositiveIntegerField(default=0)
+    review_submitted_count = models.PositiveIntegerField(default=0)
+    review_recommendation = models.IntegerField(null=True)
+    opinion_disagree = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0, db_index=True)
+    applicant_comment_count = models.PositiveIntegerField(default=0)
+    team_comment_count = models.PositiveIntegerField(default=0)
+    reviewer_comment_count = models.PositiveIntegerField(default=0)
+    all_comment_count = models.PositiveIntegerField(default=0)
+    screening_status = models.ForeignKey(
+        "funds.ScreeningStatus",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+
+    objects = SubmissionSummaryManager()
+
+    class Meta:
+        verbose_name = _("submission summary")
+        verbose_name_plural = _("submission summaries")
+
+    def __str__(self):
+        return f"Summary for {self.submission_id}"
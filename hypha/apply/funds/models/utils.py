@@ -23,6 +23,7 @@ from hypha.apply.users.roles import (
     REVIEWER_GROUP_NAME,
     STAFF_GROUP_NAME,
 )
+from hypha.apply.utils.storage import PrivateStorage
 
 from ..workflows import DRAFT_STATE, WORKFLOWS
 
@@ -214,6 +215,10 @@ STATUS_CHOICES = [
 ]
 
 
+def submission_export_path(instance, filename):
+    return f"submission_exports/{instance.user_id}/{filename}"
+
+
 class SubmissionExportManager(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -221,7 +226,9 @@ class SubmissionExportManager(models.Model):
         on_delete=models.CASCADE,
     )
 
-    export_data = models.TextField()
+    export_file = models.FileField(
+        upload_to=submission_export_path, storage=PrivateStorage(), blank=True
+    )
 
     created_time = models.DateTimeField(auto_now_add=True)
 
@@ -231,10 +238,36 @@ class SubmissionExportManager(models.Model):
 
     total_export = models.IntegerField(null=True)
 
+    # Progress of the worker tasks (shards) rendering the export
+    exported_count = models.IntegerField(default=0)
+
+    total_shards = models.IntegerField(default=1)
+
+    completed_shards = models.IntegerField(default=0)
+
     class Meta:
         verbose_name = _("submission export manager")
         verbose_name_plural = _("submission export managers")
 
+    @property
+    def progress(self) -> int:
+        """Percentage of the submissions rendered so far"""
+        if not self.total_export:
+            return 0
+        return min(100, self.exported_count * 100 // self.total_export)
+
+    def add_exported(self, count: int) -> None:
+        """Record rendered submissions, safe to call from concurrent shards"""
+        SubmissionExportManager.objects.filter(pk=self.pk).update(
+            exported_count=models.F("exported_count") + count
+        )
+
+    def add_completed_shard(self) -> None:
+        """Record a finished shard, safe to call from concurrent shards"""
+        SubmissionExportManager.objects.filter(pk=self.pk).update(
+            completed_shards=models.F("completed_shards") + 1
+        )
+
     def set_completed_and_save(self) -> None:
         """Sets the status to completed and saves the object"""
         self.status = "success"
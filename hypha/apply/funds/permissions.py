@@ -1,9 +1,15 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.db.models import Model
 from django.utils.translation import gettext as _
+from rolepermissions import checkers
 from rolepermissions.permissions import register_object_checker
 
+from hypha.apply.funds.models.assigned_reviewers import AssignedReviewers
 from hypha.apply.funds.models.co_applicants import CoApplicant, CoApplicantRole
 from hypha.apply.funds.models.reviewer_role import ReviewerSettings
 from hypha.apply.funds.models.submissions import DRAFT_STATE
@@ -11,17 +17,138 @@ from hypha.home.models import ApplyHomePage
 
 from ..users.roles import STAFF_GROUP_NAME, SUPERADMIN, TEAMADMIN_GROUP_NAME, StaffAdmin
 
+# Permission checks made during the current request, and the data they were
+# made on. Set by `caching_permissions`, None when nothing is cached.
+checked_permissions: ContextVar = ContextVar("checked_permissions", default=None)
+
+# Fields that change what a user may do with an object, part of the cache key so
+# a check is made again when they change during the request
+VERSION_FIELDS = ("status", "is_archive", "user_id", "lead_id")
+
+
+@contextmanager
+def caching_permissions():
+    """Cache the permission checks made in the block, see `PermissionCacheMiddleware`"""
+    if checked_permissions.get() is not None:
+        yield
+        return
+    token = checked_permissions.set({})
+    try:
+        yield
+    finally:
+        checked_permissions.reset(token)
+
+
+def memoize(key, check):
+    """The result of `check()`, cached under `key` while permissions are cached"""
+    cache = checked_permissions.get()
+    if cache is None or key is None:
+        return check()
+    try:
+        return cache[key]
+    except KeyError:
+        cache[key] = check()
+        return cache[key]
+
+
+def object_key(object):
+    """What identifies the object and the state the permissions depend on, None
+    for objects that can't be cached
+    """
+    if object is None:
+        return ()
+    if not isinstance(object, Model) or object.pk is None:
+        return None
+    return (
+        object._meta.label,
+        object.pk,
+        *(getattr(object, field, None) for field in VERSION_FIELDS),
+    )
+
 
 def has_permission(action, user, object=None, raise_exception=True):
-    value, reason = permissions_map[action](user, object)
+    key = object_key(object)
+    value, reason = memoize(
+        None if key is None else ("permission", action, user.pk, *key),
+        lambda: permissions_map[action](user, object),
+    )
 
-    # :todo: cache the permissions based on key action:user_id:object:id
     if raise_exception and not value:
         raise PermissionDenied(reason)
 
     return value, reason
 
 
+def has_object_permission(checker_name, user, obj):
+    """`rolepermissions.checkers.has_object_permission`, cached with the other
+    permissions
+    """
+    key = object_key(obj)
+    return memoize(
+        None if key is None else ("object_permission", checker_name, user.pk, *key),
+        lambda: checkers.has_object_permission(checker_name, user, obj),
+    )
+
+
+def prefetch_permission_data(user, submissions):
+    """Fetch the co-applicants, reviewers and reviewer settings the permission
+    checks of `user` on `submissions` need, while permissions are cached.
+    """
+    cache = checked_permissions.get()
+    if cache is None or not user.is_authenticated:
+        return
+    ids = [submission.pk for submission in submissions]
+
+    for id in ids:
+        cache[("co_applicant", user.pk, id)] = None
+    for co_applicant in CoApplicant.objects.filter(user=user, submission__in=ids):
+        cache[("co_applicant", user.pk, co_applicant.submission_id)] = co_applicant
+
+    assigned = set(
+        AssignedReviewers.objects.filter(reviewer=user, submission__in=ids).values_list(
+            "submission_id", flat=True
+        )
+    )
+    for id in ids:
+        cache[("reviewer", user.pk, id)] = id in assigned
+
+    if user.is_reviewer:
+        reviewer_settings = get_reviewer_settings()
+        if reviewer_settings.use_settings:
+            ApplicationSubmission = apps.get_model("funds", "ApplicationSubmission")
+            visible = set(
+                ApplicationSubmission.objects.for_reviewer_settings(
+                    user, reviewer_settings
+                )
+                .filter(pk__in=ids)
+                .values_list("pk", flat=True)
+            )
+            for id in ids:
+                cache[("reviewer_settings_view", user.pk, id)] = id in visible
+
+
+def get_co_applicant(user, submission):
+    return memoize(
+        ("co_applicant", user.pk, submission.pk),
+        lambda: submission.co_applicants.filter(user=user).first(),
+    )
+
+
+def is_assigned_reviewer(user, submission):
+    return memoize(
+        ("reviewer", user.pk, submission.pk),
+        lambda: submission.reviewers.filter(pk=user.pk).exists(),
+    )
+
+
+def get_reviewer_settings():
+    def reviewer_settings():
+        site = ApplyHomePage.objects.first().get_site()
+        return ReviewerSettings.for_site(site)
+
+    return memoize(("reviewer_settings",), reviewer_settings)
+
+
 def can_take_submission_actions(user, submission):
     if not user.is_authenticated:
         return False, _("Login Required")
@@ -40,7 +167,7 @@ def can_edit_submission(user, submission):
         return False, _("Archived Submission")
 
     if submission.phase.permissions.can_edit(user):
-        co_applicant = submission.co_applicants.filter(user=user).first()
+        co_applicant = get_co_applicant(user, submission)
         if co_applicant:
             if co_applicant.role == CoApplicantRole.EDIT:
                 return True, _("Co-applicant with edit role can edit submission")
@@ -216,19 +343,25 @@ def can_view_submission(user, submission):
     if (
         user.is_apply_staff
         or submission.user == user
-        or submission.co_applicants.filter(user=user).exists()
+        or get_co_applicant(user, submission)
     ):
         return True, ""
 
     # By default, reviewers can see all submissions. This can be configured in Wagtail Admin > Apply > Reviewer Settings
     if user.is_reviewer:
-        site = ApplyHomePage.objects.first().get_site()
-        reviewer_settings = ReviewerSettings.for_site(site)
+        reviewer_settings = get_reviewer_settings()
         ApplicationSubmission = apps.get_model("funds", "ApplicationSubmission")
         if reviewer_settings.use_settings:
-            return ApplicationSubmission.objects.for_reviewer_settings(
-                user, reviewer_settings
-            ).filter(pk=submission.pk).exists(), ""
+            return memoize(
+                ("reviewer_settings_view", user.pk, submission.pk),
+                lambda: (
+                    ApplicationSubmission.objects.for_reviewer_settings(
+                        user, reviewer_settings
+                    )
+                    .filter(pk=submission.pk)
+                    .exists()
+                ),
+            ), ""
         else:
             return True, ""
 
@@ -295,8 +428,21 @@ def can_update_co_applicant(user, invite):
     return False, _("Forbidden Error")
 
 
+def can_view_applicant_identity(user, submission):
+    """Reviewers assigned to a submission don't see who applied when
+    `HIDE_IDENTITY_FROM_REVIEWERS` is set.
+    """
+    if (
+        settings.HIDE_IDENTITY_FROM_REVIEWERS
+        and not user.is_org_faculty
+        and is_assigned_reviewer(user, submission)
+    ):
+        return False, _("Applicant identity is hidden from reviewers")
+    return True, ""
+
+
 def user_can_view_post_comment_form(user, submission):
-    co_applicant = CoApplicant.objects.filter(user=user, submission=submission).first()
+    co_applicant = get_co_applicant(user, submission)
     if co_applicant and co_applicant.role == CoApplicantRole.VIEW:
         return False
     return True
@@ -322,4 +468,5 @@ permissions_map = {
     "co_applicant_invite": can_invite_co_applicants,
     "co_applicants_view": can_view_co_applicants,
     "co_applicants_update": can_update_co_applicant,
+    "applicant_identity_view": can_view_applicant_identity,
 }
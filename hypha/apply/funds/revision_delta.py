@@ -0,0 +1,111 @@
+"""
+Patches between the `form_data` of two revisions of a submission.
+
+A patch records the answers that were added, removed or replaced. Long text
+answers that were only edited, the bulk of most revisions, are stored as the
+edits to the previous answer instead: runs of words to keep or skip and the
+text to insert in between.
+
+Patches are stored zlib compressed JSON.
+"""
+
+import json
+import re
+import zlib
+from typing import List, Optional, Union
+
+from .differ import diff_opcodes
+
+# Answers shorter than this are replaced rather than edited
+MIN_EDIT_LENGTH = 200
+
+# Words, runs of whitespace and runs of anything else, joining them back gives
+# the original text
+TOKEN_RE = re.compile(r"\w+|\s+|[^\w\s]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text)
+
+
+def text_edits(old: str, new: str) -> Optional[List[Union[int, str]]]:
+    """The edits turning `old` into `new`: a positive count of tokens to keep, a
+    negative count to skip, or text to insert. None if the answer was rewritten
+    rather than edited.
+    """
+    old_tokens = tokenize(old)
+    new_tokens = tokenize(new)
+    edits = []
+    kept = 0
+    for tag, i1, i2, j1, j2 in diff_opcodes(old_tokens, new_tokens):
+        if tag == "equal":
+            edits.append(i2 - i1)
+            kept += j2 - j1
+            continue
+        if i2 > i1:
+            edits.append(i1 - i2)
+        if j2 > j1:
+            edits.append("".join(new_tokens[j1:j2]))
+    if kept * 2 < len(new_tokens):
+        return None
+    return edits
+
+
+def apply_text_edits(old: str, edits: List[Union[int, str]]) -> str:
+    tokens = tokenize(old)
+    position = 0
+    text = []
+    for edit in edits:
+        if isinstance(edit, str):
+            text.append(edit)
+        elif edit > 0:
+            text.extend(tokens[position : position + edit])
+            position += edit
+        else:
+            position -= edit
+    return "".join(text)
+
+
+def diff(old: dict, new: dict) -> dict:
+    """The patch turning the form data `old` into `new`"""
+    patch = {}
+    removed = [key for key in old if key not in new]
+    if removed:
+        patch["remove"] = removed
+
+    for key, value in new.items():
+        previous = old.get(key)
+        if key in old and previous == value:
+            continue
+        if (
+            isinstance(value, str)
+            and isinstance(previous, str)
+            and len(value) >= MIN_EDIT_LENGTH
+        ):
+            edits = text_edits(previous, value)
+            if edits is not None:
+                patch.setdefault("edit", {})[key] = edits
+                continue
+        patch.setdefault("set", {})[key] = value
+    return patch
+
+
+def apply(old: dict, patch: dict) -> dict:
+    """The form data `old` with `patch` applied"""
+    data = {
+        key: value for key, value in old.items() if key not in patch.get("remove", [])
+    }
+    data.update(patch.get("set", {}))
+    for key, edits in patch.get("edit", {}).items():
+        data[key] = apply_text_edits(old[key], edits)
+    return data
+
+
+def encode(patch: dict) -> bytes:
+    return zlib.compress(
+        json.dumps(patch, ensure_ascii=False, separators=(",", ":")).encode()
+    )
+
+
+def decode(data: bytes) -> dict:
+    return json.loads(zlib.decompress(data))
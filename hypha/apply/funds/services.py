@@ -1,10 +1,14 @@
+from collections import defaultdict
+
 from django.apps import apps
 from django.conf import settings
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
 from django.db.models import (
     Case,
     Count,
+    F,
     IntegerField,
     OuterRef,
     Prefetch,
@@ -19,9 +23,9 @@ from django.utils.translation import gettext as _
 from django.utils.translation import ngettext
 
 from hypha.apply.activity.messaging import MESSAGES, messenger
-from hypha.apply.activity.models import Activity, Event
+from hypha.apply.activity.models import VISIBILITY, Activity, Event
 from hypha.apply.funds.models.assigned_reviewers import AssignedReviewers
-from hypha.apply.funds.workflows import INITIAL_STATE
+from hypha.apply.funds.workflows import INITIAL_STATE, STAGE_CHANGE_ACTIONS
 from hypha.apply.funds.workflows.constants import DRAFT_STATE
 from hypha.apply.review.options import DISAGREE, MAYBE
 
@@ -252,7 +256,115 @@ def bulk_update_reviewers(
     return submissions
 
 
+def needs_transition_per_submission(workflow, phase, transitions) -> bool:
+    """Whether moving submissions out of `phase` by one of `transitions` runs more
+    than a change of status: a method, a condition on the submission or a change
+    of stage.
+    """
+    for target in set(transitions) & set(phase.transitions):
+        action = phase.transitions[target]
+        if action.get("method") or action.get("conditions"):
+            return True
+        if target in STAGE_CHANGE_ACTIONS:
+            return True
+        # `perform_transition` moves on to the next stage when it can
+        if set(workflow[target].transitions) & STAGE_CHANGE_ACTIONS:
+            return True
+    return False
+
+
+def bulk_transition_submissions(
+    submissions: QuerySet, transitions, user, request: HttpRequest
+) -> tuple[list, dict]:
+    """Move the submissions on by the first of `transitions` open to them.
+
+    Submissions are grouped by workflow and phase, and the permissions checked
+    once per group. Groups that only change status are updated with one query,
+    others go through `perform_transition` one by one.
+
+    Args:
+        submissions: queryset of submissions to update
+        transitions: the targets of the transition, one per phase
+        user: user who is updating the submissions
+        request: django request object
+
+    Returns:
+        The submissions that couldn't be updated, and the phase each updated
+        submission came from by its id
+    """
+    from hypha.apply.funds.facets import invalidate_facet_counts
+
+    ApplicationSubmission = apps.get_model("funds", "ApplicationSubmission")
+
+    # The permissions of a transition depend on the phase, and on whether the
+    # user leads or applied for the submission
+    groups = defaultdict(list)
+    for submission in submissions:
+        key = (
+            submission.workflow_name,
+            submission.status,
+            submission.lead_id == user.id,
+            submission.user_id == user.id,
+        )
+        groups[key].append(submission)
+
+    failed = []
+    phase_changes = {}
+    for (_workflow, status, *_roles), group in groups.items():
+        old_phase = group[0].phase
+
+        if needs_transition_per_submission(group[0].workflow, old_phase, transitions):
+            for submission in group:
+                valid_actions = {
+                    action for action, _ in submission.get_actions_for_user(user)
+                }
+                try:
+                    transition = (valid_actions & set(transitions)).pop()
+                    submission.perform_transition(
+                        transition, user, request=request, notify=False
+                    )
+                except (PermissionDenied, KeyError):
+                    failed.append(submission)
+                else:
+                    phase_changes[submission.id] = old_phase
+            continue
+
+        valid_actions = {action for action, _ in group[0].get_actions_for_user(user)}
+        try:
+            target = (valid_actions & set(transitions)).pop()
+        except KeyError:
+            failed.extend(group)
+            continue
+
+        with transaction.atomic():
+            # Skip submissions moved on since they were fetched
+            updated = set(
+                ApplicationSubmission.objects.select_for_update()
+                .filter(id__in=[submission.id for submission in group], status=status)
+                .values_list("id", flat=True)
+            )
+            ApplicationSubmission.objects.filter(id__in=updated).update(status=target)
+
+        for submission in group:
+            if submission.id in updated:
+                submission.status = target
+                phase_changes[submission.id] = old_phase
+            else:
+                failed.append(submission)
+
+    if phase_changes:
+        invalidate_facet_counts()
+
+    return failed, phase_changes
+
+
 def annotate_comments_count(submissions: QuerySet, user) -> QuerySet:
+    if not user.is_applicant and set(VISIBILITY) <= set(Activity.visibility_for(user)):
+        # Every comment is visible to the user, use the total kept on the summary
+        return submissions.annotate(
+            comment_count=Coalesce(F("list_summary__comment_count"), 0)
+        )
+
     comments = Activity.comments.filter(submission=OuterRef("id")).visible_to(user)
     return submissions.annotate(
         comment_count=Coalesce(
@@ -1,12 +1,19 @@
 import sys
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.files.storage import default_storage
-from django.db.models.signals import pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
+from hypha.apply.activity.models import Activity
+from hypha.apply.funds.facets import invalidate_facet_counts
 from hypha.apply.funds.models.application_revisions import ApplicationRevision
+from hypha.apply.funds.models.assigned_reviewers import AssignedReviewers
 from hypha.apply.funds.models.submissions import ApplicationSubmission
+from hypha.apply.funds.models.summary import SubmissionSummary
+from hypha.apply.funds.models.utils import SubmissionExportManager
 from hypha.apply.funds.utils import delete_directory
+from hypha.apply.review.models import Review, ReviewOpinion
 
 
 @receiver(signal=pre_delete, sender=ApplicationSubmission)
@@ -38,3 +45,81 @@ def delete_attachments(sender, instance=None, **kwargs):
 
         if default_storage.exists(submission_attachment_path):
             delete_directory(submission_attachment_path)
+
+
+@receiver(signal=post_delete, sender=SubmissionExportManager)
+def delete_export_file(sender, instance=None, **kwargs):
+    """
+    Remove the generated CSV from storage once the export it belongs to is deleted,
+    whether it was downloaded, replaced by a new export or cleaned up.
+    """
+    if instance.export_file:
+        instance.export_file.delete(save=False)
+
+
+@receiver(signal=post_save, sender=ApplicationSubmission)
+def create_submission_summary(sender, instance=None, created=False, **kwargs):
+    if created:
+        SubmissionSummary.objects.refresh([instance.id])
+
+
+@receiver(signal=post_save, sender=Activity)
+@receiver(signal=post_delete, sender=Activity)
+def refresh_summary_for_activity(sender, instance=None, signal=None, **kwargs):
+    """
+    Keep the latest update and comment counts of the submission summary in step
+    with the submission's activity feed.
+
+    Deletions only update existing summaries, they can be part of the deletion of
+    the submission itself.
+    """
+    submission_type = ContentType.objects.get_for_model(ApplicationSubmission)
+    if instance.source_content_type_id == submission_type.id:
+        SubmissionSummary.objects.refresh(
+            [instance.source_object_id], create=signal is post_save
+        )
+
+
+@receiver(signal=post_save, sender=AssignedReviewers)
+@receiver(signal=post_delete, sender=AssignedReviewers)
+@receiver(signal=post_save, sender=Review)
+@receiver(signal=post_delete, sender=Review)
+def refresh_summary_for_review(sender, instance=None, signal=None, **kwargs):
+    SubmissionSummary.objects.refresh(
+        [instance.submission_id], create=signal is post_save
+    )
+
+
+@receiver(signal=post_save, sender=ReviewOpinion)
+@receiver(signal=post_delete, sender=ReviewOpinion)
+def refresh_summary_for_opinion(sender, instance=None, signal=None, **kwargs):
+    SubmissionSummary.objects.refresh(
+        Review.objects.filter(pk=instance.review_id).values_list(
+            "submission_id", flat=True
+        ),
+        create=signal is post_save,
+    )
+
+
+@receiver(signal=m2m_changed, sender=ApplicationSubmission.screening_statuses.through)
+def refresh_summary_for_screening(
+    sender, instance=None, action=None, reverse=False, pk_set=None, **kwargs
+):
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        SubmissionSummary.objects.refresh([instance.id])
+    elif pk_set:
+        SubmissionSummary.objects.refresh(pk_set)
+
+
+@receiver(signal=post_save, sender=ApplicationSubmission)
+@receiver(signal=post_delete, sender=ApplicationSubmission)
+def invalidate_facets_for_submission(sender, **kwargs):
+    invalidate_facet_counts()
+
+
+@receiver(signal=m2m_changed, sender=ApplicationSubmission.meta_terms.through)
+def invalidate_facets_for_meta_terms(sender, action=None, **kwargs):
+    if action in ["post_add", "post_remove", "post_clear"]:
+        invalidate_facet_counts()
@@ -1,11 +1,21 @@
+import csv
+import io
+import tempfile
 from typing import List
 
-from celery import shared_task
+from celery import chord, shared_task
 from django.conf import settings
+from django.core.files import File
 
 from hypha.apply.funds.models.submissions import ApplicationSubmission
 from hypha.apply.funds.models.utils import SubmissionExportManager
-from hypha.apply.funds.utils import export_submissions_to_csv
+from hypha.apply.funds.utils import (
+    EXPORT_SHARD_SIZE,
+    SEARCH_INDEX_BATCH_SIZE,
+    export_submissions_to_csv,
+    get_submissions_csv_header,
+    write_submissions_csv_rows,
+)
 from hypha.apply.todo.options import (
     DOWNLOAD_SUBMISSIONS_EXPORT,
     FAILED_SUBMISSIONS_EXPORT,
@@ -14,6 +24,47 @@ from hypha.apply.todo.views import add_task_to_user
 from hypha.apply.users.models import User
 
 
+def save_csv_file(export_manager, write_csv) -> None:
+    """Save the CSV written by `write_csv(csv_file)` as the export's file
+
+    Rows are written to a temporary file on disk and then handed to the storage, so
+    the export is never held in memory or in the database.
+    """
+    with tempfile.TemporaryFile() as export_file:
+        csv_file = io.TextIOWrapper(export_file, encoding="utf-8", newline="")
+        write_csv(csv_file)
+        csv_file.detach()
+        export_file.seek(0)
+        export_manager.export_file.save(
+            "submissions.csv", File(export_file), save=False
+        )
+
+
+def finish_submission_export(export_manager, user_task) -> None:
+    # When the generation is complete or failed, add a task to the user's dashboard (only if async)
+    if not settings.CELERY_TASK_ALWAYS_EAGER:
+        add_task_to_user(
+            code=user_task,
+            user=export_manager.user,
+            related_obj=export_manager,
+        )
+
+
+def fail_submission_export(export_manager, exc) -> None:
+    # Update the status to failed
+    export_manager.set_failed_and_save()
+    finish_submission_export(export_manager, FAILED_SUBMISSIONS_EXPORT)
+
+    if settings.SENTRY_DSN:
+        # If sentry is enabled, pass the exception to sentry
+        from sentry_sdk import capture_exception
+
+        capture_exception(exc)
+    else:
+        # Otherwise re-raise it
+        raise exc
+
+
 @shared_task
 def generate_submission_csv(
     qs_ids: List[int], request_user_id: int, base_uri: str
@@ -23,49 +74,193 @@ def generate_submission_csv(
     Integer IDs have to be used as QuerySets are not simple data types & can't be
     passed to workers.
 
-    Updates the user's SubmissionExportManager object with status/final data, then
-    adds a download task to the user's `My Tasks` when completed.
+    The IDs are split into shards of `EXPORT_SHARD_SIZE` that are rendered in
+    parallel by `render_submission_csv_shard`, then joined in the original order
+    by `merge_submission_csv_shards`. Without a result backend the chord can't
+    be used, so the whole export is rendered by this task.
+
+    Updates the user's SubmissionExportManager object with status/progress/final
+    data, then adds a download task to the user's `My Tasks` when completed.
 
     Args:
         qs_ids: A list of application IDs to generate the CSV export for
         request_user_id: The ID of the user issuing the export request
     """
+    request_user = User.objects.get(pk=request_user_id)
+
+    # If the user already has an existing export, delete it to begin the new one
+    if current := SubmissionExportManager.objects.filter(user=request_user):
+        current.delete()
+
+    shards = [
+        qs_ids[start : start + EXPORT_SHARD_SIZE]
+        for start in range(0, len(qs_ids), EXPORT_SHARD_SIZE)
+    ] or [[]]
+    export_manager = SubmissionExportManager.objects.create(
+        user=request_user, total_export=len(qs_ids), total_shards=len(shards)
+    )
+
     try:
-        qs = ApplicationSubmission.objects.filter(id__in=qs_ids).only(
-            "id", "form_data", "form_fields"
+        if not (settings.CELERY_TASK_ALWAYS_EAGER or settings.CELERY_RESULT_BACKEND):
+            save_csv_file(
+                export_manager,
+                lambda csv_file: export_submissions_to_csv(qs_ids, base_uri, csv_file),
+            )
+            export_manager.set_completed_and_save()
+            finish_submission_export(export_manager, DOWNLOAD_SUBMISSIONS_EXPORT)
+            return
+
+        # The header is the union of the questions of every form in the export,
+        # shared by all shards so the shard files can be joined as they are
+        header_row = [
+            str(field_name)
+            for field_name in get_submissions_csv_header(
+                ApplicationSubmission.objects.filter(id__in=qs_ids)
+            )
+        ]
+        chord(
+            render_submission_csv_shard.s(
+                export_manager.id, shard_index, shard_ids, header_row, base_uri
+            )
+            for shard_index, shard_ids in enumerate(shards)
+        )(
+            merge_submission_csv_shards.s(export_manager.id, header_row).on_error(
+                submission_csv_shard_failed.s(export_manager.id)
+            )
         )
-        request_user = User.objects.get(pk=request_user_id)
+    except Exception as exc:
+        fail_submission_export(export_manager, exc)
+
+
+def get_shard_name(export_manager, shard_index: int) -> str:
+    return export_manager.export_file.field.generate_filename(
+        export_manager, f"submissions-{export_manager.id}-{shard_index}.csv"
+    )
+
+
+@shared_task
+def render_submission_csv_shard(
+    export_manager_id: int,
+    shard_index: int,
+    shard_ids: List[int],
+    header_row: List[str],
+    base_uri: str,
+) -> str:
+    """Render the rows (without header) for a slice of an export to a private file
 
-        # If the user already has an existing export, delete it to begin the new one
-        if current := SubmissionExportManager.objects.filter(user=request_user):
-            current.delete()
+    Returns:
+        The storage name of the shard file
+    """
+    export_manager = SubmissionExportManager.objects.get(pk=export_manager_id)
+    storage = export_manager.export_file.storage
+    shard_name = get_shard_name(export_manager, shard_index)
+    # A retried shard starts over
+    storage.delete(shard_name)
 
-        export_manager = SubmissionExportManager.objects.create(
-            user=request_user, total_export=len(qs_ids)
+    with tempfile.TemporaryFile() as shard_file:
+        csv_file = io.TextIOWrapper(shard_file, encoding="utf-8", newline="")
+        write_submissions_csv_rows(
+            csv_file,
+            header_row,
+            shard_ids,
+            base_uri,
+            progress_callback=export_manager.add_exported,
         )
-        export_manager.export_data = export_submissions_to_csv(qs.iterator(), base_uri)
-        export_manager.set_completed_and_save()
+        csv_file.detach()
+        shard_file.seek(0)
+        shard_name = storage.save(shard_name, File(shard_file))
+
+    export_manager.add_completed_shard()
+    return shard_name
+
+
+@shared_task
+def merge_submission_csv_shards(
+    shard_names: List[str], export_manager_id: int, header_row: List[str]
+) -> None:
+    """Join the shard files, in the order of the original IDs, below the header"""
+    export_manager = SubmissionExportManager.objects.get(pk=export_manager_id)
+    storage = export_manager.export_file.storage
 
-        user_task = DOWNLOAD_SUBMISSIONS_EXPORT
+    def write_csv(csv_file):
+        csv.DictWriter(csv_file, fieldnames=header_row).writeheader()
+        csv_file.flush()
+        for shard_name in shard_names:
+            with storage.open(shard_name, "rb") as shard_file:
+                for chunk in shard_file.chunks():
+                    csv_file.buffer.write(chunk)
 
+    try:
+        save_csv_file(export_manager, write_csv)
+        export_manager.set_completed_and_save()
+        finish_submission_export(export_manager, DOWNLOAD_SUBMISSIONS_EXPORT)
     except Exception as exc:
-        # Update the status to failed
-        export_manager.set_failed_and_save()
-        user_task = FAILED_SUBMISSIONS_EXPORT
-
-        if settings.SENTRY_DSN:
-            # If sentry is enabled, pass the exception to sentry
-            from sentry_sdk import capture_exception
-
-            capture_exception(exc)
-        else:
-            # Otherwise re-raise it
-            raise exc
+        fail_submission_export(export_manager, exc)
     finally:
-        # When the generation is complete or failed, add a task to the user's dashboard (only if async)
-        if not settings.CELERY_TASK_ALWAYS_EAGER:
-            add_task_to_user(
-                code=user_task,
-                user=request_user,
-                related_obj=export_manager,
+        for shard_name in shard_names:
+            storage.delete(shard_name)
+
+
+@shared_task
+def submission_csv_shard_failed(request, exc, traceback, export_manager_id: int):
+    """Errback for the export chord, called when any of the shards failed"""
+    if export_manager := SubmissionExportManager.objects.filter(
+        pk=export_manager_id
+    ).first():
+        storage = export_manager.export_file.storage
+        for shard_index in range(export_manager.total_shards):
+            storage.delete(get_shard_name(export_manager, shard_index))
+        fail_submission_export(export_manager, exc)
+
+
+def reindex_submissions(
+    submission_ids: List[int],
+    batch_size: int = SEARCH_INDEX_BATCH_SIZE,
+    clear_dirty: bool = True,
+) -> int:
+    """Rebuild the search fields of the given submissions, a batch at a time
+
+    The fields are written with `bulk_update()`, so none of the work done by
+    `ApplicationSubmission.save()` is repeated. The dirty marker of a batch is
+    cleared before it is read and never written back, so a submission saved
+    while its batch is reindexed stays marked for the next run.
+
+    Args:
+        clear_dirty: clear the dirty marker, False when the caller already did
+
+    Returns:
+        The number of submissions reindexed
+    """
+    count = 0
+    for start in range(0, len(submission_ids), batch_size):
+        batch_ids = submission_ids[start : start + batch_size]
+        if clear_dirty:
+            ApplicationSubmission.objects.filter(
+                id__in=batch_ids, search_index_dirty=True
+            ).update(search_index_dirty=False)
+        submissions = list(
+            ApplicationSubmission.objects.filter(id__in=batch_ids).defer(
+                "search_data", "search_document"
             )
+        )
+        for submission in submissions:
+            submission.update_search_fields()
+        ApplicationSubmission.objects.bulk_update(
+            submissions, ["search_data", "search_document"]
+        )
+        count += len(submissions)
+    return count
+
+
+@shared_task
+def update_submission_search_index(submission_id: int) -> None:
+    """Rebuild the search fields of a submission marked as dirty
+
+    The dirty marker is cleared before the submission is read, so repeated
+    saves only queue one rebuild and a save racing with this task queues a
+    new one.
+    """
+    if ApplicationSubmission.objects.filter(
+        id=submission_id, search_index_dirty=True
+    ).update(search_index_dirty=False):
+        reindex_submissions([submission_id], clear_dirty=False)
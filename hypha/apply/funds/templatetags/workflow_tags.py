@@ -42,14 +42,10 @@ def show_applicant_identity(submission: ApplicationSubmission, user: User) -> bo
     Returns:
         bool: True = show the applicant's identity
     """
-    if (
-        settings.HIDE_IDENTITY_FROM_REVIEWERS
-        and not user.is_org_faculty
-        and user in submission.reviewers.all()
-    ):
-        return False
-
-    return True
+    permission, reason = has_permission(
+        "applicant_identity_view", user=user, object=submission, raise_exception=False
+    )
+    return permission
 
 
 @register.simple_tag(takes_context=True)
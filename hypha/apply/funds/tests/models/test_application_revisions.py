@@ -0,0 +1,121 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from hypha.apply.funds.models import ApplicationRevision
+from hypha.apply.funds.models.application_revisions import KEYFRAME_INTERVAL
+from hypha.apply.funds.tests.factories import ApplicationSubmissionFactory
+
+ANSWER = "<p>" + " ".join(f"Sentence number {i}, about the project." for i in range(50))
+
+
+class TestApplicationRevisionStorage(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.submission = ApplicationSubmissionFactory()
+        self.data = {**self.submission.live_revision.form_data, "answer": ANSWER}
+
+    def create(self, answer, **kwargs):
+        return ApplicationRevision.objects.create(
+            submission=self.submission,
+            form_data={**self.data, "answer": answer},
+            **kwargs,
+        )
+
+    def fetch(self, revision):
+        cache.clear()
+        return ApplicationRevision.objects.get(id=revision.id)
+
+    def test_first_revision_stored_in_full(self):
+        revision = self.submission.live_revision
+        self.assertIsNone(revision.base)
+        self.assertIsNotNone(revision.snapshot)
+
+    def test_edit_stored_as_patch(self):
+        first = self.create(ANSWER)
+        edited = self.create(ANSWER.replace("number 3,", "number three,"))
+
+        self.assertEqual(edited.base, first)
+        self.assertIsNone(edited.snapshot)
+        self.assertLess(len(edited.delta), len(ANSWER) // 10)
+        self.assertEqual(
+            self.fetch(edited).form_data["answer"],
+            ANSWER.replace("number 3,", "number three,"),
+        )
+
+    def test_full_copy_every_keyframe_interval(self):
+        revisions = [
+            self.create(ANSWER + f" Edit {i}.") for i in range(KEYFRAME_INTERVAL * 2)
+        ]
+
+        for revision in revisions:
+            self.assertLessEqual(len(revision.chain()), KEYFRAME_INTERVAL)
+        self.assertEqual(
+            self.fetch(revisions[-1]).form_data["answer"],
+            ANSWER + f" Edit {KEYFRAME_INTERVAL * 2 - 1}.",
+        )
+
+    def test_editing_revision_keeps_later_revisions(self):
+        first = self.create(ANSWER)
+        second = self.create(ANSWER + " Second.")
+
+        first = self.fetch(first)
+        first.form_data["answer"] = ANSWER.replace("number 5,", "number five,")
+        first.save()
+
+        self.assertEqual(self.fetch(second).form_data["answer"], ANSWER + " Second.")
+
+    def test_delete_keeps_later_revisions(self):
+        first = self.create(ANSWER)
+        second = self.create(ANSWER + " Second.")
+
+        first.delete()
+
+        second = self.fetch(second)
+        self.assertIsNone(second.base)
+        self.assertEqual(second.form_data["answer"], ANSWER + " Second.")
+
+    def test_saving_unchanged_data_keeps_patch(self):
+        self.create(ANSWER)
+        edited = self.fetch(self.create(ANSWER + " Edited."))
+        delta = bytes(edited.delta)
+        edited.is_draft = True
+        edited.save()
+
+        self.assertEqual(bytes(self.fetch(edited).delta), delta)
+
+    def test_deleting_submission_deletes_revisions(self):
+        self.create(ANSWER)
+        self.create(ANSWER + " Edited.")
+
+        self.submission.delete()
+
+        self.assertFalse(ApplicationRevision.objects.exists())
+
+
+class TestCompressRevisionsCommand(TestCase):
+    def test_compresses_full_copies(self):
+        submission = ApplicationSubmissionFactory()
+        data = submission.live_revision.form_data
+        with mock.patch(
+            "hypha.apply.funds.models.application_revisions.KEYFRAME_INTERVAL", 1
+        ):
+            revisions = [
+                ApplicationRevision.objects.create(
+                    submission=submission, form_data={**data, "answer": ANSWER + str(i)}
+                )
+                for i in range(3)
+            ]
+
+        out = StringIO()
+        call_command("compress_revisions", stdout=out)
+
+        self.assertEqual(out.getvalue().strip(), "3 revisions compressed.")
+        cache.clear()
+        for i, revision in enumerate(revisions):
+            revision = ApplicationRevision.objects.get(id=revision.id)
+            self.assertIsNotNone(revision.base)
+            self.assertEqual(revision.form_data["answer"], ANSWER + str(i))
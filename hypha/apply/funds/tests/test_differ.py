@@ -2,7 +2,9 @@
 
 from django.test import SimpleTestCase
 
-from ..differ import compare, wrap_added, wrap_deleted
+from ..differ import compare, diff_opcodes, tokenize, wrap_added, wrap_deleted
+
+LONG_ANSWER = " ".join(f"Sentence {i} about the project." for i in range(2000))
 
 
 class TestWrapDeleted(SimpleTestCase):
@@ -78,3 +80,61 @@ class TestCompare(SimpleTestCase):
         a, b = compare("old content", "")
         self.assertIn("<del>", a)
         self.assertEqual(str(b), "")
+
+
+class TestDiffOpcodes(SimpleTestCase):
+    def assertOpcodesTurn(self, a, b):
+        opcodes = diff_opcodes(a, b)
+        result = []
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == "equal":
+                self.assertEqual(a[i1:i2], b[j1:j2])
+            result.extend(b[j1:j2])
+        self.assertEqual(result, list(b))
+        return opcodes
+
+    def test_identical(self):
+        self.assertEqual(self.assertOpcodesTurn("abc", "abc"), [("equal", 0, 3, 0, 3)])
+
+    def test_empty(self):
+        self.assertEqual(self.assertOpcodesTurn("", ""), [])
+        self.assertEqual(self.assertOpcodesTurn("", "ab"), [("insert", 0, 0, 0, 2)])
+        self.assertEqual(self.assertOpcodesTurn("ab", ""), [("delete", 0, 2, 0, 0)])
+
+    def test_repeated_tokens(self):
+        self.assertOpcodesTurn("abcabba", "cbabac")
+        self.assertOpcodesTurn(list("aaaabbbb"), list("bbbbaaaa"))
+
+    def test_small_edit_of_long_answer(self):
+        a = tokenize(LONG_ANSWER)
+        b = tokenize(LONG_ANSWER.replace("Sentence 1500 ", "Sentence fifteen hundred "))
+        opcodes = self.assertOpcodesTurn(a, b)
+        self.assertEqual([tag for tag, *_ in opcodes], ["equal", "replace", "equal"])
+
+    def test_rewritten_long_answer(self):
+        a = tokenize(LONG_ANSWER)
+        b = tokenize(" ".join(f"Paragraph {i} rewritten." for i in range(2000)))
+        self.assertOpcodesTurn(a, b)
+
+
+class TestCompareWords(SimpleTestCase):
+    def test_changes_whole_words(self):
+        a, b = compare("the quick fox", "the quack fox")
+        self.assertEqual(a, "the <del>quick</del> fox")
+        self.assertEqual(b, "the <ins>quack</ins> fox")
+
+    def test_tags_and_entities_not_split(self):
+        a, b = compare(
+            "<h2>Title</h2>Fish &amp; chips",
+            "<h2>Title</h2>Fish &lt; chips",
+            should_clean=False,
+        )
+        self.assertIn("<del>&amp;</del>", a)
+        self.assertIn("<ins>&lt;</ins>", b)
+        self.assertIn("<h2>Title</h2>", b)
+
+    def test_small_edit_of_long_answer(self):
+        a, b = compare(LONG_ANSWER, LONG_ANSWER.replace("Sentence 42 ", "Line 42 "))
+        self.assertEqual(a.count("<del>"), 1)
+        self.assertEqual(b.count("<ins>"), 1)
+        self.assertIn("<ins>Line</ins>", b)
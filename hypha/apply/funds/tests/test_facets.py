@@ -0,0 +1,53 @@
+from django.test import TestCase, override_settings
+
+from hypha.apply.categories.models import MetaTerm
+from hypha.apply.users.tests.factories import StaffFactory
+
+from ..facets import cached_facet_counts, facet_counts
+from ..models import ApplicationSubmission
+from .factories import ApplicationSubmissionFactory
+
+
+class TestFacetCounts(TestCase):
+    def setUp(self):
+        self.lead = StaffFactory()
+        self.submissions = ApplicationSubmissionFactory.create_batch(2, lead=self.lead)
+        self.other = ApplicationSubmissionFactory(status="internal_review")
+
+        root = MetaTerm.add_root(name="root")
+        self.term = root.add_child(name="term", filter_on_dashboard=True)
+        other_term = root.add_child(name="other", filter_on_dashboard=True)
+        self.submissions[0].meta_terms.add(self.term, other_term)
+        self.submissions[1].meta_terms.add(self.term)
+
+    def test_counts_every_facet_in_one_query(self):
+        with self.assertNumQueries(1):
+            counts = facet_counts(ApplicationSubmission.objects.all())
+
+        self.assertEqual(counts["status"], {"in_discussion": 2, "internal_review": 1})
+        self.assertEqual(counts["lead"][self.lead.id], 2)
+        self.assertEqual(sum(counts["fund"].values()), 3)
+        self.assertEqual(sum(counts["round"].values()), 3)
+        # Joining the tags doesn't inflate the other facets
+        self.assertEqual(counts["meta_terms"][self.term.id], 2)
+        self.assertEqual(len(counts["meta_terms"]), 2)
+
+    def test_counts_filtered_queryset(self):
+        counts = facet_counts(ApplicationSubmission.objects.filter(lead=self.lead))
+
+        self.assertEqual(counts["status"], {"in_discussion": 2})
+        self.assertEqual(counts["lead"], {self.lead.id: 2})
+
+    @override_settings(SUBMISSION_FACETS_CACHE_TIMEOUT=60)
+    def test_cached_until_submission_changes(self):
+        qs = ApplicationSubmission.objects.all()
+        cached_facet_counts(qs)
+
+        ApplicationSubmission.objects.filter(id=self.other.id).update(
+            status="in_discussion"
+        )
+        self.assertEqual(cached_facet_counts(qs)["status"]["internal_review"], 1)
+
+        self.other.refresh_from_db()
+        self.other.save()
+        self.assertEqual(cached_facet_counts(qs)["status"], {"in_discussion": 3})
@@ -75,7 +75,9 @@ class TestReviewerFormQueries(TestCase):
         #    1 - get
         #    1 - update
         #    2 - release savepoint
-        with self.assertNumQueries(25):
+        #    4 - refresh summary after delete and create
+        # 1 - Clear cached facet counts
+        with self.assertNumQueries(34):
             form.save()
 
     def test_queries_reviewers_swap(self):
@@ -100,7 +102,9 @@ class TestReviewerFormQueries(TestCase):
         # 1 - Cache existing
         # 1 - auth group
         # 1 - Add new
-        with self.assertNumQueries(8):
+        # 6 - Refresh summary after each delete and the add
+        # 1 - Clear cached facet counts
+        with self.assertNumQueries(15):
             form.save()
 
     def test_queries_existing_reviews(self):
@@ -122,5 +126,7 @@ class TestReviewerFormQueries(TestCase):
         # 1 - Delete old
         # 1 - Cache existing
         # 1 - Add new
-        with self.assertNumQueries(5):
+        # 2 - Refresh summary
+        # 1 - Clear cached facet counts
+        with self.assertNumQueries(8):
             form.save()
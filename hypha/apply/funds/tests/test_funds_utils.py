@@ -1,12 +1,20 @@
 """Tests for funds/utils.py (excluding get_copied_form_name which has test_utils.py)."""
 
+import csv
+from io import StringIO
+from unittest.mock import patch
+
 from django.test import SimpleTestCase, TestCase
 
+from ..models import ApplicationSubmission
 from ..utils import (
+    export_submissions_to_csv,
     get_export_polling_time,
     get_or_create_default_screening_statuses,
     get_statuses_as_params,
+    get_submissions_csv_header,
 )
+from .factories import ApplicationSubmissionFactory
 
 
 class TestGetExportPollingTime(SimpleTestCase):
@@ -108,3 +116,36 @@ class TestGetOrCreateDefaultScreeningStatuses(TestCase):
         self.assertEqual(result[0], default)
         other.refresh_from_db()
         self.assertFalse(other.default)
+
+
+class TestExportSubmissionsToCsv(TestCase):
+    def export(self, submission_ids):
+        csv_file = StringIO()
+        export_submissions_to_csv(submission_ids, "https://test.com/", csv_file)
+        csv_file.seek(0)
+        return list(csv.reader(csv_file))
+
+    def test_header_matches_serialized_questions(self):
+        submission = ApplicationSubmissionFactory()
+        header, row = self.export([submission.id])
+
+        self.assertEqual(header[:2], ["Application #", "URL"])
+        questions = {
+            submission.serialize(field_id)["question"]
+            for field_id in submission.question_text_field_ids
+        }
+        self.assertEqual(set(header[2:]), questions)
+        self.assertEqual(row[0], str(submission.id))
+
+    def test_header_built_from_distinct_forms_in_one_query(self):
+        ApplicationSubmissionFactory.create_batch(3)
+        with self.assertNumQueries(1):
+            get_submissions_csv_header(ApplicationSubmission.objects.all())
+
+    def test_rows_in_given_order_across_chunks(self):
+        submission_ids = [
+            submission.id for submission in ApplicationSubmissionFactory.create_batch(3)
+        ][::-1]
+        with patch("hypha.apply.funds.utils.EXPORT_CHUNK_SIZE", 2):
+            _header, *rows = self.export(submission_ids)
+        self.assertEqual([row[0] for row in rows], [str(id) for id in submission_ids])
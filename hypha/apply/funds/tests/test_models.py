@@ -1,29 +1,48 @@
 import itertools
 import os
+import uuid
 from datetime import date, timedelta
+from importlib import import_module
+from io import StringIO
 from unittest.mock import ANY, patch
 
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.core import mail
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from wagtail.blocks import StreamValue
 
+from hypha.apply.activity.tests.factories import ActivityFactory, CommentFactory
 from hypha.apply.funds.blocks import EmailBlock, FullNameBlock
 from hypha.apply.funds.models import (
     AnonymizedSubmission,
     ApplicationSubmission,
     AssignedReviewers,
     Reminder,
+    SubmissionSummary,
 )
+from hypha.apply.funds.models.mixins import AccessFormData, FormFieldsIndex
+from hypha.apply.funds.models.submissions import get_actions_for_submissions
 from hypha.apply.funds.tests.factories.models import ScreeningStatusFactory
-from hypha.apply.funds.workflows.constants import DRAFT_STATE
-from hypha.apply.funds.workflows.registry import Request
+from hypha.apply.funds.workflows.constants import DRAFT_STATE, UserPermissions
+from hypha.apply.funds.workflows.registry import (
+    FINAL_STAGE_STATUSES,
+    PHASE_LOOKUP,
+    ROLE_TRANSITIONS,
+    WORKFLOWS,
+    Request,
+    get_transition_actions,
+)
 from hypha.apply.review.options import AGREE, MAYBE, NO
 from hypha.apply.review.tests.factories import ReviewFactory, ReviewOpinionFactory
-from hypha.apply.users.tests.factories import StaffFactory
+from hypha.apply.stream_forms.schema import form_schema_cache
+from hypha.apply.users.tests.factories import ReviewerFactory, StaffFactory
 from hypha.apply.utils.testing import make_request
 
 from .factories import (
@@ -550,6 +569,72 @@ class TestApplicationSubmission(TestCase):
         self.assertTrue(submission.in_final_stage)
 
 
+class TestWorkflowRegistry(TestCase):
+    def test_lookups_match_workflows(self):
+        for workflow_name, workflow in WORKFLOWS.items():
+            for status, phase in workflow.items():
+                self.assertIs(PHASE_LOOKUP[workflow_name, status], phase)
+                self.assertEqual(
+                    status in FINAL_STAGE_STATUSES[workflow_name],
+                    workflow.stages.index(phase.stage) == len(workflow.stages) - 1,
+                )
+
+    def test_actions_match_status_field(self):
+        submission = ApplicationSubmissionFactory()
+        staff = StaffFactory()
+        transitions = ApplicationSubmission.status_field.get_available_transitions(
+            submission, submission.status, staff
+        )
+        targets = {
+            transition.target
+            for transition in transitions
+            if submission.get_transition(transition.target)
+        }
+        # In the order of the workflow definition
+        expected = [
+            (target, transition["display"])
+            for target, transition in submission.phase.transitions.items()
+            if target in targets
+        ]
+
+        self.assertEqual(list(submission.get_actions_for_user(staff)), expected)
+
+    def test_actions_by_role(self):
+        submission = ApplicationSubmissionFactory(status="more_info")
+        self.assertEqual(
+            list(submission.get_actions_for_user(submission.user)),
+            [("in_discussion", "Submit")],
+        )
+
+        submission = ApplicationSubmissionFactory()
+        self.assertEqual(list(submission.get_actions_for_user(submission.user)), [])
+        self.assertEqual(
+            [action for action, _ in submission.get_actions_for_user(StaffFactory())],
+            list(submission.phase.transitions),
+        )
+
+    def test_actions_shared_between_submissions(self):
+        staff = StaffFactory()
+        submissions = ApplicationSubmissionFactory.create_batch(3)
+        get_transition_actions.cache_clear()
+
+        actions = get_actions_for_submissions(submissions, staff)
+
+        self.assertEqual(set(actions), {submission.id for submission in submissions})
+        self.assertEqual(get_transition_actions.cache_info().misses, 1)
+
+    def test_role_transitions(self):
+        transitions = Request["in_discussion"].transitions
+        self.assertEqual(
+            ROLE_TRANSITIONS["single", "in_discussion", UserPermissions.STAFF],
+            frozenset(transitions),
+        )
+        self.assertEqual(
+            ROLE_TRANSITIONS["single", "in_discussion", UserPermissions.APPLICANT],
+            frozenset(),
+        )
+
+
 class TestAnonymizedSubmission(TestCase):
     def test_create_from_submission_no_user(self):
         screening_outcome = ScreeningStatusFactory()
@@ -781,6 +866,148 @@ class TestSubmissionRenderMethods(TestCase):
             else:
                 file_url_in_answers(file_to_test=file_response, file_id=file_id)
 
+    def test_form_fields_index_built_once_for_all_answers(self):
+        submission = ApplicationSubmissionFactory()
+        submission.form_fields = list(submission.form_fields.raw_data)
+        with patch(
+            "hypha.apply.funds.models.mixins.FormFieldsIndex", wraps=FormFieldsIndex
+        ) as index:
+            submission.output_answers()
+            for field_id in submission.question_field_ids:
+                submission.data(field_id)
+                submission.serialize(field_id)
+                submission.render_answer(field_id, include_question=True)
+        self.assertEqual(index.call_count, 1)
+
+    def submission_with_questions(self, count):
+        submission = ApplicationSubmissionFactory()
+        form_fields = list(submission.form_fields.raw_data)
+        question = next(field for field in form_fields if field["type"] == "char")
+        for i in range(count):
+            field_id = str(uuid.uuid4())
+            form_fields.append(
+                {
+                    **question,
+                    "id": field_id,
+                    "value": {**question["value"], "field_label": f"Question {i}"},
+                }
+            )
+            submission.form_data[field_id] = f"Answer {i}"
+        submission.form_fields = form_fields
+        return submission
+
+    def test_cost_per_field_is_flat(self):
+        # Stands in for a timing benchmark: the blocks of form_fields read while
+        # serialising every answer, per answer, for growing forms
+        reads_per_field = []
+        for count in [10, 40, 160]:
+            submission = self.submission_with_questions(count)
+            form_schema_cache.cache_clear()
+            with patch.object(
+                StreamValue,
+                "__getitem__",
+                autospec=True,
+                side_effect=StreamValue.__getitem__,
+            ) as getitem:
+                for field_id in submission.question_field_ids:
+                    submission.field(field_id)
+                    submission.data(field_id)
+                    submission.serialize(field_id)
+            reads_per_field.append(
+                getitem.call_count / len(submission.question_field_ids)
+            )
+
+        # Every block is read once, to build the index
+        self.assertLess(reads_per_field[-1], 1.1)
+        self.assertLessEqual(reads_per_field[-1], reads_per_field[0])
+
+    def test_form_fields_index_rebuilt_when_form_fields_assigned(self):
+        submission = ApplicationSubmissionFactory()
+        title_id = submission.named_blocks["title"]
+        submission.form_fields = [
+            field
+            for field in submission.form_fields.raw_data
+            if field["id"] != title_id
+        ]
+        self.assertNotIn("title", submission.named_blocks)
+        self.assertNotIn(title_id, submission.raw_fields)
+
+    def test_form_fields_index_shared_by_submissions_with_same_form(self):
+        submission = ApplicationSubmissionFactory()
+        submission = ApplicationSubmission.objects.get(id=submission.id)
+        other = ApplicationSubmission.objects.get(id=submission.id)
+        self.assertIsNot(submission.form_fields, other.form_fields)
+        self.assertIs(submission.form_fields_index, other.form_fields_index)
+
+    def test_data_matches_raw_data(self):
+        submission = ApplicationSubmissionFactory()
+        raw_data = submission.raw_data
+        for field_id in submission.raw_fields:
+            self.assertEqual(submission.data(field_id), raw_data.get(field_id))
+        for field_name in submission.named_blocks:
+            self.assertEqual(
+                submission.data(field_name),
+                raw_data.get(submission.get_definitive_id(field_name)),
+            )
+
+
+class TestRenderedAnswersCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        submission = ApplicationSubmissionFactory()
+        self.submission = ApplicationSubmission.objects.get(id=submission.id)
+
+    def fetch(self):
+        return ApplicationSubmission.objects.get(id=self.submission.id)
+
+    def count_renders(self):
+        return patch.object(
+            AccessFormData,
+            "render_uncached_answer",
+            autospec=True,
+            side_effect=AccessFormData.render_uncached_answer,
+        )
+
+    def test_cached_answers_match_rendered_answers(self):
+        rendered = [
+            self.submission.render_uncached_answer(field_id, include_question=True)
+            for field_id in self.submission.normal_blocks
+        ]
+        self.assertEqual(self.submission.render_answers(), rendered)
+        self.assertEqual(self.fetch().render_answers(), rendered)
+
+    def test_answers_rendered_once(self):
+        self.submission.output_answers()
+        with self.count_renders() as render:
+            submission = self.fetch()
+            submission.output_answers()
+            submission.render_text_blocks_answers()
+        self.assertEqual(render.call_count, 0)
+
+    def test_answers_cached_with_and_without_question(self):
+        title_id = self.submission.named_blocks["title"]
+        with_question = self.submission.render_answer(title_id, include_question=True)
+        without_question = self.submission.render_answer(title_id)
+        self.assertNotEqual(with_question, without_question)
+
+    def test_new_revision_shows_new_answer(self):
+        title_id = self.submission.named_blocks["title"]
+        self.submission.render_answer(title_id)
+
+        self.submission.form_data["title"] = "My Awesome Title"
+        self.submission.create_revision()
+
+        self.assertIn("My Awesome Title", self.fetch().render_answer(title_id))
+
+    def test_unsaved_data_not_read_from_cache(self):
+        title_id = self.submission.named_blocks["title"]
+        self.submission.render_answer(title_id)
+
+        submission = self.fetch()
+        submission.form_data["title"] = "My Awesome Title"
+
+        self.assertIn("My Awesome Title", submission.render_answer(title_id))
+
 
 @override_settings(FORCE_LOGIN_FOR_APPLICATION=False)
 class TestRequestForPartners(TestCase):
@@ -808,9 +1035,9 @@ class TestForTableQueryset(TestCase):
 
         qs = ApplicationSubmission.objects.for_table(user=staff)
         submission = qs[0]
-        self.assertEqual(submission.opinion_disagree, None)
+        self.assertEqual(submission.opinion_disagree, 0)
         self.assertEqual(submission.review_count, 1)
-        self.assertEqual(submission.review_submitted_count, None)
+        self.assertEqual(submission.review_submitted_count, 0)
         self.assertEqual(submission.review_recommendation, None)
 
     def test_review_outcome(self):
@@ -819,7 +1046,7 @@ class TestForTableQueryset(TestCase):
         ReviewFactory(submission=submission)
         qs = ApplicationSubmission.objects.for_table(user=staff)
         submission = qs[0]
-        self.assertEqual(submission.opinion_disagree, None)
+        self.assertEqual(submission.opinion_disagree, 0)
         self.assertEqual(submission.review_count, 1)
         self.assertEqual(submission.review_submitted_count, 1)
         self.assertEqual(submission.review_recommendation, NO)
@@ -901,12 +1128,92 @@ class TestForTableQueryset(TestCase):
 
         submission = qs[1]
         self.assertEqual(submission, submission_two)
-        self.assertEqual(submission.opinion_disagree, None)
+        self.assertEqual(submission.opinion_disagree, 0)
         self.assertEqual(submission.review_count, 1)
         self.assertEqual(submission.review_submitted_count, 1)
         self.assertEqual(submission.review_recommendation, NO)
 
 
+class TestSubmissionSummary(TestCase):
+    def test_comment_counts_follow_visibility(self):
+        staff = StaffFactory()
+        reviewer = ReviewerFactory()
+        submission = ApplicationSubmissionFactory()
+        CommentFactory(source=submission, internal=True)
+        CommentFactory(source=submission, reviewers=True)
+
+        summary = SubmissionSummary.objects.get(submission=submission)
+        self.assertEqual(summary.team_comment_count, 1)
+        self.assertEqual(summary.reviewer_comment_count, 1)
+        self.assertEqual(summary.comment_count, 2)
+
+        self.assertEqual(
+            ApplicationSubmission.objects.for_table(user=staff)[0].comment_count, 2
+        )
+        self.assertEqual(
+            ApplicationSubmission.objects.for_table(user=reviewer)[0].comment_count, 1
+        )
+
+    def test_last_update_follows_activity(self):
+        submission = ApplicationSubmissionFactory()
+        activity = ActivityFactory(source=submission)
+
+        submission = ApplicationSubmission.objects.with_summary().get()
+        self.assertEqual(submission.last_update, activity.timestamp)
+        self.assertEqual(submission.last_user_update, activity.user.full_name)
+
+    def test_screening_status_follows_decision(self):
+        submission = ApplicationSubmissionFactory()
+        screening_status = ScreeningStatusFactory()
+
+        submission.screening_statuses.add(screening_status)
+        summary = SubmissionSummary.objects.get(submission=submission)
+        self.assertEqual(summary.screening_status, screening_status)
+
+        submission.screening_statuses.clear()
+        summary.refresh_from_db()
+        self.assertIsNone(summary.screening_status)
+
+    def test_deleted_submission_has_no_summary(self):
+        submission = ApplicationSubmissionFactory()
+        CommentFactory(source=submission)
+        ReviewFactory(submission=submission)
+
+        submission.delete()
+        self.assertFalse(SubmissionSummary.objects.exists())
+
+    def test_rebuild_command(self):
+        submission = ApplicationSubmissionFactory()
+        ReviewFactory(submission=submission)
+        SubmissionSummary.objects.all().delete()
+
+        call_command("rebuild_submission_summaries", stdout=StringIO())
+
+        summary = SubmissionSummary.objects.get(submission=submission)
+        self.assertEqual(summary.review_count, 1)
+        self.assertEqual(summary.review_submitted_count, 1)
+
+    def test_migration_fills_summaries_of_existing_submissions(self):
+        submission, other = ApplicationSubmissionFactory.create_batch(2)
+        review = ReviewFactory(submission=submission, recommendation_yes=True)
+        ReviewOpinionFactory(review=review, opinion_disagree=True)
+        ReviewFactory(submission=other, recommendation_yes=True)
+        CommentFactory(source=submission, internal=True)
+        ActivityFactory(source=other)
+        submission.screening_statuses.add(ScreeningStatusFactory())
+        summaries = list(SubmissionSummary.objects.order_by("pk").values())
+        SubmissionSummary.objects.all().delete()
+
+        migration = import_module(
+            "hypha.apply.funds.migrations.0143_fill_submission_summaries"
+        )
+        migration.fill_submission_summaries(apps, None)
+
+        self.assertEqual(
+            list(SubmissionSummary.objects.order_by("pk").values()), summaries
+        )
+
+
 class TestReminderModel(TestCase):
     def test_can_save_reminder(self):
         submission = ApplicationSubmissionFactory()
@@ -1,6 +1,8 @@
 """Tests for funds/permissions.py."""
 
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rolepermissions.checkers import has_object_permission
 
 from hypha.apply.funds.models.co_applicants import (
@@ -22,6 +24,7 @@ from hypha.apply.users.tests.factories import (
 from hypha.home.factories import ApplySiteFactory
 
 from ..permissions import (
+    caching_permissions,
     can_access_drafts,
     can_alter_archived_submissions,
     can_bulk_archive_submissions,
@@ -36,8 +39,11 @@ from ..permissions import (
     can_view_submission,
     get_archive_alter_groups,
     get_archive_view_groups,
+    has_permission,
+    prefetch_permission_data,
     user_can_view_post_comment_form,
 )
+from ..permissions import has_object_permission as has_cached_object_permission
 
 
 class TestCanTakeSubmissionActions(TestCase):
@@ -504,3 +510,118 @@ class TestUserCanViewPostCommentForm(TestCase):
         self.assertTrue(
             user_can_view_post_comment_form(StaffFactory(), self.submission)
         )
+
+
+# ---------------------------------------------------------------------------
+# caching_permissions / prefetch_permission_data
+# ---------------------------------------------------------------------------
+
+
+class TestPermissionCache(TestCase):
+    def setUp(self):
+        self.applicant = ApplicantFactory()
+        self.submission = ApplicationSubmissionFactory()
+        invite = CoApplicantInvite.objects.create(
+            submission=self.submission,
+            invited_user_email=self.applicant.email,
+            status=CoApplicantInviteStatus.ACCEPTED,
+            role=CoApplicantRole.VIEW,
+        )
+        CoApplicant.objects.create(
+            submission=self.submission,
+            user=self.applicant,
+            invite=invite,
+            role=CoApplicantRole.VIEW,
+        )
+        # Fetches the roles of the user up front
+        self.assertFalse(self.applicant.is_apply_staff)
+
+    def check(self):
+        return has_permission(
+            "submission_view", self.applicant, self.submission, raise_exception=False
+        )[0]
+
+    def test_checks_repeated_outside_cache(self):
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertTrue(self.check())
+
+    def test_checks_cached_within_cache(self):
+        with caching_permissions():
+            with self.assertNumQueries(1):
+                self.assertTrue(self.check())
+            with self.assertNumQueries(0):
+                self.assertTrue(self.check())
+
+    def test_changed_object_checked_again(self):
+        with caching_permissions():
+            self.assertTrue(self.check())
+            self.submission.is_archive = True
+            self.assertFalse(self.check())
+
+    def test_object_permission_cached(self):
+        staff = StaffFactory()
+        with caching_permissions():
+            self.assertTrue(
+                has_cached_object_permission("view_comments", staff, self.submission)
+            )
+            with self.assertNumQueries(0):
+                self.assertTrue(
+                    has_cached_object_permission(
+                        "view_comments", staff, self.submission
+                    )
+                )
+
+    def count_bulk_queries(self, action, user, submissions):
+        """Check a page of submissions the way the list views do"""
+        with CaptureQueriesContext(connection) as queries, caching_permissions():
+            prefetch_permission_data(user, submissions)
+            permissions = {
+                submission.pk: has_permission(
+                    action, user, submission, raise_exception=False
+                )[0]
+                for submission in submissions
+            }
+        return len(queries), permissions
+
+    def test_bulk_check_queries_dont_grow_with_objects(self):
+        submissions = [self.submission, *ApplicationSubmissionFactory.create_batch(4)]
+        one, _ = self.count_bulk_queries(
+            "submission_view", self.applicant, submissions[:1]
+        )
+
+        five, permissions = self.count_bulk_queries(
+            "submission_view", self.applicant, submissions
+        )
+
+        self.assertEqual(five, one)
+        self.assertEqual(
+            permissions,
+            {
+                submission.pk: submission == self.submission
+                for submission in submissions
+            },
+        )
+
+    @override_settings(HIDE_IDENTITY_FROM_REVIEWERS=True)
+    def test_bulk_check_of_reviewers(self):
+        reviewer = ReviewerFactory()
+        assigned = ApplicationSubmissionFactory.create_batch(3, reviewers=[reviewer])
+        # Fills the cache of the site and the reviewer settings
+        self.count_bulk_queries("applicant_identity_view", reviewer, [self.submission])
+        one, _ = self.count_bulk_queries(
+            "applicant_identity_view", reviewer, [self.submission]
+        )
+
+        four, permissions = self.count_bulk_queries(
+            "applicant_identity_view", reviewer, [*assigned, self.submission]
+        )
+
+        self.assertEqual(four, one)
+        self.assertEqual(
+            permissions,
+            {
+                **{submission.pk: False for submission in assigned},
+                self.submission.pk: True,
+            },
+        )
@@ -0,0 +1,51 @@
+"""Tests for funds/revision_delta.py."""
+
+from django.test import SimpleTestCase
+
+from ..revision_delta import apply, decode, diff, encode, text_edits, tokenize
+
+ANSWER = "<p>" + " ".join(f"Sentence number {i}, about the project." for i in range(50))
+
+
+class TestTokenize(SimpleTestCase):
+    def test_tokens_join_to_text(self):
+        text = "<p>Hello, world!</p>\n\n<ul><li>ünïcode  words</li></ul>"
+        self.assertEqual("".join(tokenize(text)), text)
+
+
+class TestTextEdits(SimpleTestCase):
+    def test_edit_applies_to_old_answer(self):
+        new = ANSWER.replace("number 7,", "number seven,") + " One more.</p>"
+        patch = diff({"answer": ANSWER}, {"answer": new})
+        self.assertIn("answer", patch["edit"])
+        self.assertEqual(apply({"answer": ANSWER}, patch), {"answer": new})
+
+    def test_rewritten_answer_is_replaced(self):
+        self.assertIsNone(text_edits(ANSWER, "<p>Something else entirely.</p>" * 20))
+
+    def test_short_answer_is_replaced(self):
+        patch = diff({"title": "Old title"}, {"title": "New title"})
+        self.assertEqual(patch, {"set": {"title": "New title"}})
+
+
+class TestDiff(SimpleTestCase):
+    def test_unchanged_data_has_empty_patch(self):
+        data = {"title": "Title", "answer": ANSWER, "value": 10}
+        self.assertEqual(diff(data, dict(data)), {})
+
+    def test_added_and_removed_answers(self):
+        old = {"title": "Title", "removed": ["a", "b"]}
+        new = {"title": "Title", "added": {"name": "file.pdf"}}
+        patch = diff(old, new)
+        self.assertEqual(patch, {"remove": ["removed"], "set": {"added": new["added"]}})
+        self.assertEqual(apply(old, patch), new)
+
+    def test_encoded_patch_round_trips(self):
+        patch = diff({"answer": ANSWER}, {"answer": ANSWER + " Ünïcode."})
+        encoded = encode(patch)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(decode(encoded), patch)
+
+    def test_patch_much_smaller_than_answer(self):
+        patch = diff({"answer": ANSWER}, {"answer": ANSWER.replace("42", "forty two")})
+        self.assertLess(len(encode(patch)) * 10, len(ANSWER))
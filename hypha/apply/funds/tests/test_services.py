@@ -1,6 +1,8 @@
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 
 from hypha.apply.activity.models import Event
 from hypha.apply.activity.options import MESSAGES
@@ -8,10 +10,14 @@ from hypha.apply.funds.models.submissions import (
     AnonymizedSubmission,
     ApplicationSubmission,
 )
-from hypha.apply.funds.services import bulk_anonymize_submissions
+from hypha.apply.funds.services import (
+    bulk_anonymize_submissions,
+    bulk_transition_submissions,
+)
 from hypha.apply.funds.tests.factories import ApplicationSubmissionFactory
 from hypha.apply.funds.workflows.constants import DRAFT_STATE
-from hypha.apply.users.tests.factories import StaffFactory
+from hypha.apply.users.tests.factories import ApplicantFactory, StaffFactory
+from hypha.apply.utils.testing import make_request
 
 
 class BulkActions(TestCase):
@@ -109,3 +115,71 @@ class BulkActions(TestCase):
             type=MESSAGES.NEW_SUBMISSION, object_id=submission.id
         )
         self.assertEqual(remaining.count(), 0)
+
+
+class TestBulkTransitionSubmissions(TestCase):
+    def setUp(self):
+        self.staff = StaffFactory()
+        self.request = make_request(self.staff, method="post")
+
+    def transition(self, submissions, transitions, user=None):
+        return bulk_transition_submissions(
+            ApplicationSubmission.objects.filter(
+                id__in=[submission.id for submission in submissions]
+            ),
+            transitions,
+            user or self.staff,
+            self.request,
+        )
+
+    def test_status_updated(self):
+        submissions = ApplicationSubmissionFactory.create_batch(3)
+
+        failed, phase_changes = self.transition(submissions, ["internal_review"])
+
+        self.assertEqual(failed, [])
+        self.assertEqual(set(phase_changes), {s.id for s in submissions})
+        self.assertEqual(
+            set(
+                ApplicationSubmission.objects.filter(id__in=phase_changes).values_list(
+                    "status", flat=True
+                )
+            ),
+            {"internal_review"},
+        )
+
+    def test_queries_dont_grow_with_submissions(self):
+        one = ApplicationSubmissionFactory.create_batch(1)
+        many = ApplicationSubmissionFactory.create_batch(5)
+        # Fetches the roles of the user up front
+        self.assertTrue(self.staff.is_apply_staff)
+
+        with CaptureQueriesContext(connection) as one_queries:
+            self.transition(one, ["internal_review"])
+        with CaptureQueriesContext(connection) as many_queries:
+            self.transition(many, ["internal_review"])
+
+        self.assertEqual(len(many_queries), len(one_queries))
+
+    def test_user_without_permission_fails(self):
+        submissions = ApplicationSubmissionFactory.create_batch(2)
+
+        failed, phase_changes = self.transition(
+            submissions, ["internal_review"], user=ApplicantFactory()
+        )
+
+        self.assertEqual({s.id for s in failed}, {s.id for s in submissions})
+        self.assertEqual(phase_changes, {})
+        self.assertFalse(
+            ApplicationSubmission.objects.filter(status="internal_review").exists()
+        )
+
+    def test_transition_to_next_stage_runs_per_submission(self):
+        submission = ApplicationSubmissionFactory(workflow_stages=2)
+
+        failed, phase_changes = self.transition([submission], ["invited_to_proposal"])
+
+        self.assertEqual(failed, [])
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, "invited_to_proposal")
+        self.assertIsNotNone(submission.next)
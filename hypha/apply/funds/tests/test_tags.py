@@ -64,3 +64,33 @@ class TestTemplateTags(TestCase):
         output = template.render(context)
 
         self.assertEqual(output, "")
+
+
+class TestStatusBarTag(TestCase):
+    def render(self, submission, user):
+        request = RequestFactory().get(submission.get_absolute_url())
+        request.user = user
+        template = Template(
+            "{% load statusbar_tags %}"
+            "{% status_bar object.workflow object.phase request.user %}"
+        )
+        return template.render(Context({"object": submission, "request": request}))
+
+    def test_renders_without_queries(self):
+        submission = ApplicationSubmissionFactory()
+        staff = StaffFactory()
+        self.assertTrue(staff.is_apply_staff)
+
+        with self.assertNumQueries(0):
+            for _ in range(100):
+                output = self.render(submission, staff)
+
+        self.assertIn(submission.phase.display_name, output)
+
+    def test_workflow_structure_computed_once(self):
+        workflow = ApplicationSubmissionFactory().workflow
+        self.assertIs(workflow.stepped_phases, workflow.stepped_phases)
+        self.assertEqual(
+            list(workflow.display_phases),
+            [phases[0] for phases in workflow.stepped_phases.values()],
+        )
@@ -1,10 +1,22 @@
+import csv
+import io
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 
+from hypha.apply.funds.models import ApplicationSubmission
 from hypha.apply.funds.models.utils import (
     STATUS_SUCCESS,
     SubmissionExportManager,
 )
-from hypha.apply.funds.tasks import generate_submission_csv
+from hypha.apply.funds.tasks import (
+    generate_submission_csv,
+    get_shard_name,
+    render_submission_csv_shard,
+    update_submission_search_index,
+)
 from hypha.apply.funds.tests.factories.models import ApplicationSubmissionFactory
 from hypha.apply.todo.models import Task
 from hypha.apply.users.tests.factories import StaffFactory
@@ -28,7 +40,8 @@ class TestTasks(TestCase):
         self.assertEqual(SubmissionExportManager.objects.all().count(), 1)
 
         # Should be 6 rows, 1 title row and 5 serialized applications
-        self.assertEqual(len(gen_csv.export_data.strip("\r\n").split("\r\n")), 6)
+        export_data = gen_csv.export_file.read().decode()
+        self.assertEqual(len(export_data.strip("\r\n").split("\r\n")), 6)
         self.assertEqual(gen_csv.user, req_user)
         self.assertEqual(gen_csv.status, STATUS_SUCCESS)
 
@@ -37,7 +50,9 @@ class TestTasks(TestCase):
         req_user = StaffFactory()
 
         SubmissionExportManager.objects.create(
-            user=req_user, total_export=1, export_data="teeeeesst"
+            user=req_user,
+            total_export=1,
+            export_file=ContentFile(b"teeeeesst", name="old.csv"),
         )
 
         generate_submission_csv.apply(
@@ -54,7 +69,8 @@ class TestTasks(TestCase):
         self.assertEqual(SubmissionExportManager.objects.all().count(), 1)
 
         # Should be 6 rows, 1 title row and 5 serialized applications
-        self.assertEqual(len(gen_csv.export_data.strip("\r\n").split("\r\n")), 6)
+        export_data = gen_csv.export_file.read().decode()
+        self.assertEqual(len(export_data.strip("\r\n").split("\r\n")), 6)
         self.assertEqual(gen_csv.user, req_user)
         self.assertEqual(gen_csv.status, STATUS_SUCCESS)
 
@@ -84,3 +100,142 @@ class TestTasks(TestCase):
             ]
         )
         self.assertEqual(Task.objects.all().count(), 0)
+
+    def test_replaced_export_file_removed_from_storage(self):
+        req_user = StaffFactory()
+        old_export = SubmissionExportManager.objects.create(
+            user=req_user,
+            total_export=1,
+            export_file=ContentFile(b"teeeeesst", name="old.csv"),
+        )
+        storage = old_export.export_file.storage
+        old_name = old_export.export_file.name
+
+        generate_submission_csv.apply(args=[[], req_user.id, "https://test.com/"])
+
+        self.assertFalse(storage.exists(old_name))
+
+    @patch("hypha.apply.funds.tasks.EXPORT_SHARD_SIZE", 2)
+    def test_csv_generation_sharded(self):
+        submissions = ApplicationSubmissionFactory.create_batch(5)
+        submission_ids = [submission.id for submission in submissions][::-1]
+        req_user = StaffFactory()
+
+        with patch(
+            "hypha.apply.funds.tasks.render_submission_csv_shard.run",
+            wraps=render_submission_csv_shard.run,
+        ) as render_shard:
+            generate_submission_csv.apply(
+                args=[submission_ids, req_user.id, "https://test.com/"]
+            )
+        self.assertEqual(render_shard.call_count, 3)
+
+        gen_csv = SubmissionExportManager.objects.get()
+        self.assertEqual(gen_csv.status, STATUS_SUCCESS)
+        self.assertEqual(gen_csv.total_shards, 3)
+        self.assertEqual(gen_csv.completed_shards, 3)
+        self.assertEqual(gen_csv.progress, 100)
+
+        rows = list(csv.reader(io.StringIO(gen_csv.export_file.read().decode())))
+        self.assertEqual(rows[0][:2], ["Application #", "URL"])
+        self.assertEqual(
+            [row[0] for row in rows[1:]], [str(id) for id in submission_ids]
+        )
+
+        storage = gen_csv.export_file.storage
+        for shard_index in range(3):
+            self.assertFalse(storage.exists(get_shard_name(gen_csv, shard_index)))
+
+
+class TestSubmissionExportManager(TestCase):
+    def test_progress(self):
+        export_manager = SubmissionExportManager.objects.create(
+            user=StaffFactory(), total_export=8
+        )
+        self.assertEqual(export_manager.progress, 0)
+
+        export_manager.add_exported(2)
+        export_manager.add_exported(4)
+        export_manager.refresh_from_db()
+        self.assertEqual(export_manager.progress, 75)
+
+    def test_progress_without_submissions(self):
+        export_manager = SubmissionExportManager.objects.create(
+            user=StaffFactory(), total_export=0
+        )
+        self.assertEqual(export_manager.progress, 0)
+
+
+class TestSubmissionSearchIndex(TestCase):
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+    def test_save_queues_reindex(self):
+        submission = ApplicationSubmissionFactory()
+        submission.form_data["title"] = "A rather unusual title"
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            submission.save()
+
+        submission.refresh_from_db()
+        self.assertTrue(submission.search_index_dirty)
+        self.assertEqual(len(callbacks), 1)
+
+        update_submission_search_index(submission.id)
+
+        submission.refresh_from_db()
+        self.assertFalse(submission.search_index_dirty)
+        self.assertIn("A rather unusual title", submission.search_data)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+    def test_save_during_reindex_keeps_submission_dirty(self):
+        submission = ApplicationSubmissionFactory()
+        ApplicationSubmission.objects.filter(id=submission.id).update(
+            search_index_dirty=True
+        )
+        update_search_fields = ApplicationSubmission.update_search_fields
+
+        def save_between_read_and_write(instance):
+            update_search_fields(instance)
+            # Another request saves the submission before the task writes
+            ApplicationSubmission.objects.filter(id=instance.id).update(
+                search_index_dirty=True
+            )
+
+        with patch.object(
+            ApplicationSubmission,
+            "update_search_fields",
+            autospec=True,
+            side_effect=save_between_read_and_write,
+        ):
+            update_submission_search_index(submission.id)
+
+        submission.refresh_from_db()
+        self.assertTrue(submission.search_index_dirty)
+
+    def test_clean_submission_is_not_reindexed(self):
+        submission = ApplicationSubmissionFactory()
+        ApplicationSubmission.objects.filter(id=submission.id).update(search_data="")
+
+        update_submission_search_index(submission.id)
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.search_data, "")
+
+    def test_reindex_command(self):
+        dirty, clean = ApplicationSubmissionFactory.create_batch(2)
+        ApplicationSubmission.objects.update(search_data="")
+        ApplicationSubmission.objects.filter(id=dirty.id).update(
+            search_index_dirty=True
+        )
+
+        out = io.StringIO()
+        call_command("reindex_submissions", stdout=out)
+        self.assertIn("1 submission reindexed", out.getvalue())
+        dirty.refresh_from_db()
+        clean.refresh_from_db()
+        self.assertIn(dirty.title, dirty.search_data)
+        self.assertFalse(dirty.search_index_dirty)
+        self.assertEqual(clean.search_data, "")
+
+        call_command("reindex_submissions", "--all", "--batch-size=1", stdout=out)
+        clean.refresh_from_db()
+        self.assertIn(clean.title, clean.search_data)
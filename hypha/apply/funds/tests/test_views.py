@@ -1,12 +1,16 @@
 import re
 from datetime import timedelta
+from unittest import mock
 
 import wagtail.blocks
 from bs4 import BeautifulSoup
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.files.base import ContentFile
+from django.db import connection
 from django.http import Http404
 from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -25,6 +29,7 @@ from hypha.apply.funds.tests.factories import (
     SealedRoundFactory,
     SealedSubmissionFactory,
 )
+from hypha.apply.funds.views.revisions import RevisionCompareView
 from hypha.apply.funds.views.submission_detail import SubmissionDetailView
 from hypha.apply.funds.workflows import INITIAL_STATE
 from hypha.apply.projects.models import Project
@@ -48,6 +53,7 @@ from ..models import (
     ReviewerSettings,
     ScreeningStatus,
 )
+from ..models.utils import STATUS_SUCCESS, SubmissionExportManager
 from .factories import CustomFormFieldsFactory
 
 
@@ -1238,6 +1244,51 @@ class TestReviewerSubmissionView(BaseSubmissionViewTestCase):
         self.assertNotContains(response, self.applicant.email)
 
 
+class TestSubmissionsAllView(TestCase):
+    def count_queries(self, user):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("funds:submissions:list"), secure=True)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    @override_settings(HIDE_IDENTITY_FROM_REVIEWERS=True)
+    def test_permission_queries_dont_grow_with_rows(self):
+        reviewer = ReviewerFactory()
+        ApplicationSubmissionFactory.create_batch(2, reviewers=[reviewer])
+        # The first request fills the caches of the list
+        self.count_queries(reviewer)
+        two_rows = self.count_queries(reviewer)
+
+        ApplicationSubmissionFactory.create_batch(3, reviewers=[reviewer])
+        self.count_queries(reviewer)
+        self.assertEqual(self.count_queries(reviewer), two_rows)
+
+    def test_status_menu_queries_dont_grow_with_selection(self):
+        staff = StaffFactory()
+        first = ApplicationSubmissionFactory()
+        submissions = [
+            first,
+            *ApplicationSubmissionFactory.create_batch(
+                5, round=first.round, page=first.page
+            ),
+        ]
+        self.client.force_login(staff)
+
+        def count_queries(selected):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    reverse("funds:submissions:submenu-update-status"),
+                    {"selectedSubmissionIds": [s.id for s in selected]},
+                    secure=True,
+                )
+            self.assertContains(response, "Open Review")
+            return len(queries)
+
+        count_queries(submissions[:1])
+        self.assertEqual(count_queries(submissions), count_queries(submissions[:1]))
+
+
 class TestApplicantSubmissionView(BaseSubmissionViewTestCase):
     user_factory = ApplicantFactory
     submission = None
@@ -1583,6 +1634,26 @@ class TestRevisionCompare(BaseSubmissionViewTestCase):
         response = self.get_page(submission)
         self.assertEqual(response.status_code, 200)
 
+    def test_comparison_is_cached(self):
+        submission = ApplicationSubmissionFactory()
+        submission.form_data["title"] = "A new title"
+        submission.create_revision()
+
+        with mock.patch.object(
+            RevisionCompareView,
+            "compare_revisions",
+            autospec=True,
+            side_effect=RevisionCompareView.compare_revisions,
+        ) as compare_revisions:
+            first = self.get_page(submission)
+            second = self.get_page(submission)
+
+        compare_revisions.assert_called_once()
+        self.assertEqual(
+            first.context["required_fields"], second.context["required_fields"]
+        )
+        self.assertIn("<ins>", first.context["required_fields"][0][1])
+
 
 class TestRevisionList(BaseSubmissionViewTestCase):
     base_view_name = "revisions:list"
@@ -1890,6 +1961,38 @@ class TestReviewerLeaderboard(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class TestSubmissionExportDownload(TestCase):
+    url = reverse("apply:submissions:submission-export-download")
+
+    def test_export_streamed_then_deleted(self):
+        staff = StaffFactory()
+        export_manager = SubmissionExportManager.objects.create(
+            user=staff,
+            total_export=1,
+            status=STATUS_SUCCESS,
+            export_file=ContentFile(b"Application #,URL\r\n", name="submissions.csv"),
+        )
+        storage = export_manager.export_file.storage
+        file_name = export_manager.export_file.name
+
+        self.client.force_login(staff)
+        response = self.client.get(self.url, secure=True)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(b"".join(response.streaming_content), b"Application #,URL\r\n")
+        self.assertFalse(SubmissionExportManager.objects.exists())
+        self.assertFalse(storage.exists(file_name))
+
+    def test_export_in_progress_not_downloadable(self):
+        staff = StaffFactory()
+        SubmissionExportManager.objects.create(user=staff, total_export=1)
+
+        self.client.force_login(staff)
+        response = self.client.get(self.url, secure=True)
+
+        self.assertEqual(response.status_code, 404)
+
+
 class TestUpdateReviewersMixin(BaseSubmissionViewTestCase):
     user_factory = StaffFactory
 
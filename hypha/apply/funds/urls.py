@@ -33,6 +33,7 @@ from .views.partials import (
     partial_reviews_card,
     partial_reviews_decisions,
     partial_screening_card,
+    partial_search_autocomplete,
     partial_submission_answers,
     partial_submission_lead,
     sub_menu_bulk_update_lead,
@@ -163,6 +164,11 @@ submission_urls = (
             sub_menu_category_options,
             name="submenu-category-options",
         ),
+        path(
+            "all/partials/search-autocomplete/",
+            partial_search_autocomplete,
+            name="search-autocomplete",
+        ),
         path(
             "all/partials/review_decisions/",
             partial_reviews_decisions,
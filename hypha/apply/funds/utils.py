@@ -1,11 +1,11 @@
 import csv
 import os
 import re
-from io import StringIO
 from itertools import chain
-from typing import Iterable
+from typing import Callable, TextIO
 
 from django.core.files.storage import default_storage
+from django.db.models import Min, QuerySet
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.encoding import force_bytes
@@ -15,11 +15,25 @@ from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
 
 # from django.contrib.sites.models import Site
+from hypha.apply.funds.models.mixins import FormFieldsIndex
 from hypha.apply.funds.models.submissions import ApplicationSubmission
+from hypha.apply.stream_forms.schema import form_schema_cache
 from hypha.apply.users.tokens import CoApplicantInviteTokenGenerator
 
 from .models.screening import ScreeningStatus
 
+# Number of submissions loaded from the database at a time when exporting
+EXPORT_CHUNK_SIZE = 200
+
+# Number of submissions rendered by each worker task when exporting
+EXPORT_SHARD_SIZE = 1000
+
+# Seconds between checks on the progress of an export
+EXPORT_PROGRESS_POLL_TIME = 3
+
+# Number of submissions reindexed per `bulk_update()`
+SEARCH_INDEX_BATCH_SIZE = 200
+
 
 def render_icon(image):
     if not image:
@@ -110,27 +124,30 @@ def get_statuses_as_params(statuses):
     return params
 
 
-def export_submissions_to_csv(
-    submissions_list: Iterable[ApplicationSubmission], base_uri: str
-):
-    csv_stream = StringIO()
+def get_submissions_csv_header(submissions: QuerySet) -> list:
+    """Build the CSV header for the given submissions without rendering any answers
+
+    The questions are read from the distinct form definitions used by the
+    submissions, in the order they are first used, so the header is known before
+    any row is written.
+    """
     header_row = [gettext_lazy("Application #"), gettext_lazy("URL")]
     header_set = set(header_row)
     index = 2
-    data_list = []
-
-    for submission in submissions_list:
-        values = {
-            _("Application #"): submission.id,
-            _("URL"): f"{base_uri}{submission.get_absolute_url().lstrip('/')}",
-        }
-        named = submission.named_blocks
-        for field_id in submission.question_text_field_ids:
-            question_field = submission.serialize(field_id)
-            field_name = question_field["question"]
-            field_value = question_field["answer"]
-            if field_id == "address" and isinstance(field_value, dict):
-                field_value = "\n".join(f"{k}: {v}" for k, v in field_value.items())
+
+    form_definitions = (
+        submissions.order_by()
+        .values("form_fields")
+        .annotate(first_id=Min("id"))
+        .order_by("first_id")
+    )
+    for form_definition in form_definitions:
+        fields_index = form_schema_cache.get(
+            form_definition["form_fields"], FormFieldsIndex
+        )
+        named = fields_index.named_blocks
+        for field_id in fields_index.question_text_field_ids:
+            field_name = fields_index.fields[field_id].value["field_label"]
             if field_name not in header_set:
                 header_set.add(field_name)
                 if field_id not in named:
@@ -138,13 +155,58 @@ def export_submissions_to_csv(
                 else:
                     header_row.insert(index, field_name)
                     index += 1
-            values[field_name] = strip_tags(field_value)
-        data_list.append(values)
-    writer = csv.DictWriter(csv_stream, fieldnames=header_row, restval="")
-    writer.writeheader()
-    for data in data_list:
-        writer.writerow(data)  # type: ignore[arg-type]
-    return csv_stream.getvalue()
+    return header_row
+
+
+def get_submission_csv_row(submission: ApplicationSubmission, base_uri: str) -> dict:
+    values = {
+        _("Application #"): submission.id,
+        _("URL"): f"{base_uri}{submission.get_absolute_url().lstrip('/')}",
+    }
+    for field_id in submission.question_text_field_ids:
+        question_field = submission.serialize(field_id)
+        field_name = question_field["question"]
+        field_value = question_field["answer"]
+        if field_id == "address" and isinstance(field_value, dict):
+            field_value = "\n".join(f"{k}: {v}" for k, v in field_value.items())
+        values[field_name] = strip_tags(field_value)
+    return values
+
+
+def write_submissions_csv_rows(
+    csv_file: TextIO,
+    header_row: list,
+    submission_ids: list[int],
+    base_uri: str,
+    progress_callback: Callable[[int], None] | None = None,
+) -> None:
+    """Write a CSV row for each of the submission IDs, in the order given
+
+    Submissions are loaded `EXPORT_CHUNK_SIZE` at a time so memory use does not
+    grow with the size of the export. `progress_callback` is called with the number
+    of rows written after each chunk.
+    """
+    writer = csv.DictWriter(csv_file, fieldnames=header_row, restval="")
+    submissions = ApplicationSubmission.objects.only("id", "form_data", "form_fields")
+    for start in range(0, len(submission_ids), EXPORT_CHUNK_SIZE):
+        chunk_ids = submission_ids[start : start + EXPORT_CHUNK_SIZE]
+        chunk = submissions.in_bulk(chunk_ids)
+        for submission_id in chunk_ids:
+            if submission := chunk.get(submission_id):
+                writer.writerow(get_submission_csv_row(submission, base_uri))  # type: ignore[arg-type]
+        if progress_callback:
+            progress_callback(len(chunk_ids))
+
+
+def export_submissions_to_csv(
+    submission_ids: list[int], base_uri: str, csv_file: TextIO
+) -> None:
+    """Write the given submissions, header included, as CSV to `csv_file`"""
+    header_row = get_submissions_csv_header(
+        ApplicationSubmission.objects.filter(id__in=submission_ids)
+    )
+    csv.DictWriter(csv_file, fieldnames=header_row).writeheader()
+    write_submissions_csv_rows(csv_file, header_row, submission_ids, base_uri)
 
 
 def get_copied_form_name(original_form_name: str) -> str:
@@ -186,17 +248,22 @@ def check_submissions_same_determination_form(submissions):
 
     same_form = True
     try:
-        # check form id
-        determination_form_ids = [
-            submission.get_from_parent("determination_forms").first().id
-            for submission in submissions
-        ]
+        # check form id, once for each round or lab
+        determination_form_ids = set()
+        parents = set()
+        for submission in submissions:
+            parent = (submission.round_id, submission.page_id)
+            if parent not in parents:
+                parents.add(parent)
+                determination_form_ids.add(
+                    submission.get_from_parent("determination_forms").first().id
+                )
     except Exception:
         # if there is a form id error, handles old determination form issues
         same_form = False
         return same_form
 
-    if any(d_id != determination_form_ids[0] for d_id in determination_form_ids):
+    if len(determination_form_ids) > 1:
         same_form = False
     return same_form
 
@@ -5,10 +5,7 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.contrib.postgres.search import SearchQuery, SearchRank
-from django.core.exceptions import PermissionDenied
-from django.core.paginator import Paginator
-from django.db import models
+from django.db.models import Prefetch
 from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
 from django.shortcuts import redirect, render
 from django.urls import reverse
@@ -31,14 +28,17 @@ from hypha.apply.funds.workflows import (
     get_action_mapping,
     review_statuses,
 )
-from hypha.apply.search.filters import apply_date_filter
-from hypha.apply.search.query_parser import filter_non_digits, parse_search_query
+from hypha.apply.projects.models import Project
+from hypha.apply.search.planner import SubmissionSearchPlanner
+from hypha.apply.search.query_parser import filter_non_digits
 from hypha.apply.users.decorators import (
     is_apply_staff,
     is_apply_staff_or_reviewer_required,
 )
+from hypha.core.paginator import KeysetPaginator
 
 from .. import permissions, services
+from ..facets import cached_facet_counts
 from ..models import (
     ApplicationSubmission,
     ReviewerSettings,
@@ -48,7 +48,7 @@ from ..tables import (
     SubmissionFilter,
     get_screening_statuses,
 )
-from ..utils import check_submissions_same_determination_form, get_export_polling_time
+from ..utils import EXPORT_PROGRESS_POLL_TIME, check_submissions_same_determination_form
 
 User = get_user_model()
 
@@ -84,8 +84,6 @@ def submissions_all(
     request: HttpRequest, template_name="submissions/all.html"
 ) -> HttpResponse:
     search_query = request.GET.get("query") or ""
-    parsed_query = parse_search_query(search_query)
-    search_term, search_filters = parsed_query["text"], parsed_query["filters"]
 
     show_archived = request.GET.get("archived", False) == "on"
     show_drafts = request.GET.get("drafts", False) == "on"
@@ -103,9 +101,7 @@ def submissions_all(
         request.GET.getlist("category_options", [])
     )
     selected_sort = request.GET.get("sort")
-    page = request.GET.get("page", 1)
-    selected_updated_date = None
-    selected_submitted_date = None
+    cursor = request.GET.get("cursor")
 
     can_view_archives = permissions.can_view_archived_submissions(request.user)
     can_access_drafts = permissions.can_access_drafts(request.user)
@@ -138,48 +134,10 @@ def submissions_all(
     if not can_access_drafts or not show_drafts:
         qs = qs.exclude_draft()
 
-    if "submitted" in search_filters:
-        qs, selected_submitted_date = apply_date_filter(
-            qs=qs, field="submit_time", values=search_filters["submitted"]
-        )
-
-    if "updated" in search_filters:
-        qs, selected_updated_date = apply_date_filter(
-            qs=qs, field="last_update", values=search_filters["updated"]
-        )
-
-    if "flagged" in search_filters:
-        if "@me" in search_filters["flagged"]:
-            qs = qs.flagged_by(request.user)
-        if "@staff" in search_filters["flagged"]:
-            qs = qs.flagged_staff()
-
-    if "lead" in search_filters:
-        if "@me" in search_filters["lead"]:
-            qs = qs.filter(lead=request.user).active().current()
-
-    if "reviewer" in search_filters:
-        if "@me" in search_filters["reviewer"]:
-            qs = qs.in_review_for(request.user)
-
-    if "reviewed-by" in search_filters:
-        if "@me" in search_filters["reviewed-by"]:
-            qs = qs.reviewed_by(request.user)
-
-    if "id" in search_filters:
-        qs = qs.filter(id__in=search_filters["id"])
-
-    if "is" in search_filters:
-        if "archived" in search_filters["is"]:
-            qs = qs.filter(is_archive=True)
-        if "open" in search_filters["is"]:
-            qs = qs.active().current()
-
-    if search_term:
-        query = SearchQuery(search_term, search_type="websearch")
-        rank_annotation = SearchRank(models.F("search_document"), query)
-        qs = qs.filter(search_document=query)
-        qs = qs.annotate(rank=rank_annotation)
+    planner = SubmissionSearchPlanner(search_query, request.user)
+    qs = planner.apply(qs)
+    selected_submitted_date = planner.selected_dates.get("submitted")
+    selected_updated_date = planner.selected_dates.get("updated")
 
     filter_extras = {
         "exclude": settings.SUBMISSIONS_TABLE_EXCLUDED_FIELDS,
@@ -197,15 +155,15 @@ def submissions_all(
 
     # Status Filter Options
     STATUS_MAP = dict(PHASES)
-    for row in qs.order_by().values("status").annotate(n=models.Count("status")):
-        phase = STATUS_MAP[row["status"]]
+    for status, n in cached_facet_counts(qs)["status"].items():
+        phase = STATUS_MAP[status]
         display_name = phase.display_name
         try:
             count = status_count_raw[display_name]["count"]
         except KeyError:
             count = 0
         status_count_raw[display_name] = {
-            "count": count + row["n"],
+            "count": count + n,
             "title": display_name,
             "bg_color": phase.bg_color,
             "slug": phase.display_slug,
@@ -238,7 +196,11 @@ def submissions_all(
         ]
     )
 
-    qs = filters.qs.for_table(request.user).prefetch_related("meta_terms")
+    qs = filters.qs.for_table(request.user).prefetch_related(
+        "meta_terms",
+        # Only whether there is a project is shown
+        Prefetch("projects", queryset=Project.objects.only("id", "submission_id")),
+    )
 
     sort_options_raw = {
         "submitted-desc": ("-submit_time", _("Newest")),
@@ -257,19 +219,26 @@ def submissions_all(
 
     if selected_sort and selected_sort in sort_options_raw.keys():
         if not search_query and selected_sort == "relevance-desc":
-            qs = qs.order_by("-submit_time")
+            ordering = "-submit_time"
         else:
-            qs = qs.order_by(sort_options_raw[selected_sort][0])
+            ordering = sort_options_raw[selected_sort][0]
     elif selected_sort in ["title-asc", "title-desc"]:
-        qs = qs.order_by(f"{'-' if selected_sort == 'title-desc' else ''}title")
-    elif search_term:
-        qs = qs.order_by("-rank")
+        ordering = f"{'-' if selected_sort == 'title-desc' else ''}title"
+    elif planner.text:
+        ordering = "-rank"
     else:
-        qs = qs.order_by("-submit_time")
+        ordering = "-submit_time"
+
+    # Ties are broken on the id, in the same direction as the sort
+    tie_breaker = "-id" if ordering.startswith("-") else "id"
+    paginator = KeysetPaginator(qs, [ordering, tie_breaker], per_page=60)
+    qs = qs.order_by(*paginator.ordering_expressions())
 
     end = time.time()
 
-    page = Paginator(qs, per_page=60, orphans=20).page(page)
+    page = paginator.page(cursor)
+    # The rows check permissions on each submission
+    permissions.prefetch_permission_data(request.user, page.object_list)
 
     # Pair the category ID with it's respective label
     selected_category_options = Option.objects.filter(
@@ -290,7 +259,8 @@ def submissions_all(
                 "submissions/partials/export-submission-button.html",
                 {
                     "generating": True,
-                    "poll_time": get_export_polling_time(len(qs_ids)),
+                    "poll_time": EXPORT_PROGRESS_POLL_TIME,
+                    "progress": 0,
                 },
             )
             response["HX-Trigger"] = json.dumps(
@@ -454,14 +424,14 @@ def bulk_update_submissions_status(request: HttpRequest) -> HttpResponse:
 
     submissions = ApplicationSubmission.objects.filter(id__in=submission_ids)
 
-    # should redirect
-    excluded = []
-    for submission in submissions:
-        if has_final_determination(submission):
-            excluded.append(submission)
-
     non_determine_states = set(transitions) - set(DETERMINATION_OUTCOMES.keys())
     if not any(non_determine_states):
+        # should redirect
+        excluded = [
+            submission
+            for submission in submissions
+            if has_final_determination(submission)
+        ]
         if excluded:
             messages.warning(
                 request,
@@ -496,25 +466,9 @@ def bulk_update_submissions_status(request: HttpRequest) -> HttpResponse:
         )
         return HttpResponseClientRefresh()
 
-    failed = []
-    phase_changes = {}
-    for submission in submissions:
-        valid_actions = {
-            action for action, _ in submission.get_actions_for_user(request.user)
-        }
-        old_phase = submission.phase
-        try:
-            transition = (valid_actions & set(transitions)).pop()
-            submission.perform_transition(
-                transition,
-                request.user,
-                request=request,
-                notify=False,
-            )
-        except (PermissionDenied, KeyError):
-            failed.append(submission)
-        else:
-            phase_changes[submission.id] = old_phase
+    failed, phase_changes = services.bulk_transition_submissions(
+        submissions, transitions, request.user, request
+    )
 
     if failed:
         messages.warning(
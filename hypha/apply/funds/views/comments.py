@@ -4,7 +4,6 @@ from django.core.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django_ratelimit.decorators import ratelimit
-from rolepermissions.checkers import has_object_permission
 
 from hypha.apply.activity.forms import CommentForm
 from hypha.apply.activity.messaging import MESSAGES, messenger
@@ -14,7 +13,10 @@ from hypha.apply.activity.services import (
     get_related_activities_for_user,
 )
 from hypha.apply.funds.models.submissions import ApplicationSubmission
-from hypha.apply.funds.permissions import user_can_view_post_comment_form
+from hypha.apply.funds.permissions import (
+    has_object_permission,
+    user_can_view_post_comment_form,
+)
 
 
 @login_required
@@ -5,8 +5,9 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.db.models import Q
-from django.http import Http404, HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.utils.cache import patch_cache_control
 from django.utils.text import slugify
 from django.views.decorators.http import require_http_methods
 from django_htmx.http import (
@@ -19,6 +20,7 @@ from hypha.apply.categories.models import MetaTerm, Option
 from hypha.apply.funds.forms import BatchUpdateReviewersForm
 from hypha.apply.funds.models.reviewer_role import ReviewerRole
 from hypha.apply.funds.models.screening import ScreeningStatus
+from hypha.apply.funds.models.submissions import get_actions_for_submissions
 from hypha.apply.funds.models.utils import (
     STATUS_ERROR,
     STATUS_GENERATING,
@@ -27,8 +29,8 @@ from hypha.apply.funds.models.utils import (
 )
 from hypha.apply.funds.permissions import has_permission
 from hypha.apply.funds.reviewers.services import get_all_reviewers
-from hypha.apply.funds.services import annotate_review_recommendation_and_count
 from hypha.apply.review.options import REVIEWER
+from hypha.apply.search.autocomplete import AUTOCOMPLETE_CACHE_TIMEOUT, autocomplete
 from hypha.apply.todo.options import DOWNLOAD_SUBMISSIONS_EXPORT
 from hypha.apply.todo.views import remove_tasks_of_related_obj_for_specific_code
 from hypha.apply.users.decorators import (
@@ -38,11 +40,12 @@ from hypha.apply.users.decorators import (
 from hypha.apply.users.roles import REVIEWER_GROUP_NAME
 
 from .. import services
+from ..facets import cached_facet_counts
 from ..models import ApplicationSubmission, Round
 from ..permissions import can_change_external_reviewers
 from ..utils import (
+    EXPORT_PROGRESS_POLL_TIME,
     check_submissions_same_determination_form,
-    get_export_polling_time,
     get_or_create_default_screening_statuses,
 )
 from ..workflows.constants import DETERMINATION_OUTCOMES
@@ -67,12 +70,17 @@ def partial_submission_lead(request, pk):
 def sub_menu_funds(request):
     selected_funds = request.GET.getlist("fund")
 
+    fund_counts = cached_facet_counts(ApplicationSubmission.objects.all())["fund"]
+
     # Funds Filter Options
     funds = [
-        {"id": f.id, "selected": str(f.id) in selected_funds, "title": f.title}
-        for f in Page.objects.filter(applicationsubmission__isnull=False)
-        .order_by("title")
-        .distinct()
+        {
+            "id": f.id,
+            "selected": str(f.id) in selected_funds,
+            "title": f.title,
+            "n": fund_counts[f.id],
+        }
+        for f in Page.objects.filter(id__in=fund_counts).order_by("title")
     ]
 
     ctx = {
@@ -98,9 +106,9 @@ def sub_menu_leads(
             "title": str(item),
             "slack": item.slack,
         }
-        for item in User.objects.filter(submission_lead__isnull=False)
-        .order_by()
-        .distinct()
+        for item in User.objects.filter(
+            id__in=cached_facet_counts(ApplicationSubmission.objects.all())["lead"]
+        )
     ]
 
     # show selected and current user first
@@ -138,9 +146,10 @@ def sub_menu_rounds(request):
     closed_rounds = [
         {"id": item.id, "selected": str(item.id) in selected_rounds, "title": str(item)}
         for item in qs.closed()
-        .filter(submissions__isnull=False)
+        .filter(
+            id__in=cached_facet_counts(ApplicationSubmission.objects.all())["round"]
+        )
         .order_by("-end_date")
-        .distinct()
     ]
 
     ctx = {
@@ -192,9 +201,7 @@ def sub_menu_meta_terms(request):
 
     terms_qs = MetaTerm.objects.filter(
         filter_on_dashboard=True,
-        id__in=ApplicationSubmission.objects.all()
-        .values("meta_terms__id")
-        .distinct("meta_terms__id"),
+        id__in=cached_facet_counts(ApplicationSubmission.objects.all())["meta_terms"],
     ).exclude(depth=1)
 
     meta_terms = [
@@ -243,6 +250,23 @@ def sub_menu_category_options(request):
     return render(request, "submissions/submenu/category.html", ctx)
 
 
+@login_required
+@user_passes_test(is_apply_staff)
+@require_http_methods(["GET"])
+def partial_search_autocomplete(request: HttpRequest) -> HttpResponse:
+    """Suggest submissions and projects while a search is typed in the submission list"""
+    search_query = request.GET.get("query", "").strip()
+    ctx = (
+        autocomplete(search_query, request.user)
+        if search_query
+        else {"submissions": [], "projects": []}
+    )
+
+    response = render(request, "submissions/partials/search-autocomplete.html", ctx)
+    patch_cache_control(response, private=True, max_age=AUTOCOMPLETE_CACHE_TIMEOUT)
+    return response
+
+
 @login_required
 @require_http_methods(["GET"])
 def partial_reviews_card(request: HttpRequest, pk: str) -> HttpResponse:
@@ -294,8 +318,7 @@ def partial_reviews_decisions(request: HttpRequest) -> HttpResponse:
     if submission_ids:
         submission_ids = [x for x in submission_ids.split(",") if x]
 
-    qs = ApplicationSubmission.objects.filter(id__in=submission_ids)
-    qs = annotate_review_recommendation_and_count(qs)
+    qs = ApplicationSubmission.objects.filter(id__in=submission_ids).with_summary()
 
     ctx = {
         "submissions": qs,
@@ -326,7 +349,7 @@ def sub_menu_update_status(request: HttpRequest) -> HttpResponse:
 
     allow_determination = check_submissions_same_determination_form(qs)
 
-    list_of_actions_list = [s.get_actions_for_user(request.user) for s in qs]
+    list_of_actions_list = get_actions_for_submissions(qs, request.user).values()
 
     action_names = [
         [
@@ -518,7 +541,8 @@ def submission_export_status(request: HttpRequest) -> HttpResponse:
             # If there's an existing/active export, show it's status
             status = export_manager.status
             if status == STATUS_GENERATING:
-                ctx["poll_time"] = get_export_polling_time(export_manager.total_export)  # type: ignore[arg-type]
+                ctx["poll_time"] = EXPORT_PROGRESS_POLL_TIME
+                ctx["progress"] = export_manager.progress
     else:
         ctx["not_async"] = True
 
@@ -541,16 +565,26 @@ def submission_export_status(request: HttpRequest) -> HttpResponse:
     return render(request, "submissions/partials/export-submission-button.html", ctx)
 
 
+def stream_export_file(export_manager: SubmissionExportManager):
+    """Yield the export file in chunks, deleting the export once it has been sent"""
+    try:
+        with export_manager.export_file.open("rb") as export_file:
+            yield from export_file.chunks()
+    finally:
+        export_manager.delete()
+
+
 def submission_export_download(request: HttpRequest) -> HttpResponse:
     export_manager = get_object_or_404(SubmissionExportManager, user=request.user)
-    if export_manager.status == "success":
-        response = HttpResponse(export_manager.export_data, content_type="text/csv")
+    if export_manager.status == "success" and export_manager.export_file:
+        response = StreamingHttpResponse(
+            stream_export_file(export_manager), content_type="text/csv"
+        )
         response["Content-Disposition"] = "attachment; filename=submissions.csv"
 
         remove_tasks_of_related_obj_for_specific_code(
             code=DOWNLOAD_SUBMISSIONS_EXPORT, related_obj=export_manager
         )
-        export_manager.delete()
 
         return response
 
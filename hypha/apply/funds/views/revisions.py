@@ -2,8 +2,10 @@ import re
 from typing import List
 
 import nh3
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
+from django.utils.translation import get_language
 from django.views.generic import (
     DetailView,
     ListView,
@@ -19,6 +21,10 @@ from ..models import (
     ApplicationSubmission,
 )
 
+# Seconds the comparison of two revisions is cached, revisions only change
+# while they are drafts
+COMPARE_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 def get_revisions(submission):
     """Get a queryset of all valid `ApplicationRevision`s that can be
@@ -65,7 +71,7 @@ class RevisionListView(ListView):
         self.queryset = (
             get_revisions(submission=self.submission)
             .select_related("author", "submission")
-            .defer("form_data", "submission__form_data")
+            .defer("snapshot", "delta", "submission__form_data")
         )
 
         return super().get_queryset()
@@ -131,9 +137,18 @@ class RevisionCompareView(DetailView):
     def get_context_data(self, **kwargs):
         from_revision = self.object.revisions.get(id=self.kwargs["from"])
         to_revision = self.object.revisions.get(id=self.kwargs["to"])
-        required_fields, stream_fields = self.compare_revisions(
-            from_revision, to_revision
+        key = "funds:revisions:compare:{}:{}:{}:{}:{}".format(
+            from_revision.id,
+            from_revision.timestamp.timestamp(),
+            to_revision.id,
+            to_revision.timestamp.timestamp(),
+            get_language(),
         )
+        comparison = cache.get(key)
+        if comparison is None:
+            comparison = self.compare_revisions(from_revision, to_revision)
+            cache.set(key, comparison, COMPARE_CACHE_TIMEOUT)
+        required_fields, stream_fields = comparison
         ctx = {
             "all_revisions": get_revisions(submission=self.object),
             "from_revision": from_revision,
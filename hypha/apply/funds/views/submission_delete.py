@@ -3,10 +3,10 @@ from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
 from django.utils.translation import gettext as _
 from django.views.generic import DeleteView
-from rolepermissions.checkers import has_object_permission
 
 from hypha.apply.activity.messaging import MESSAGES, messenger
 from hypha.apply.activity.models import Event
+from hypha.apply.funds.permissions import has_object_permission
 
 from ..models import AnonymizedSubmission, ApplicationSubmission
 from ..workflows.constants import DRAFT_STATE
@@ -57,7 +57,7 @@ COMMUNITY_REVIEW_PHASES = [
 PHASES_MAPPING = {
     "received": {
         "name": _("Received"),
-        "statuses": [INITIAL_STATE, "proposal_discussion"],
+        "statuses": frozenset([INITIAL_STATE, "proposal_discussion"]),
     },
     "internal-review": {
         "name": _("Internal Review"),
@@ -75,7 +75,7 @@ PHASES_MAPPING = {
     },
     "invited-for-proposal": {
         "name": _("Invited for Proposal"),
-        "statuses": ["draft_proposal"],
+        "statuses": frozenset(["draft_proposal"]),
     },
     "external-review": {
         "name": _("External Review"),
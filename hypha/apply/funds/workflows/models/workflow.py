@@ -1,7 +1,14 @@
 from collections import defaultdict
+from functools import cached_property
 
 
 class Workflow(dict):
+    """Phases of a workflow by name.
+
+    Workflows are defined once at import time and never change, the derived
+    structures below are only computed once.
+    """
+
     def __init__(self, name, admin_name, **data):
         self.name = name
         self.admin_name = admin_name
@@ -10,7 +17,7 @@ class Workflow(dict):
     def __str__(self):
         return self.name
 
-    @property
+    @cached_property
     def stages(self):
         stages = []
         for phase in self.values():
@@ -18,25 +25,30 @@ class Workflow(dict):
                 stages.append(phase.stage)
         return stages
 
-    @property
+    @cached_property
     def stepped_phases(self):
         phases = defaultdict(list)
         for phase in list(self.values()):
             phases[phase.step].append(phase)
-        return phases
+        return dict(phases)
+
+    @cached_property
+    def display_phases(self):
+        # The first phase of each step, it is the one displayed for the step
+        return tuple(phase for phase, *_ in self.stepped_phases.values())
 
     def phases_for(self, user=None):
         # Grab the first phase for each step - visible only, the display phase
         return [
             phase
-            for phase, *_ in self.stepped_phases.values()
+            for phase in self.display_phases
             if not user or phase.permissions.can_view(user)
         ]
 
     def previous_visible(self, current, user):
         """Find the latest phase that the user has view permissions for"""
         display_phase = self.stepped_phases[current.step][0]
-        phases = self.phases_for()
+        phases = self.display_phases
         index = phases.index(display_phase)
         for phase in phases[index - 1 :: -1]:
             if phase.permissions.can_view(user):
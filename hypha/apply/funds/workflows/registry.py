@@ -10,12 +10,14 @@ be fixed when streamfield, may require intermediate fix prior to launch]
 hypha/apply/funds/views.py and hypha/apply/review/views.py.
 """
 
+import functools
 import itertools
 from collections import defaultdict
 from typing import List
 
 from django.utils.translation import gettext_lazy as _
 
+from .constants import UserPermissions
 from .definitions.double_stage import DoubleStageDefinition
 from .definitions.single_stage import SingleStageDefinition
 from .definitions.single_stage_community import SingleStageCommunityDefinition
@@ -104,11 +106,73 @@ STATUSES = defaultdict(set)
 for key, value in PHASES:
     STATUSES[value.display_name].add(key)
 
-active_statuses = [
+active_statuses = frozenset(
     status
     for status, _ in PHASES
     if "accepted" not in status and "rejected" not in status and "invited" not in status
-]
+)
+
+# Lookup tables compiled from the workflows, so checks on a submission don't
+# have to walk its workflow
+
+# The phase of each status, by workflow name and status
+PHASE_LOOKUP = {
+    (workflow_name, phase_name): phase
+    for workflow_name, workflow in WORKFLOWS.items()
+    for phase_name, phase in workflow.items()
+}
+
+# Statuses in the last stage of each workflow
+FINAL_STAGE_STATUSES = {
+    workflow_name: frozenset(
+        phase_name
+        for phase_name, phase in workflow.items()
+        if phase.stage == workflow.stages[-1]
+    )
+    for workflow_name, workflow in WORKFLOWS.items()
+}
+
+# Every status with the name it is displayed with, for the status field choices
+STATUS_CHOICES = sorted(
+    {(phase_name, phase.display_name) for phase_name, phase in PHASES},
+    key=lambda choice: choice[0],
+)
+
+# Targets of the transitions each role may make, by workflow name, status and
+# role. Conditions on the transitions still have to be checked.
+ROLE_TRANSITIONS = {
+    (workflow_name, phase_name, role): frozenset(
+        target
+        for target, transition in phase.transitions.items()
+        if role in transition["permissions"]
+    )
+    for workflow_name, workflow in WORKFLOWS.items()
+    for phase_name, phase in workflow.items()
+    for role in UserPermissions
+}
+
+
+@functools.cache
+def get_transition_actions(workflow_name, status, roles):
+    """The transitions a user holding `roles` may start from `status`.
+
+    Memoized, there is a fixed number of workflows, statuses and role sets.
+
+    Returns:
+        tuple: (target, display, conditions) of each transition, in the order
+            of the transition methods. The conditions still have to be met.
+    """
+    phase = PHASE_LOOKUP.get((workflow_name, status))
+    if phase is None:
+        return ()
+    targets = set().union(
+        *(ROLE_TRANSITIONS[workflow_name, status, role] for role in roles)
+    )
+    return tuple(
+        (target, transition["display"], tuple(transition.get("conditions", ())))
+        for target, transition in phase.transitions.items()
+        if target in targets
+    )
 
 
 def get_review_active_statuses(user=None):
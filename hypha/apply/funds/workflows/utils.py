@@ -8,11 +8,11 @@ def phases_matching(phrase, exclude=None):
 
     if exclude is None:
         exclude = []
-    return [
+    return frozenset(
         status
         for status, _ in PHASES
         if status.endswith(phrase) and status not in exclude
-    ]
+    )
 
 
 def get_stage_change_actions():
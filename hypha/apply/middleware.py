@@ -3,6 +3,8 @@ from django.db.models.deletion import ProtectedError
 from django.http import HttpResponseRedirect
 from django.utils.translation import gettext as _
 
+from hypha.apply.funds.permissions import caching_permissions
+
 
 class HandleProtectionErrorMiddleware:
     def __init__(self, get_response):
@@ -23,3 +25,21 @@ class HandleProtectionErrorMiddleware:
     def __call__(self, request):
         response = self.get_response(request)
         return response
+
+
+class PermissionCacheMiddleware:
+    """Cache the permission checks made while handling a GET or HEAD request.
+
+    Pages check the same permissions many times, e.g. once per row of a list.
+    Other requests may change what the permissions depend on, so they check
+    every time.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return self.get_response(request)
+        with caching_permissions():
+            return self.get_response(request)
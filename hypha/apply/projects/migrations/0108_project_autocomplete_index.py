@@ -0,0 +1,54 @@
+import logging
+
+from django.db import DatabaseError, migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "application_projects_project_autocomplete"
+# Project title, the same expression the autocomplete queries
+EXPRESSION = "lower(title)"
+
+
+def create_index(apps, schema_editor):
+    """Create a trigram GIN index for the search autocomplete, installing
+    pg_trgm first if possible. Skipped, with a warning, where the extension
+    isn't available or can't be installed by the database user.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        installed = cursor.fetchone() is not None
+    if not installed:
+        try:
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DatabaseError:
+            logger.warning(
+                "pg_trgm is not available, skipping the %s index. Search "
+                "autocomplete will work, but slower.",
+                INDEX_NAME,
+            )
+            return
+
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON application_projects_project "
+        f"USING gin (({EXPRESSION}) gin_trgm_ops)"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("application_projects", "0107_invoiceexportmanager"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
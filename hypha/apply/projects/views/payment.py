@@ -29,6 +29,7 @@ from django_htmx.http import (
     HttpResponseClientRefresh,
 )
 from django_tables2 import SingleTableMixin
+from django_tables2.paginators import LazyPaginator
 from rolepermissions.checkers import has_object_permission
 
 from hypha.apply.activity.messaging import MESSAGES, messenger
@@ -646,6 +647,8 @@ class InvoiceListView(SingleTableMixin, FilterView, DelegateableListView):
     filterset_class = InvoiceListFilter
     model = Invoice
     table_class = AdminInvoiceListTable
+    # Skip the COUNT(*) of the whole filtered list on every page
+    paginator_class = LazyPaginator
     template_name = "application_projects/invoice_list.html"
 
     def get_queryset(self):
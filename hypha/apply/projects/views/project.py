@@ -32,6 +32,7 @@ from django_htmx.http import (
     HttpResponseClientRefresh,
 )
 from django_tables2 import SingleTableMixin
+from django_tables2.paginators import LazyPaginator
 from docx import Document
 from htmldocx import HtmlToDocx
 from rolepermissions.checkers import has_object_permission
@@ -2363,6 +2364,8 @@ class ProjectListView(SingleTableMixin, FilterView):
     filterset_class = ProjectListFilter
     queryset = Project.objects.for_table()
     table_class = ProjectsListTable
+    # Skip the COUNT(*) of the whole filtered list on every page
+    paginator_class = LazyPaginator
     template_name = "application_projects/project_list.html"
 
     excluded_fields = settings.PROJECTS_TABLE_EXCLUDED_FIELDS
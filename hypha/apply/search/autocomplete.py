@@ -0,0 +1,164 @@
+import hashlib
+from typing import List
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, TextField, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.fields.json import KeyTextTransform
+from django.urls import reverse
+from lark.exceptions import LarkError
+
+from hypha.apply.funds.models import ApplicationSubmission
+from hypha.apply.projects.models import Project
+from hypha.apply.search.planner import SubmissionSearchPlanner
+from hypha.apply.search.trigram import (
+    PROJECT_AUTOCOMPLETE_SQL,
+    SUBMISSION_AUTOCOMPLETE_SQL,
+    USER_AUTOCOMPLETE_SQL,
+    trigram_available,
+)
+
+User = get_user_model()
+
+AUTOCOMPLETE_LIMIT = 5
+
+# Seconds the suggestions for a query are cached, they only need to outlive typing
+AUTOCOMPLETE_CACHE_TIMEOUT = 30
+
+# Filters that also apply to projects, any other filter only matches submissions
+PROJECT_FILTERS = {"id", "lead"}
+
+_trigram_available = None
+
+
+def use_trigram() -> bool:
+    """Whether `pg_trgm` can rank the suggestions, checked once per process"""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = trigram_available(connection)
+    return _trigram_available
+
+
+def match_text(queryset, expression: str, text: str, also: Q = None):
+    """Filter `queryset` on the indexed autocomplete `expression` containing, or
+    with `pg_trgm` being similar to, `text`, the best matches first. Rows matching
+    `also` are included too.
+    """
+    text = text.lower()
+    queryset = queryset.annotate(
+        autocomplete_text=RawSQL(expression, (), output_field=TextField())
+    )
+    match = Q(autocomplete_text__contains=text)
+    if also is not None:
+        match |= also
+    prefix_first = Case(
+        When(autocomplete_text__startswith=text, then=Value(0)),
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+    if use_trigram():
+        return queryset.filter(
+            match | Q(autocomplete_text__trigram_word_similar=text)
+        ).order_by(
+            prefix_first,
+            TrigramWordSimilarity(Value(text), F("autocomplete_text")).desc(),
+            "-id",
+        )
+    return queryset.filter(match).order_by(prefix_first, "-id")
+
+
+def id_match(planner: SubmissionSearchPlanner) -> Q:
+    """Jump to an id typed without the "#" too"""
+    return Q(id=int(planner.text)) if planner.text.isdigit() else Q(pk__in=[])
+
+
+def autocomplete_submissions(planner: SubmissionSearchPlanner, limit: int) -> List:
+    conditions = planner.conditions()
+    if conditions is None:
+        return []
+
+    queryset = ApplicationSubmission.objects.current().exclude_draft()
+    if conditions:
+        queryset = queryset.filter(*conditions)
+    if planner.text:
+        queryset = match_text(
+            queryset, SUBMISSION_AUTOCOMPLETE_SQL, planner.text, also=id_match(planner)
+        )
+    else:
+        queryset = queryset.order_by("-submit_time")
+
+    return [
+        {
+            "type": "submission",
+            "id": submission["id"],
+            "title": submission["title"],
+            "reference": submission["public_id"] or f"#{submission['id']}",
+            "url": reverse("funds:submissions:detail", args=(submission["id"],)),
+        }
+        for submission in queryset.values(
+            "id", "public_id", title=KeyTextTransform("title", "form_data")
+        )[:limit]
+    ]
+
+
+def autocomplete_projects(planner: SubmissionSearchPlanner, limit: int) -> List:
+    if not settings.PROJECTS_ENABLED or set(planner.filters) - PROJECT_FILTERS:
+        return []
+
+    queryset = Project.objects.all()
+    if "id" in planner.filters:
+        queryset = queryset.filter(id__in=planner.filters["id"])
+    if "@me" in planner.filters.get("lead", []):
+        queryset = queryset.filter(lead=planner.user)
+    if planner.text:
+        applicants = match_text(User.objects.all(), USER_AUTOCOMPLETE_SQL, planner.text)
+        queryset = match_text(
+            queryset,
+            PROJECT_AUTOCOMPLETE_SQL,
+            planner.text,
+            also=Q(user__in=applicants.order_by().values("id")) | id_match(planner),
+        )
+    else:
+        queryset = queryset.order_by("-created_at")
+
+    return [
+        {
+            "type": "project",
+            "id": project["id"],
+            "title": project["title"],
+            "reference": f"#{project['id']}",
+            "url": reverse("apply:projects:detail", args=(project["id"],)),
+        }
+        for project in queryset.values("id", "title")[:limit]
+    ]
+
+
+def autocomplete(search_query: str, user, limit: int = AUTOCOMPLETE_LIMIT) -> dict:
+    """Suggest submissions and projects for a search being typed.
+
+    The query is parsed like the submission list search, so `#123` and filters
+    such as `lead:@me` narrow the suggestions. The free text is matched against
+    the id, title and applicant, partial words included. Suggestions are cached
+    per user and query.
+    """
+    search_query = " ".join(search_query.split())
+    digest = hashlib.md5(search_query.encode(), usedforsecurity=False).hexdigest()
+    key = f"search:autocomplete:{user.id}:{limit}:{digest}"
+
+    results = cache.get(key)
+    if results is None:
+        try:
+            planner = SubmissionSearchPlanner(search_query, user)
+        except LarkError:
+            # Half typed filters, e.g. "lead:", don't parse yet
+            return {"submissions": [], "projects": []}
+        results = {
+            "submissions": autocomplete_submissions(planner, limit),
+            "projects": autocomplete_projects(planner, limit),
+        }
+        cache.set(key, results, AUTOCOMPLETE_CACHE_TIMEOUT)
+    return results
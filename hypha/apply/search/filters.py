@@ -1,7 +1,8 @@
 import datetime as dt
-from typing import Tuple
+from typing import Optional, Tuple
 
 from django.db.models import Q, QuerySet
+from django.utils import timezone
 
 from hypha.apply.search.query_parser import tokenize_date_filter_value
 
@@ -13,68 +14,82 @@ def apply_date_filter(qs, field, values) -> Tuple[QuerySet, str]:
         tuple: the filtered queryset and the parsed date range in the format of `[YYYY-MM-DD start date]/[YYYY-MM-DD end date]`
 
     """
+    q_obj, date_range = date_filter_values_to_q_obj(field, values)
+    if q_obj is None:
+        return qs.none(), ""
+    return (qs.filter(q_obj), date_range)
+
+
+def date_filter_values_to_q_obj(field, values) -> Tuple[Optional[Q], str]:
+    """Combine a list of date strings into a single Q object on `field`.
+
+    Returns:
+        tuple: the Q object, or None if any of the dates is invalid, and the parsed date range as for `apply_date_filter`
+    """
     q_obj = Q()
 
     date_range = []
 
     for date_str in values:
         tokens = tokenize_date_filter_value(date_str)
-        date_range.append(f"{tokens[-3]}-{tokens[-2]:02}-{tokens[-1]:02}")
 
         if q := date_filter_tokens_to_q_obj(tokens=tokens, field=field):
             q_obj &= q
         else:
-            return qs.none()
+            return None, ""
+
+        date_range.append(date_str.lstrip("<>="))
 
-    return (qs.filter(q_obj), "/".join(date_range))
+    return q_obj, "/".join(date_range)
+
+
+def date_filter_period(tokens: list) -> Tuple[dt.datetime, dt.datetime]:
+    """The start and the (exclusive) end of the day, month or year given by date
+    tokens parsed using `tokenize_date_filter_value`, in the current time zone.
+    """
+    match tokens:
+        case [_, year, month, day]:
+            start = dt.date(year, month, day)
+            end = start + dt.timedelta(days=1)
+        case [_, year, month]:
+            start = dt.date(year, month, 1)
+            end = dt.date(year + month // 12, month % 12 + 1, 1)
+        case [_, year]:
+            start = dt.date(year, 1, 1)
+            end = dt.date(year + 1, 1, 1)
+        case _:
+            return None
+    return tuple(
+        timezone.make_aware(dt.datetime.combine(date, dt.time.min))
+        for date in (start, end)
+    )
 
 
 def date_filter_tokens_to_q_obj(tokens: list, field: str) -> Q:
     """Convert a date tokens parsed using `tokenize_date_filter_value` into a
     Q object that can be used to filter a queryset.
 
+    The filter compares the column itself against the bounds of the period, rather
+    than extracting the date, year or month from it, so an index on the column can
+    be used.
+
     Args:
     - tokens: A list of tokens parsed using `tokenize_date_filter_value`.
     - field: This should be the name of a DateTimeField.
     """
-    match tokens:
-        case [operator, year, month, day]:
-            if operator == ">=":
-                return Q(**{f"{field}__date__gte": dt.date(year, month, day)})
-            elif operator == "<=":
-                return Q(**{f"{field}__date__lte": dt.date(year, month, day)})
-            elif operator == ">":
-                return Q(**{f"{field}__date__gt": dt.date(year, month, day)})
-            elif operator == "<":
-                return Q(**{f"{field}__date__lt": dt.date(year, month, day)})
-            elif operator == "=":
-                return Q(**{f"{field}__date": dt.date(year, month, day)})
-            else:
-                return Q(**{f"{field}__date": dt.date(year, month, day)})
-        case [operator, year, month]:
-            if operator == ">=":
-                return Q(**{f"{field}__year__gte": year, f"{field}__month__gte": month})
-            elif operator == "<=":
-                return Q(**{f"{field}__year__lte": year, f"{field}__month__lte": month})
-            elif operator == ">":
-                return Q(**{f"{field}__year__gt": year, f"{field}__month__gt": month})
-            elif operator == "<":
-                return Q(**{f"{field}__year__lt": year, f"{field}__month__lt": month})
-            elif operator == "=":
-                return Q(**{f"{field}__year": year, f"{field}__month": month})
-            else:
-                return Q(**{f"{field}__year": year, f"{field}__month": month})
-        case [operator, year]:
-            if operator == ">=":
-                return Q(**{f"{field}__year__gte": year})
-            elif operator == "<=":
-                return Q(**{f"{field}__year__lte": year})
-            elif operator == ">":
-                return Q(**{f"{field}__year__gt": year})
-            elif operator == "<":
-                return Q(**{f"{field}__year__lt": year})
-            elif operator == "=":
-                return Q(**{f"{field}__year": year})
-            else:
-                return Q(**{f"{field}__year": year})
-    return None
+    period = date_filter_period(tokens)
+    if period is None:
+        return None
+    start, end = period
+
+    match tokens[0]:
+        case ">=":
+            return Q(**{f"{field}__gte": start})
+        case "<=":
+            return Q(**{f"{field}__lt": end})
+        case ">":
+            return Q(**{f"{field}__gte": end})
+        case "<":
+            return Q(**{f"{field}__lt": start})
+        case _:
+            return Q(**{f"{field}__gte": start, f"{field}__lt": end})
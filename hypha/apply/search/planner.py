@@ -0,0 +1,180 @@
+import re
+from typing import Dict, List, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Exists, F, OuterRef, Q, QuerySet
+
+from hypha.apply.flags.models import Flag
+from hypha.apply.funds.models import ApplicationSubmission, AssignedReviewers
+from hypha.apply.funds.workflows import active_statuses, get_review_active_statuses
+from hypha.apply.review.models import Review, ReviewOpinion
+from hypha.apply.review.options import AGREE
+from hypha.apply.search.filters import date_filter_values_to_q_obj
+from hypha.apply.search.query_parser import parse_search_query
+
+# Columns the date filters compare against, both are indexed
+DATE_FILTER_FIELDS = {
+    "submitted": "submit_time",
+    "updated": "list_summary__last_update",
+}
+
+
+class SubmissionSearchPlanner:
+    """Compile a search query into a single filter on a submission queryset.
+
+    The filters of the query are merged before anything is applied: all status
+    restrictions are intersected into one `status IN (...)` predicate, filters on
+    reviews, opinions and flags become `EXISTS` subqueries instead of joins that
+    would need a `DISTINCT`, and date filters compare the indexed columns against
+    the bounds of the period.
+
+    Usage:
+        planner = SubmissionSearchPlanner("lead:@me submitted:>2024-01 hello", user)
+        qs = planner.apply(ApplicationSubmission.objects.current())
+    """
+
+    def __init__(self, search_query: str, user):
+        parsed_query = parse_search_query(search_query)
+        self.text: str = parsed_query["text"]
+        self.filters: Dict[str, list] = parsed_query["filters"]
+        self.user = user
+        self.selected_dates: Dict[str, str] = {}
+
+    def _statuses(self) -> Optional[set]:
+        """The statuses allowed by every filter that limits them, None if none do"""
+        statuses = None
+
+        def restrict(allowed):
+            nonlocal statuses
+            statuses = set(allowed) if statuses is None else statuses & set(allowed)
+
+        if "@me" in self.filters.get("lead", []) or "open" in self.filters.get(
+            "is", []
+        ):
+            restrict(active_statuses)
+        if "@me" in self.filters.get("reviewer", []):
+            restrict(get_review_active_statuses(self.user))
+        return statuses
+
+    def _reviewer_conditions(self) -> List:
+        """Submissions assigned to the user and still waiting for their review"""
+        reviews_by_user = Review.objects.filter(
+            submission=OuterRef("pk"), author__reviewer=self.user
+        )
+        return [
+            Exists(
+                AssignedReviewers.objects.filter(
+                    submission=OuterRef("pk"), reviewer=self.user
+                )
+            ),
+            ~Exists(reviews_by_user) | Exists(reviews_by_user.filter(is_draft=True)),
+            ~Exists(
+                ReviewOpinion.objects.filter(
+                    review__submission=OuterRef("pk"),
+                    opinion=AGREE,
+                    author__reviewer=self.user,
+                )
+            ),
+        ]
+
+    def _flag_condition(self, **kwargs) -> Exists:
+        return Exists(
+            Flag.objects.filter(
+                target_content_type=ContentType.objects.get_for_model(
+                    ApplicationSubmission
+                ),
+                target_object_id=OuterRef("pk"),
+                **kwargs,
+            )
+        )
+
+    def conditions(self) -> Optional[List]:
+        """The predicates to filter on, or None if the query can't match anything"""
+        conditions = []
+
+        def add(condition):
+            if condition not in conditions:
+                conditions.append(condition)
+
+        statuses = self._statuses()
+        if statuses is not None:
+            add(Q(status__in=sorted(statuses)))
+
+        is_filters = self.filters.get("is", [])
+        if "@me" in self.filters.get("lead", []):
+            add(Q(lead=self.user))
+        if "@me" in self.filters.get("lead", []) or "open" in is_filters:
+            add(Q(is_archive=False, next__isnull=True))
+        if "archived" in is_filters:
+            add(Q(is_archive=True))
+
+        if "@me" in self.filters.get("reviewer", []):
+            for condition in self._reviewer_conditions():
+                add(condition)
+        if "@me" in self.filters.get("reviewed-by", []):
+            add(
+                Exists(
+                    Review.objects.filter(
+                        submission=OuterRef("pk"), author__reviewer=self.user
+                    )
+                )
+            )
+
+        flagged = self.filters.get("flagged", [])
+        if "@me" in flagged:
+            add(self._flag_condition(user=self.user, type=Flag.USER))
+        if "@staff" in flagged:
+            add(self._flag_condition(type=Flag.STAFF))
+
+        if "id" in self.filters:
+            add(Q(id__in=self.filters["id"]))
+
+        for name, field in DATE_FILTER_FIELDS.items():
+            if name in self.filters:
+                q_obj, date_range = date_filter_values_to_q_obj(
+                    field, self.filters[name]
+                )
+                if q_obj is None:
+                    return None
+                self.selected_dates[name] = date_range
+                add(q_obj)
+
+        return conditions
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        """Filter `queryset` on the query, annotating the `rank` of full text matches"""
+        conditions = self.conditions()
+        if conditions is None:
+            return queryset.none()
+
+        if self.text:
+            search_query = SearchQuery(self.text, search_type="websearch")
+            conditions.append(Q(search_document=search_query))
+            queryset = queryset.annotate(
+                rank=SearchRank(F("search_document"), search_query)
+            )
+
+        if conditions:
+            queryset = queryset.filter(*conditions)
+        return queryset
+
+    def explain(self, queryset: QuerySet, limit: Optional[int] = None) -> dict:
+        """Run the search on `queryset` under `EXPLAIN ANALYZE`, optionally only
+        fetching the first `limit` rows like a page of results would.
+
+        Returns:
+            dict: the Postgres plan, and the planning and execution time in milliseconds
+        """
+        queryset = self.apply(queryset)
+        if limit:
+            queryset = queryset[:limit]
+        plan = queryset.explain(analyze=True, buffers=True)
+        timings = {
+            key: float(match.group(1)) if match else None
+            for key, match in (
+                ("planning_time", re.search(r"Planning Time: ([\d.]+) ms", plan)),
+                ("execution_time", re.search(r"Execution Time: ([\d.]+) ms", plan)),
+            )
+        }
+        return {"plan": plan, **timings}
@@ -0,0 +1,117 @@
+from importlib import import_module
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from hypha.apply.funds.tests.factories import ApplicationSubmissionFactory
+from hypha.apply.projects.tests.factories import ProjectFactory
+from hypha.apply.users.tests.factories import (
+    ApplicantFactory,
+    ReviewerFactory,
+    StaffFactory,
+)
+
+from ..autocomplete import autocomplete
+from ..trigram import (
+    PROJECT_AUTOCOMPLETE_SQL,
+    SUBMISSION_AUTOCOMPLETE_SQL,
+    USER_AUTOCOMPLETE_SQL,
+)
+
+
+def ids(results, kind="submissions"):
+    return [item["id"] for item in results[kind]]
+
+
+class TestAutocomplete(TestCase):
+    def setUp(self):
+        self.user = StaffFactory()
+        self.submission = ApplicationSubmissionFactory(
+            form_data__title="Decentralised mesh networking",
+            user__email="ada@example.org",
+            lead=self.user,
+        )
+        self.other = ApplicationSubmissionFactory(form_data__title="Mesh radios")
+
+    def test_matches_partial_words(self):
+        self.assertEqual(ids(autocomplete("centrali", self.user)), [self.submission.id])
+        self.assertEqual(
+            ids(autocomplete("MESH", self.user)), [self.other.id, self.submission.id]
+        )
+
+    def test_prefix_matches_first(self):
+        results = autocomplete("mesh", self.user)
+        self.assertEqual(results["submissions"][0]["id"], self.other.id)
+
+    def test_matches_applicant_email(self):
+        self.assertEqual(ids(autocomplete("ada@exa", self.user)), [self.submission.id])
+
+    def test_id_jump(self):
+        self.assertEqual(
+            ids(autocomplete(f"#{self.other.id}", self.user)), [self.other.id]
+        )
+        self.assertIn(self.other.id, ids(autocomplete(str(self.other.id), self.user)))
+
+    def test_filters(self):
+        self.assertEqual(
+            ids(autocomplete("lead:@me mesh", self.user)), [self.submission.id]
+        )
+
+    def test_half_typed_filter(self):
+        self.assertEqual(
+            autocomplete("lead:", self.user), {"submissions": [], "projects": []}
+        )
+
+    def test_projects_match_applicant(self):
+        applicant = ApplicantFactory(full_name="Grace Hopper")
+        project = ProjectFactory(title="Compilers", user=applicant)
+
+        self.assertEqual(ids(autocomplete("hopp", self.user), "projects"), [project.id])
+        self.assertEqual(
+            ids(autocomplete("compil", self.user), "projects"), [project.id]
+        )
+        # Submission only filters leave projects out
+        self.assertEqual(
+            ids(autocomplete("reviewer:@me compil", self.user), "projects"), []
+        )
+
+
+class TestAutocompleteView(TestCase):
+    url = reverse("apply:submissions:search-autocomplete")
+
+    def test_staff_get_suggestions(self):
+        submission = ApplicationSubmissionFactory(form_data__title="Mesh radios")
+        self.client.force_login(StaffFactory())
+
+        response = self.client.get(self.url, {"query": "radio"})
+
+        self.assertContains(response, submission.get_absolute_url())
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_reviewers_cannot_use(self):
+        self.client.force_login(ReviewerFactory())
+
+        response = self.client.get(self.url, {"query": "radio"})
+
+        self.assertNotEqual(response.status_code, 200)
+
+
+class TestTrigramIndexes(SimpleTestCase):
+    def test_queries_match_indexed_expressions(self):
+        # Postgres only uses an index for the exact expression it was built on
+        for migration, expression in [
+            (
+                "hypha.apply.funds.migrations.0141_submission_autocomplete_index",
+                SUBMISSION_AUTOCOMPLETE_SQL,
+            ),
+            (
+                "hypha.apply.projects.migrations.0108_project_autocomplete_index",
+                PROJECT_AUTOCOMPLETE_SQL,
+            ),
+            (
+                "hypha.apply.users.migrations.0031_user_autocomplete_index",
+                USER_AUTOCOMPLETE_SQL,
+            ),
+        ]:
+            with self.subTest(migration=migration):
+                self.assertEqual(import_module(migration).EXPRESSION, expression)
@@ -2,44 +2,69 @@ import datetime as dt
 
 import pytest
 from django.db.models import Q
+from django.utils import timezone
 
 from ..filters import date_filter_tokens_to_q_obj
 
 
+def start_of(*date):
+    return timezone.make_aware(dt.datetime(*date))
+
+
 @pytest.mark.parametrize(
     "tokens, field, expected",
     [
         (
             [">", 2023, 12, 2],
             "date_field",
-            Q(date_field__date__gt=dt.date(2023, 12, 2)),
+            Q(date_field__gte=start_of(2023, 12, 3)),
         ),
         (
             [">=", 2023, 12, 2],
             "date_field",
-            Q(date_field__date__gte=dt.date(2023, 12, 2)),
+            Q(date_field__gte=start_of(2023, 12, 2)),
         ),
         (
             ["<=", 2023, 12, 2],
             "date_field",
-            Q(date_field__date__lte=dt.date(2023, 12, 2)),
+            Q(date_field__lt=start_of(2023, 12, 3)),
+        ),
+        (
+            [None, 2023, 12, 2],
+            "date_field",
+            Q(
+                date_field__gte=start_of(2023, 12, 2),
+                date_field__lt=start_of(2023, 12, 3),
+            ),
         ),
-        ([None, 2023, 12, 2], "date_field", Q(date_field__date=dt.date(2023, 12, 2))),
         (
             [None, 2023, 12],
             "date_field",
-            Q(date_field__month=12) & Q(date_field__year=2023),
+            Q(
+                date_field__gte=start_of(2023, 12, 1),
+                date_field__lt=start_of(2024, 1, 1),
+            ),
         ),
         (
             [">", 2023, 12],
             "date_field",
-            Q(date_field__month__gt=12) & Q(date_field__year__gt=2023),
+            Q(date_field__gte=start_of(2024, 1, 1)),
+        ),
+        (
+            ["<", 2023, 2],
+            "date_field",
+            Q(date_field__lt=start_of(2023, 2, 1)),
+        ),
+        ([">", 2023], "date_field", Q(date_field__gte=start_of(2024, 1, 1))),
+        (["<", 2023], "date_field", Q(date_field__lt=start_of(2023, 1, 1))),
+        (
+            [None, 2023],
+            "date_field",
+            Q(
+                date_field__gte=start_of(2023, 1, 1),
+                date_field__lt=start_of(2024, 1, 1),
+            ),
         ),
-        ([">", 2023], "date_field", Q(date_field__year__gt=2023)),
-        (["<", 2023], "date_field", Q(date_field__year__lt=2023)),
-        ([None, 2023], "date_field", Q(date_field__year=2023)),
-        ([None, 2023], "date_field", Q(date_field__year=2023)),
-        ([], "date_field", None),
         ([], "date_field", None),
     ],
 )
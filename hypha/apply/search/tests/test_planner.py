@@ -0,0 +1,78 @@
+import datetime as dt
+
+from django.test import TestCase
+from django.utils import timezone
+
+from hypha.apply.flags.models import Flag
+from hypha.apply.funds.models import ApplicationSubmission
+from hypha.apply.funds.tests.factories import (
+    ApplicationSubmissionFactory,
+    AssignedReviewersFactory,
+)
+from hypha.apply.review.tests.factories import ReviewFactory
+from hypha.apply.users.tests.factories import StaffFactory
+
+from ..planner import SubmissionSearchPlanner
+
+
+class TestSubmissionSearchPlanner(TestCase):
+    def setUp(self):
+        self.user = StaffFactory()
+        self.submission = ApplicationSubmissionFactory(lead=self.user)
+        self.other = ApplicationSubmissionFactory()
+
+    def search(self, query):
+        return SubmissionSearchPlanner(query, self.user).apply(
+            ApplicationSubmission.objects.all()
+        )
+
+    def test_lead_and_open_merge_into_one_status_filter(self):
+        qs = self.search("lead:@me is:open")
+
+        self.assertEqual(list(qs), [self.submission])
+        self.assertEqual(str(qs.query).count('"status" IN'), 1)
+
+    def test_reviewer_matches_in_review_for(self):
+        AssignedReviewersFactory(submission=self.submission, reviewer=self.user)
+        AssignedReviewersFactory(submission=self.other, reviewer=self.user)
+        ReviewFactory(submission=self.other, author__reviewer=self.user)
+
+        qs = self.search("reviewer:@me")
+
+        self.assertQuerySetEqual(
+            qs,
+            ApplicationSubmission.objects.in_review_for(self.user),
+            ordered=False,
+        )
+        self.assertEqual(list(qs), [self.submission])
+        self.assertNotIn("DISTINCT", str(qs.query))
+
+    def test_flagged_and_reviewed_by(self):
+        Flag.objects.create(target=self.other, user=self.user, type=Flag.USER)
+        ReviewFactory(submission=self.other, author__reviewer=self.user)
+
+        self.assertEqual(list(self.search("flagged:@me reviewed-by:@me")), [self.other])
+
+    def test_date_filters_use_the_column(self):
+        self.other.submit_time = timezone.now() - dt.timedelta(days=400)
+        self.other.save()
+        last_year = self.other.submit_time.year
+
+        planner = SubmissionSearchPlanner(f"submitted:<={last_year}", self.user)
+        qs = planner.apply(ApplicationSubmission.objects.all())
+
+        self.assertEqual(list(qs), [self.other])
+        self.assertEqual(planner.selected_dates, {"submitted": str(last_year)})
+        self.assertNotIn("EXTRACT", str(qs.query))
+
+    def test_invalid_date_matches_nothing(self):
+        self.assertFalse(self.search("submitted:2023-13-45").exists())
+
+    def test_explain(self):
+        result = SubmissionSearchPlanner("lead:@me hello", self.user).explain(
+            ApplicationSubmission.objects.all(), limit=10
+        )
+
+        self.assertIn("Limit", result["plan"])
+        self.assertIsNotNone(result["execution_time"])
+        self.assertIsNotNone(result["planning_time"])
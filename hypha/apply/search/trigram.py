@@ -0,0 +1,32 @@
+"""
+Trigram indexes backing the search autocomplete.
+
+`pg_trgm` isn't available on every Postgres install, so the indexes are created
+by migrations only when the extension can be. The autocomplete works without
+them, a `LIKE '%term%'` is then a sequential scan.
+
+The queries must use exactly the expressions below for Postgres to match them to
+the indexes. The migrations creating the indexes hold their own copy.
+"""
+
+# Submission id, title and applicant, funds_applicationsubmission
+SUBMISSION_AUTOCOMPLETE_SQL = (
+    "lower(coalesce(public_id, '') || ' ' || coalesce(form_data ->> 'title', '')"
+    " || ' ' || coalesce(form_data ->> 'full_name', '')"
+    " || ' ' || coalesce(form_data ->> 'email', ''))"
+)
+
+# Project title, application_projects_project
+PROJECT_AUTOCOMPLETE_SQL = "lower(title)"
+
+# Name and email, users_user
+USER_AUTOCOMPLETE_SQL = "lower(coalesce(full_name, '') || ' ' || email)"
+
+
+def trigram_available(connection) -> bool:
+    """Whether `pg_trgm` is installed in the database"""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
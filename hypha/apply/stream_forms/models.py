@@ -19,6 +19,7 @@ from .blocks import (
     TextFieldBlock,
 )
 from .forms import BlockFieldWrapper, PageStreamBaseForm
+from .schema import StreamFormSchema, form_schema_cache
 
 
 class BaseStreamForm:
@@ -63,12 +64,8 @@ class BaseStreamForm:
             Deserialized form data
         """
         data = form_data.copy()
-        # PERFORMANCE NOTE:
-        # Do not attempt to iterate over form_fields - that will fully instantiate the form_fields
-        # including any sub queries that they do
-        for _i, field_data in enumerate(form_fields.raw_data):
-            block = form_fields.stream_block.child_blocks[field_data["type"]]
-            field_id = field_data.get("id")
+        schema = form_schema_cache.get(form_fields, StreamFormSchema)
+        for field_id, block in schema.field_blocks:
             try:
                 value = data[field_id]
             except KeyError:
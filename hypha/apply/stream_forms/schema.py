@@ -0,0 +1,106 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Attribute used to remember the content key on a form_fields StreamValue
+SCHEMA_KEY_ATTRIBUTE = "_form_schema_key"
+
+
+def form_fields_key(form_fields):
+    """Return a content key for a form_fields StreamValue.
+
+    Submissions copy their form definition from the round/lab form, so many
+    rows share identical `form_fields`. The key combines the block types of
+    the stream with a hash of its raw data and is remembered on the
+    StreamValue, so it is only computed once per loaded instance. A new key is
+    computed when `form_fields` is assigned a new value.
+    """
+    try:
+        return getattr(form_fields, SCHEMA_KEY_ATTRIBUTE)
+    except AttributeError:
+        pass
+
+    stream_block = form_fields.stream_block
+    block_types = tuple(
+        (name, type(block)) for name, block in stream_block.child_blocks.items()
+    )
+    content = json.dumps(
+        list(form_fields.raw_data), sort_keys=True, cls=DjangoJSONEncoder
+    )
+    key = (
+        type(stream_block),
+        block_types,
+        hashlib.blake2b(content.encode(), digest_size=16).hexdigest(),
+    )
+    setattr(form_fields, SCHEMA_KEY_ATTRIBUTE, key)
+    return key
+
+
+class FormSchemaCache:
+    """Process wide LRU cache of objects compiled from form_fields.
+
+    `compiler` is any callable taking a form_fields StreamValue, its result
+    is shared between every instance with the same form definition and must
+    be treated as read only.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, form_fields, compiler):
+        key = (compiler, form_fields_key(form_fields))
+        with self._lock:
+            try:
+                schema = self._entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return schema
+
+        schema = compiler(form_fields)
+
+        with self._lock:
+            self._entries[key] = schema
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return schema
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+class StreamFormSchema:
+    """The block used to decode each stored answer, by field id."""
+
+    def __init__(self, form_fields):
+        # PERFORMANCE NOTE:
+        # Do not attempt to iterate over form_fields - that will fully instantiate the form_fields
+        # including any sub queries that they do
+        child_blocks = form_fields.stream_block.child_blocks
+        self.field_blocks = tuple(
+            (field_data["id"], child_blocks[field_data["type"]])
+            for field_data in form_fields.raw_data
+            if field_data.get("id")
+        )
+
+
+form_schema_cache = FormSchemaCache(maxsize=settings.FORM_SCHEMA_CACHE_SIZE)
@@ -1,7 +1,12 @@
+import json
+from unittest.mock import Mock, patch
+
 from django.test import TestCase
 from faker import Faker
+from wagtail.blocks import StreamValue
 
-from .blocks import FormFieldBlock, FormFieldsBlock
+from .blocks import CharFieldBlock, FormFieldBlock, FormFieldsBlock
+from .schema import CacheInfo, FormSchemaCache, StreamFormSchema, form_fields_key
 
 fake = Faker()
 
@@ -13,3 +18,65 @@ class TestBlocks(TestCase):
                 with self.subTest(block=block.__class__.__name__):
                     value = block.decode(None)
                     self.assertIsNone(value)
+
+
+def form_fields_value(*labels):
+    raw_data = [
+        {"type": "char", "id": f"field-{i}", "value": {"field_label": label}}
+        for i, label in enumerate(labels)
+    ]
+    return StreamValue(FormFieldsBlock(), raw_data, is_lazy=True)
+
+
+class TestFormSchemaCache(TestCase):
+    def setUp(self):
+        self.cache = FormSchemaCache(maxsize=2)
+        self.compiler = Mock(side_effect=StreamFormSchema)
+
+    def test_same_form_fields_compiled_once(self):
+        first = self.cache.get(form_fields_value("Name", "Age"), self.compiler)
+        second = self.cache.get(form_fields_value("Name", "Age"), self.compiler)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.compiler.call_count, 1)
+        self.assertEqual(self.cache.cache_info(), CacheInfo(1, 1, 2, 1))
+
+    def test_different_form_fields_compiled_separately(self):
+        first = self.cache.get(form_fields_value("Name"), self.compiler)
+        second = self.cache.get(form_fields_value("Title"), self.compiler)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.cache.cache_info(), CacheInfo(0, 2, 2, 2))
+
+    def test_least_recently_used_evicted(self):
+        self.cache.get(form_fields_value("One"), self.compiler)
+        self.cache.get(form_fields_value("Two"), self.compiler)
+        self.cache.get(form_fields_value("One"), self.compiler)
+        self.cache.get(form_fields_value("Three"), self.compiler)
+        self.assertEqual(self.cache.cache_info().currsize, 2)
+
+        self.cache.get(form_fields_value("One"), self.compiler)
+        self.assertEqual(self.compiler.call_count, 3)
+        self.cache.get(form_fields_value("Two"), self.compiler)
+        self.assertEqual(self.compiler.call_count, 4)
+
+    def test_cache_clear(self):
+        self.cache.get(form_fields_value("Name"), self.compiler)
+        self.cache.cache_clear()
+        self.assertEqual(self.cache.cache_info(), CacheInfo(0, 0, 2, 0))
+
+    def test_key_remembered_on_form_fields(self):
+        form_fields = form_fields_value("Name")
+        with patch(
+            "hypha.apply.stream_forms.schema.json.dumps", wraps=json.dumps
+        ) as dumps:
+            self.assertEqual(form_fields_key(form_fields), form_fields_key(form_fields))
+        self.assertEqual(dumps.call_count, 1)
+
+    def test_stream_form_schema_maps_ids_to_blocks(self):
+        schema = StreamFormSchema(form_fields_value("Name", "Age"))
+        self.assertEqual(
+            [field_id for field_id, _block in schema.field_blocks],
+            ["field-0", "field-1"],
+        )
+        self.assertIsInstance(schema.field_blocks[0][1], CharFieldBlock)
@@ -1,4 +1,4 @@
-import copy
+from types import MappingProxyType
 
 from django.utils.translation import gettext_lazy as _
 
@@ -250,6 +250,11 @@ template_map = {
     },
 }
 
+# Read only, each task is rendered into a new dict
+template_map = MappingProxyType(
+    {code: MappingProxyType(template) for code, template in template_map.items()}
+)
+
 
 def get_task_template(request, task, **kwargs):
     related_obj = task.related_object
@@ -258,9 +263,8 @@ def get_task_template(request, task, **kwargs):
     if not related_obj:
         return None
 
-    templates = copy.deepcopy(template_map)
     try:
-        template = templates[code]
+        template = template_map[code]
     except KeyError:
         # Unregistered code
         return None
@@ -275,11 +279,12 @@ def get_task_template(request, task, **kwargs):
             template_kwargs["msg"] = message[:57] + "…"
         else:
             template_kwargs["msg"] = message
-    template["text"] = template["text"].format(**template_kwargs)
-    template["url"] = template["url"].format(**template_kwargs)
-
-    # additional field
-    template["id"] = task.id
-    template["user"] = task.user
-    template["created_at"] = task.created_at
-    return template
+    return {
+        **template,
+        "text": template["text"].format(**template_kwargs),
+        "url": template["url"].format(**template_kwargs),
+        # additional field
+        "id": task.id,
+        "user": task.user,
+        "created_at": task.created_at,
+    }
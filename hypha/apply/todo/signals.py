@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from .views import invalidate_task_lists
+
+User = get_user_model()
+
+
+@receiver(signal=m2m_changed, sender=User.groups.through)
+def invalidate_task_lists_for_groups(
+    sender, instance=None, action=None, reverse=False, **kwargs
+):
+    """The group tasks listed for a user follow the groups of the user"""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if reverse:
+        # The users of a group changed
+        invalidate_task_lists()
+    else:
+        invalidate_task_lists(instance)
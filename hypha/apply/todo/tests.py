@@ -1,5 +1,6 @@
 from django.contrib.auth.models import Group
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
 
 from hypha.apply.activity.tests.factories import ActivityFactory
 from hypha.apply.determinations.tests.factories import DeterminationFactory
@@ -34,15 +35,18 @@ from .options import (
     REPORT_DUE,
     REVIEW_DRAFT,
     SUBMISSION_DRAFT,
+    get_task_template,
 )
 from .views import (
     add_task_to_user,
     add_task_to_user_group,
     get_tasks_for_user,
+    prefetch_related_objects_of_tasks,
     remove_tasks_for_user,
     remove_tasks_for_user_group,
     remove_tasks_of_related_obj,
     remove_tasks_of_related_obj_for_specific_code,
+    render_task_templates_for_user,
 )
 
 
@@ -390,6 +394,90 @@ class TestTaskListView(BaseViewTestCase):
         self.assertEqual(Task.objects.all().count(), 0)
 
 
+class TestRenderTaskTemplates(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.staff_user = StaffFactory()
+        cls.project = ProjectFactory()
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/")
+
+    def test_related_objects_fetched_per_type(self):
+        add_task_to_user(
+            SUBMISSION_DRAFT, self.staff_user, ApplicationSubmissionFactory()
+        )
+        add_task_to_user(REVIEW_DRAFT, self.staff_user, ReviewFactory())
+        add_task_to_user(
+            COMMENT_TASK, self.staff_user, ActivityFactory(source=self.project)
+        )
+        for invoice in InvoiceFactory.create_batch(3):
+            add_task_to_user(INVOICE_WAITING_PAID, self.staff_user, invoice)
+        # Warm the content type cache
+        prefetch_related_objects_of_tasks(list(get_tasks_for_user(self.staff_user)))
+        tasks = list(get_tasks_for_user(self.staff_user))
+
+        # One query per type of related object, and one for the source of the
+        # comment
+        with self.assertNumQueries(5):
+            prefetch_related_objects_of_tasks(tasks)
+            for task in tasks:
+                get_task_template(self.request, task)
+
+    def test_task_list_cached(self):
+        add_task_to_user(PROJECT_WAITING_INVOICE, self.staff_user, self.project)
+        self.assertEqual(
+            len(render_task_templates_for_user(self.request, self.staff_user)), 1
+        )
+
+        # Created without the task API, so the cached list is kept
+        Task.objects.create(
+            code=PROJECT_WAITING_PF, user=self.staff_user, related_object=self.project
+        )
+        self.assertEqual(
+            len(render_task_templates_for_user(self.request, self.staff_user)), 1
+        )
+
+        remove_tasks_for_user(PROJECT_WAITING_INVOICE, self.staff_user, self.project)
+        tasks = render_task_templates_for_user(self.request, self.staff_user)
+        self.assertEqual(
+            [task["id"] for task in tasks],
+            [Task.objects.get(code=PROJECT_WAITING_PF).id],
+        )
+
+    def test_group_tasks_clear_cached_lists(self):
+        self.assertEqual(
+            render_task_templates_for_user(self.request, self.staff_user), []
+        )
+
+        add_task_to_user_group(
+            PROJECT_WAITING_PF,
+            Group.objects.filter(name=STAFF_GROUP_NAME),
+            self.project,
+        )
+
+        self.assertEqual(
+            len(render_task_templates_for_user(self.request, self.staff_user)), 1
+        )
+
+    def test_group_membership_clears_cached_list(self):
+        add_task_to_user_group(
+            PROJECT_WAITING_PF,
+            Group.objects.filter(name=CONTRACTING_GROUP_NAME),
+            self.project,
+        )
+        user = ContractingFactory()
+        self.assertEqual(len(render_task_templates_for_user(self.request, user)), 1)
+
+        user.groups.add(Group.objects.get(name=STAFF_GROUP_NAME))
+        self.assertEqual(render_task_templates_for_user(self.request, user), [])
+
+        Group.objects.get(name=STAFF_GROUP_NAME).user_set.remove(user)
+        self.assertEqual(len(render_task_templates_for_user(self.request, user)), 1)
+
+
 class TestTaskManualRemovalView(BaseViewTestCase):
     base_view_name = "delete"
     url_name = "todo:{}"
@@ -1,9 +1,16 @@
+import time
+
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count
+from django.db.models import Count, Q, prefetch_related_objects
 from django.shortcuts import get_object_or_404, render
 from django.utils.decorators import method_decorator
+from django.utils.translation import get_language
 from django.utils.translation import gettext as _
 from django.views.generic import ListView, View
 from django_htmx.http import trigger_client_event
@@ -15,6 +22,8 @@ from .models import Task
 from .options import get_task_template
 from .services import validate_user_groups_uniqueness, validate_user_uniqueness
 
+TASK_LISTS_VERSION_KEY = "todo:tasks:version"
+
 
 @method_decorator(staff_required, name="dispatch")
 class TodoListView(ListView):
@@ -63,6 +72,7 @@ class TaskRemovalView(View):
             source=source,
             related=self.task,
         )
+        invalidate_task_lists(self.task.user)
         self.task.delete()
         tasks = render_task_templates_for_user(self.request, self.request.user)
         response = render(
@@ -88,6 +98,7 @@ def add_task_to_user(code, user, related_obj):
     )
     if user_uniqueness:
         task = Task.objects.create(code=code, user=user, related_object=related_obj)
+        invalidate_task_lists(user)
         return task
     return None
 
@@ -108,6 +119,7 @@ def add_task_to_user_group(code, user_group, related_obj):
         task = Task.objects.create(code=code, related_object=related_obj)
         groups = [Group.objects.filter(id=group.id).first() for group in user_group]
         task.user_group.add(*groups)
+        invalidate_task_lists()
         return task
     return None
 
@@ -129,6 +141,7 @@ def remove_tasks_for_user(code, user, related_obj):
     ).first()
     if task:
         task.delete()
+        invalidate_task_lists(user)
     return None
 
 
@@ -155,6 +168,7 @@ def remove_tasks_for_user_group(code, user_group, related_obj):
         )
     if user_group_matching_tasks.exists():
         user_group_matching_tasks.delete()
+        invalidate_task_lists()
     return None
 
 
@@ -170,6 +184,7 @@ def remove_tasks_of_related_obj_for_specific_code(code, related_obj):
         related_content_type=ContentType.objects.get_for_model(related_obj).id,
         related_object_id=related_obj.id,
     ).delete()
+    invalidate_task_lists()
     return None
 
 
@@ -183,20 +198,85 @@ def remove_tasks_of_related_obj(related_obj):
         related_content_type=ContentType.objects.get_for_model(related_obj).id,
         related_object_id=related_obj.id,
     ).delete()
+    invalidate_task_lists()
     return None
 
 
 def get_tasks_for_user(user):
-    user_tasks = Task.objects.filter(user=user).annotate(
-        group_count=Count("user_group")
+    """The tasks assigned to the user, and to exactly the groups of the user"""
+    group_ids = list(user.groups.values_list("id", flat=True))
+    return (
+        Task.objects.annotate(
+            group_count=Count("user_group", distinct=True),
+            matching_group_count=Count(
+                "user_group", filter=Q(user_group__in=group_ids), distinct=True
+            ),
+        )
+        .filter(
+            Q(user=user)
+            | Q(group_count=len(group_ids), matching_group_count=len(group_ids))
+        )
+        .select_related("user")
+        .order_by("-created_at")
     )
-    user_group_tasks = Task.objects.annotate(group_count=Count("user_group")).filter(
-        group_count=user.groups.count()
+
+
+def prefetch_related_objects_of_tasks(tasks):
+    """Fetch the related objects of the tasks, and what their task texts show,
+    with one query per type of object.
+    """
+    ApplicationSubmission = apps.get_model("funds", "ApplicationSubmission")
+    Project = apps.get_model("application_projects", "Project")
+    sources = [
+        ApplicationSubmission.objects.select_related("page"),
+        Project.objects.select_related("submission__page"),
+    ]
+    prefetch_related_objects(
+        tasks,
+        GenericPrefetch(
+            "related_object",
+            [
+                *sources,
+                apps.get_model(
+                    "application_projects", "Invoice"
+                ).objects.select_related("project__submission__page"),
+                apps.get_model("project_reports", "Report").objects.select_related(
+                    "project__submission__page"
+                ),
+                apps.get_model(
+                    "determinations", "Determination"
+                ).objects.select_related("submission__page"),
+                apps.get_model("review", "Review").objects.select_related(
+                    "submission__page"
+                ),
+                apps.get_model("activity", "Activity")
+                .objects.select_related("user")
+                .prefetch_related(GenericPrefetch("source", sources)),
+            ],
+        ),
     )
-    for group in user.groups.all():
-        user_group_tasks = user_group_tasks.filter(user_group__id=group.id)
+    return tasks
 
-    return user_tasks.union(user_group_tasks).order_by("-created_at")
+
+def _task_lists_version(user):
+    """The versions of the cached task lists of the user, and of every user"""
+    keys = [TASK_LISTS_VERSION_KEY, f"{TASK_LISTS_VERSION_KEY}:{user.id}"]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = time.time_ns()
+            cache.set(key, versions[key], None)
+    return ":".join(str(versions[key]) for key in keys)
+
+
+def invalidate_task_lists(user=None):
+    """Drop the cached task list of the user, or of every user when the tasks of
+    groups change.
+    """
+    if user is None:
+        cache.delete(TASK_LISTS_VERSION_KEY)
+    else:
+        cache.delete(f"{TASK_LISTS_VERSION_KEY}:{user.id}")
 
 
 def render_task_templates_for_user(request, user):
@@ -211,8 +291,21 @@ def render_task_templates_for_user(request, user):
                  "type":"",
              },
             ]
-    """
-    tasks = get_tasks_for_user(user)
-    templates = [get_task_template(request, task=task) for task in tasks]
 
-    return list(filter(None, templates))
+    The list is cached for `TASK_LIST_CACHE_TIMEOUT` seconds, or until the
+    tasks of the user change.
+    """
+    key = "todo:tasks:{}:{}:{}:{}://{}".format(
+        user.id,
+        _task_lists_version(user),
+        get_language(),
+        request.scheme,
+        request.get_host(),
+    )
+    templates = cache.get(key)
+    if templates is None:
+        tasks = prefetch_related_objects_of_tasks(list(get_tasks_for_user(user)))
+        templates = [get_task_template(request, task=task) for task in tasks]
+        templates = list(filter(None, templates))
+        cache.set(key, templates, settings.TASK_LIST_CACHE_TIMEOUT)
+    return templates
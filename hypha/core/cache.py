@@ -0,0 +1,184 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+CacheStats = namedtuple(
+    "CacheStats", ["local_hits", "remote_hits", "misses", "hit_ratio", "currsize"]
+)
+
+_missing = object()
+
+
+class TieredCache(BaseCache):
+    """A small per process LRU cache in front of a shared cache, e.g. Redis.
+
+    Reads are served from the process while they are fresh, writes go to both
+    tiers. Other processes only see a change once their local copy expires, so
+    `LOCAL_TIMEOUT` bounds how stale a read can be. Values are kept pickled
+    locally, changing a value read from the cache never changes the cache.
+
+    OPTIONS:
+        REMOTE_BACKEND: import path of the shared cache backend, defaults to
+            Django's `RedisCache`. Its options are given in `REMOTE_OPTIONS`.
+        LOCAL_SIZE: number of values kept in the process.
+        LOCAL_TIMEOUT: seconds a value is read from the process.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        remote_backend = import_string(
+            options.get("REMOTE_BACKEND", "django.core.cache.backends.redis.RedisCache")
+        )
+        self.remote = remote_backend(
+            location, {**params, "OPTIONS": options.get("REMOTE_OPTIONS", {})}
+        )
+        self.local_size = int(options.get("LOCAL_SIZE", 1024))
+        self.local_timeout = float(options.get("LOCAL_TIMEOUT", 5))
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, key):
+        with self._lock:
+            try:
+                expires_at, pickled = self._local[key]
+            except KeyError:
+                return _missing
+            if expires_at <= time.monotonic():
+                del self._local[key]
+                return _missing
+            self._local.move_to_end(key)
+            self.local_hits += 1
+        return pickle.loads(pickled)
+
+    def _set_local(self, key, value, timeout=DEFAULT_TIMEOUT):
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is not None and timeout <= 0:
+            self._delete_local(key)
+            return
+        local_timeout = (
+            self.local_timeout if timeout is None else min(timeout, self.local_timeout)
+        )
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (time.monotonic() + local_timeout, pickled)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _delete_local(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._get_local(local_key)
+        if value is not _missing:
+            return value
+
+        value = self.remote.get(key, _missing, version=version)
+        if value is _missing:
+            with self._lock:
+                self.misses += 1
+            return default
+        with self._lock:
+            self.remote_hits += 1
+        self._set_local(local_key, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        values = {}
+        remote_keys = []
+        for key in keys:
+            value = self._get_local(self.make_and_validate_key(key, version=version))
+            if value is _missing:
+                remote_keys.append(key)
+            else:
+                values[key] = value
+
+        if remote_keys:
+            remote_values = self.remote.get_many(remote_keys, version=version)
+            with self._lock:
+                self.remote_hits += len(remote_values)
+                self.misses += len(remote_keys) - len(remote_values)
+            for key, value in remote_values.items():
+                self._set_local(self.make_and_validate_key(key, version=version), value)
+            values.update(remote_values)
+        return values
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        if self._get_local(local_key) is not _missing:
+            return True
+        return self.remote.has_key(key, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self.remote.set(key, value, timeout=timeout, version=version)
+        self._set_local(local_key, value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed_keys = self.remote.set_many(data, timeout=timeout, version=version)
+        for key, value in data.items():
+            local_key = self.make_and_validate_key(key, version=version)
+            if key in failed_keys:
+                self._delete_local(local_key)
+            else:
+                self._set_local(local_key, value, timeout)
+        return failed_keys
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        added = self.remote.add(key, value, timeout=timeout, version=version)
+        if added:
+            self._set_local(local_key, value, timeout)
+        else:
+            self._delete_local(local_key)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._delete_local(self.make_and_validate_key(key, version=version))
+        return self.remote.touch(key, timeout=timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._delete_local(self.make_and_validate_key(key, version=version))
+        return self.remote.incr(key, delta, version=version)
+
+    def delete(self, key, version=None):
+        self._delete_local(self.make_and_validate_key(key, version=version))
+        return self.remote.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._delete_local(self.make_and_validate_key(key, version=version))
+        self.remote.delete_many(keys, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.remote.clear()
+
+    def close(self, **kwargs):
+        self.remote.close(**kwargs)
+
+    def stats(self):
+        """Hits of each tier and the share of reads that were hits, for this
+        process since it started
+        """
+        with self._lock:
+            hits = self.local_hits + self.remote_hits
+            reads = hits + self.misses
+            return CacheStats(
+                self.local_hits,
+                self.remote_hits,
+                self.misses,
+                hits / reads if reads else 0.0,
+                len(self._local),
+            )
@@ -1,16 +1,27 @@
 import copy
-import functools
 import importlib
 import logging
 import re
+import threading
+from collections import OrderedDict, namedtuple
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
 logger = logging.getLogger(__name__)
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+NAVIGATION_SETTINGS = {
+    "APPLY_NAV_MENU_ITEMS",
+    "APPLY_NAV_SUBMISSIONS_ITEMS",
+    "PROJECTS_ENABLED",
+}
+
 
 def _check_permission(user, method_path: str) -> bool:
     """Resolve the method path and check if the user has permission.
@@ -47,9 +58,8 @@ def _calculate_is_active(
     return False
 
 
-@functools.cache
-def get_primary_navigation_items(request):
-    DEFAULT_NAV_ITEMS = [
+def _default_nav_items():
+    return [
         {
             "title": _("My Dashboard"),
             "url": reverse_lazy("dashboard:dashboard"),
@@ -119,14 +129,81 @@ def get_primary_navigation_items(request):
         },
     ]
 
-    """Get the primary navigation items based on user permissions."""
+
+class NavigationCache:
+    """Process wide LRU cache of the navigation items a user may see.
+
+    Permission methods only look at the roles of a user, so users with the
+    same roles share one entry. Items are stored without their active state,
+    which depends on the request path.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, user):
+        if not user.is_authenticated:
+            return (self.version, settings.PROJECTS_ENABLED, None)
+        return (
+            self.version,
+            settings.PROJECTS_ENABLED,
+            frozenset(user.roles),
+            user.is_superuser,
+        )
+
+    def get(self, user, builder):
+        key = self.key(user)
+        with self._lock:
+            try:
+                nav_items = self._entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return nav_items
+
+        nav_items = builder(user)
+
+        with self._lock:
+            self._entries[key] = nav_items
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return nav_items
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.version += 1
+            self.hits = self.misses = 0
+
+
+navigation_cache = NavigationCache(maxsize=settings.NAVIGATION_CACHE_SIZE)
+
+
+@receiver(setting_changed)
+def clear_navigation_cache(*, setting, **kwargs):
+    if setting in NAVIGATION_SETTINGS:
+        navigation_cache.cache_clear()
+
+
+def _permitted_nav_items(user):
+    """The navigation items the user has permission to see"""
     original_nav_items = copy.deepcopy(
-        settings.APPLY_NAV_MENU_ITEMS or DEFAULT_NAV_ITEMS
+        settings.APPLY_NAV_MENU_ITEMS or _default_nav_items()
     )
 
     nav_items = []
-    request_path = request.path
-
     for item in original_nav_items:
         nav_item = item.copy()
 
@@ -139,33 +216,46 @@ def get_primary_navigation_items(request):
         ):
             nav_item["sub_items"] = settings.APPLY_NAV_SUBMISSIONS_ITEMS
 
-        if not _check_permission(request.user, nav_item["permission_method"]):
+        if not _check_permission(user, nav_item["permission_method"]):
             continue
 
+        if sub_items := nav_item.get("sub_items"):
+            nav_item["sub_items"] = [
+                sub_item
+                for sub_item in sub_items
+                if _check_permission(user, sub_item["permission_method"])
+            ]
+
+        nav_items.append(nav_item)
+
+    return nav_items
+
+
+def get_primary_navigation_items(request):
+    """Get the primary navigation items based on user permissions."""
+    request_path = request.path
+
+    nav_items = []
+    for item in navigation_cache.get(request.user, _permitted_nav_items):
+        nav_item = item.copy()
         nav_item["is_active"] = _calculate_is_active(
             nav_item["url"], nav_item.get("active_url_regex"), request_path
         )
 
-        if sub_items := nav_item.get("sub_items"):
-            filtered_sub_items = []
-            any_sub_item_active = False
-
-            for sub_item_original in sub_items:
-                sub_item = sub_item_original.copy()  # Ensure we work with a copy
-                if _check_permission(request.user, sub_item["permission_method"]):
-                    sub_item["is_active"] = _calculate_is_active(
-                        sub_item["url"], sub_item.get("active_url_regex"), request_path
-                    )
-                    if sub_item["is_active"]:
-                        any_sub_item_active = True
-                    filtered_sub_items.append(sub_item)
-
-            nav_item["sub_items"] = filtered_sub_items
+        if "sub_items" in nav_item:
+            sub_items = []
+            for sub_item_original in nav_item["sub_items"]:
+                sub_item = sub_item_original.copy()
+                sub_item["is_active"] = _calculate_is_active(
+                    sub_item["url"], sub_item.get("active_url_regex"), request_path
+                )
+                sub_items.append(sub_item)
+            nav_item["sub_items"] = sub_items
 
             # If any sub-item is active, mark the main item as active
             # This ensures parent tab is highlighted if a child is active,
             # even if the parent's own URL/regex didn't match.
-            if any_sub_item_active:
+            if any(sub_item["is_active"] for sub_item in sub_items):
                 nav_item["is_active"] = True
 
         nav_items.append(nav_item)
@@ -0,0 +1,182 @@
+import datetime
+import json
+from typing import List, Optional, Sequence
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
+from django.utils.functional import cached_property
+
+CURSOR_SALT = "hypha.core.paginator.cursor"
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # Keep the microseconds DjangoJSONEncoder drops, the cursor must match
+        # the stored value exactly
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class CursorSerializer:
+    """Signing serializer that also handles the dates and decimals of sort keys."""
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"), cls=CursorEncoder).encode(
+            "latin-1"
+        )
+
+    def loads(self, data):
+        return json.loads(data.decode("latin-1"))
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        object_list: List,
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @cached_property
+    def next_cursor(self) -> Optional[str]:
+        if self._has_next and self.object_list:
+            return self.paginator.make_cursor(self.object_list[-1])
+
+    @cached_property
+    def previous_cursor(self) -> Optional[str]:
+        if self._has_previous and self.object_list:
+            return self.paginator.make_cursor(self.object_list[0], backwards=True)
+
+
+class KeysetPaginator:
+    """Paginate a queryset by seeking past the sort keys of the last row shown.
+
+    Unlike `django.core.paginator.Paginator` no `OFFSET` is used, so every page
+    costs the same however deep it is, and the total is only counted when it is
+    asked for. Pages are addressed with opaque, signed cursors instead of page
+    numbers.
+
+    `ordering` is a list of field or annotation names, prefixed with "-" for
+    descending order, ending with a unique key (usually "-id"). Rows with a
+    null sort key are always placed last.
+
+    Usage:
+        paginator = KeysetPaginator(qs, ["-submit_time", "-id"], per_page=60)
+        page = paginator.page(request.GET.get("cursor"))
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        ordering: Sequence[str],
+        per_page: int,
+        count_limit: int = 1000,
+    ):
+        self.queryset = queryset
+        self.ordering = [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+        self.per_page = per_page
+        self.count_limit = count_limit
+
+    @cached_property
+    def _limited_count(self) -> int:
+        return self.queryset.order_by().values("pk")[: self.count_limit + 1].count()
+
+    @property
+    def count(self) -> int:
+        """Number of rows, counted up to `count_limit`"""
+        return min(self._limited_count, self.count_limit)
+
+    @property
+    def count_is_limited(self) -> bool:
+        """Whether there are more rows than `count`"""
+        return self._limited_count > self.count_limit
+
+    def make_cursor(self, obj, backwards: bool = False) -> str:
+        values = [getattr(obj, name) for name, _ in self.ordering]
+        return signing.dumps(
+            {"v": values, "b": backwards},
+            salt=CURSOR_SALT,
+            serializer=CursorSerializer,
+            compress=True,
+        )
+
+    def read_cursor(self, cursor: Optional[str]):
+        if not cursor:
+            return None, False
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT, serializer=CursorSerializer)
+            values, backwards = data["v"], data["b"]
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            # Tampered or outdated cursors fall back to the first page
+            return None, False
+        if len(values) != len(self.ordering):
+            return None, False
+        return values, backwards
+
+    def ordering_expressions(self, backwards: bool = False):
+        """The `order_by()` arguments for the ordering the pages follow"""
+        # When walking backwards the order is reversed, nulls included
+        nulls = {"nulls_first": True} if backwards else {"nulls_last": True}
+        return [
+            F(name).desc(**nulls) if descending != backwards else F(name).asc(**nulls)
+            for name, descending in self.ordering
+        ]
+
+    def _seek(self, values, backwards: bool) -> Q:
+        """Rows strictly after `values` in the (possibly reversed) ordering"""
+        seek = Q(pk__in=[])
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, values, strict=True):
+            descending = descending != backwards
+            if value is None:
+                # Nulls are last going forwards, first going backwards
+                after = Q(**{f"{name}__isnull": False}) if backwards else Q(pk__in=[])
+                seek |= equal & after
+                equal &= Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if not backwards:
+                    after |= Q(**{f"{name}__isnull": True})
+                seek |= equal & after
+                equal &= Q(**{name: value})
+        return seek
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        values, backwards = self.read_cursor(cursor)
+
+        queryset = self.queryset.order_by(*self.ordering_expressions(backwards))
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, backwards))
+
+        object_list = list(queryset[: self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[: self.per_page]
+
+        if backwards:
+            object_list.reverse()
+            return KeysetPage(object_list, self, has_next=True, has_previous=has_more)
+        return KeysetPage(
+            object_list, self, has_next=has_more, has_previous=values is not None
+        )
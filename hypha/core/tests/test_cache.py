@@ -0,0 +1,100 @@
+"""Tests for core/cache.py, with a local memory cache standing in for Redis."""
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from hypha.core.cache import TieredCache
+
+
+def tiered_cache(**options):
+    return TieredCache(
+        "tiered-cache-tests",
+        {
+            "OPTIONS": {
+                "REMOTE_BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                **options,
+            }
+        },
+    )
+
+
+class TestTieredCache(SimpleTestCase):
+    def setUp(self):
+        self.cache = tiered_cache()
+        # A second process sharing the same remote cache
+        self.other = tiered_cache()
+        self.cache.clear()
+
+    def test_read_after_write_served_locally(self):
+        self.cache.set("key", "value")
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertEqual(self.cache.stats().local_hits, 1)
+
+    def test_other_process_reads_from_remote_then_locally(self):
+        self.cache.set("key", "value")
+        self.assertEqual(self.other.get("key"), "value")
+        self.assertEqual(self.other.get("key"), "value")
+
+        stats = self.other.stats()
+        self.assertEqual((stats.local_hits, stats.remote_hits), (1, 1))
+
+    def test_changes_of_other_process_seen_after_local_timeout(self):
+        self.cache.set("key", "old")
+        self.assertEqual(self.other.get("key"), "old")
+        self.cache.set("key", "new")
+
+        self.assertEqual(self.other.get("key"), "old")
+        with mock.patch("hypha.core.cache.time.monotonic", return_value=10**9):
+            self.assertEqual(self.other.get("key"), "new")
+
+    def test_delete_removes_both_tiers(self):
+        self.cache.set("key", "value")
+        self.cache.delete("key")
+        self.assertIsNone(self.cache.get("key"))
+        self.assertIsNone(self.other.get("key"))
+
+    def test_stored_none_is_a_hit(self):
+        self.cache.set("key", None)
+        self.assertIsNone(self.other.get("key", "default"))
+        self.assertEqual(self.other.stats().misses, 0)
+
+    def test_changing_read_value_keeps_cached_value(self):
+        self.cache.set("key", ["a"])
+        self.cache.get("key").append("b")
+        self.assertEqual(self.cache.get("key"), ["a"])
+
+    def test_get_many_mixes_tiers(self):
+        self.other.set("remote", 1)
+        self.cache.set("local", 2)
+
+        values = self.cache.get_many(["local", "remote", "missing"])
+
+        self.assertEqual(values, {"local": 2, "remote": 1})
+        stats = self.cache.stats()
+        self.assertEqual((stats.local_hits, stats.remote_hits, stats.misses), (1, 1, 1))
+
+    def test_incr_uses_remote_value(self):
+        self.cache.set("counter", 1)
+        self.other.incr("counter")
+        self.assertEqual(self.cache.incr("counter"), 3)
+        self.assertEqual(self.cache.get("counter"), 3)
+
+    def test_add_only_sets_missing_keys(self):
+        self.assertTrue(self.cache.add("key", "first"))
+        self.assertFalse(self.other.add("key", "second"))
+        self.assertEqual(self.other.get("key"), "first")
+
+    def test_local_tier_is_bounded(self):
+        cache = tiered_cache(LOCAL_SIZE=10)
+        for i in range(100):
+            cache.set(f"key-{i}", i)
+
+        self.assertEqual(cache.stats().currsize, 10)
+        self.assertEqual(cache.get("key-0"), 0)
+
+    def test_hit_ratio(self):
+        self.cache.set("key", "value")
+        self.cache.get("key")
+        self.cache.get("missing")
+        self.assertEqual(self.cache.stats().hit_ratio, 0.5)
@@ -1,8 +1,15 @@
-"""Tests for core/navigation.py pure helper functions."""
+"""Tests for core/navigation.py."""
 
-from django.test import SimpleTestCase
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
 
-from hypha.core.navigation import _calculate_is_active, _check_permission
+from hypha.apply.users.tests.factories import ApplicantFactory, StaffFactory
+from hypha.core.navigation import (
+    _calculate_is_active,
+    _check_permission,
+    get_primary_navigation_items,
+    navigation_cache,
+)
 
 
 class TestCalculateIsActive(SimpleTestCase):
@@ -67,3 +74,57 @@ class TestCheckPermission(SimpleTestCase):
         user.is_apply_staff = True
         result = _check_permission(user, "hypha.apply.users.decorators.is_apply_staff")
         self.assertTrue(result)
+
+
+class TestPrimaryNavigationItems(TestCase):
+    def setUp(self):
+        navigation_cache.cache_clear()
+        self.factory = RequestFactory()
+
+    def get_items(self, user, path="/"):
+        request = self.factory.get(path)
+        request.user = user
+        return get_primary_navigation_items(request)
+
+    def test_items_filtered_by_role(self):
+        staff_titles = [item["title"] for item in self.get_items(StaffFactory())]
+        applicant_titles = [
+            item["title"] for item in self.get_items(ApplicantFactory())
+        ]
+
+        self.assertIn("Submissions", staff_titles)
+        self.assertEqual(applicant_titles, ["My Dashboard"])
+
+    def test_users_with_same_roles_share_items(self):
+        self.get_items(StaffFactory())
+        self.get_items(StaffFactory())
+        self.get_items(ApplicantFactory())
+
+        info = navigation_cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 2))
+
+    def test_active_state_follows_request_path(self):
+        staff = StaffFactory()
+        submissions = reverse("apply:submissions:list")
+
+        on_dashboard = self.get_items(staff, reverse("dashboard:dashboard"))
+        on_submissions = self.get_items(staff, submissions)
+
+        self.assertTrue(on_dashboard[0]["is_active"])
+        self.assertFalse(on_submissions[0]["is_active"])
+        self.assertTrue(on_submissions[1]["is_active"])
+        self.assertTrue(on_submissions[1]["sub_items"][0]["is_active"])
+
+    def test_cache_stays_bounded(self):
+        staff = StaffFactory()
+        for i in range(1000):
+            self.get_items(staff, f"/submissions/{i}/")
+
+        info = navigation_cache.cache_info()
+        self.assertEqual(info.currsize, 1)
+        self.assertEqual(info.hits, 999)
+
+    @override_settings(PROJECTS_ENABLED=False)
+    def test_projects_hidden_when_disabled(self):
+        titles = [item["title"] for item in self.get_items(StaffFactory())]
+        self.assertNotIn("Projects", titles)
@@ -0,0 +1,98 @@
+"""Tests for core/paginator.py."""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from hypha.apply.activity.tests.factories import ActivityFactory
+from hypha.apply.funds.models import ApplicationSubmission
+from hypha.apply.funds.tests.factories import ApplicationSubmissionFactory
+from hypha.core.paginator import KeysetPaginator
+
+
+def walk_forward(paginator):
+    pages = [paginator.page()]
+    while pages[-1].has_next():
+        pages.append(paginator.page(pages[-1].next_cursor))
+    return pages
+
+
+class TestKeysetPaginator(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.submissions = ApplicationSubmissionFactory.create_batch(5, submit_time=now)
+        # Two share the latest time, the ids break the tie
+        for days, submission in enumerate(self.submissions[2:], start=1):
+            submission.submit_time = now - timedelta(days=days)
+            submission.save()
+
+        self.expected = sorted(
+            self.submissions, key=lambda s: (s.submit_time, s.id), reverse=True
+        )
+
+    def paginator(self, per_page=2):
+        return KeysetPaginator(
+            ApplicationSubmission.objects.all(),
+            ["-submit_time", "-id"],
+            per_page=per_page,
+        )
+
+    def test_pages_cover_every_row_once(self):
+        pages = walk_forward(self.paginator())
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(
+            [submission for page in pages for submission in page], self.expected
+        )
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[-1].has_previous())
+
+    def test_previous_returns_the_same_page(self):
+        paginator = self.paginator()
+        pages = walk_forward(paginator)
+
+        previous = paginator.page(pages[-1].previous_cursor)
+        self.assertEqual(previous.object_list, pages[1].object_list)
+        self.assertTrue(previous.has_next())
+
+        first = paginator.page(previous.previous_cursor)
+        self.assertEqual(first.object_list, pages[0].object_list)
+        self.assertFalse(first.has_previous())
+
+    def test_null_keys_are_last(self):
+        first, second, *_ = self.submissions
+        ActivityFactory(source=first, timestamp=timezone.now() - timedelta(days=1))
+        ActivityFactory(source=second, timestamp=timezone.now())
+        paginator = KeysetPaginator(
+            ApplicationSubmission.objects.with_summary(),
+            ["-last_update", "-id"],
+            per_page=2,
+        )
+
+        rows = [submission for page in walk_forward(paginator) for submission in page]
+
+        self.assertEqual(rows[:2], [second, first])
+        self.assertEqual(
+            rows[2:], sorted(self.submissions[2:], key=lambda s: s.id, reverse=True)
+        )
+
+    def test_invalid_cursor_gives_first_page(self):
+        paginator = self.paginator()
+        cursor = paginator.page().next_cursor
+
+        page = paginator.page(cursor[:-2] + "xx")
+        self.assertEqual(page.object_list, self.expected[:2])
+
+    def test_count_is_limited(self):
+        paginator = KeysetPaginator(
+            ApplicationSubmission.objects.all(),
+            ["-id"],
+            per_page=2,
+            count_limit=3,
+        )
+        self.assertEqual(paginator.count, 3)
+        self.assertTrue(paginator.count_is_limited)
+
+        self.assertEqual(self.paginator().count, 5)
+        self.assertFalse(self.paginator().count_is_limited)
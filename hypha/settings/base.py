@@ -320,6 +320,18 @@ EMAIL_USE_SSL = env.bool("EMAIL_USE_SSL", False)
 EMAIL_SUBJECT_PREFIX = env.str("EMAIL_SUBJECT_PREFIX", "")
 SERVER_EMAIL = DEFAULT_FROM_EMAIL = env.str("SERVER_EMAIL", None)
 
+# Number of notification emails sent per task, over one connection.
+EMAIL_BATCH_SIZE = env.int("EMAIL_BATCH_SIZE", 50)
+
+# Seconds during which emails and Slack messages of the coalesced types are held back, to be sent to each recipient as one.
+MESSAGE_COALESCE_WINDOW = env.int("MESSAGE_COALESCE_WINDOW", 0)
+MESSAGE_COALESCE_TYPES = env.list(
+    "MESSAGE_COALESCE_TYPES", ["NEW_SUBMISSION", "COMMENT", "READY_FOR_REVIEW"]
+)
+
+# Limit on the email tasks a worker runs, e.g. "10/m", to stay within the rate limit of the email provider.
+EMAIL_RATE_LIMIT = env.str("EMAIL_RATE_LIMIT", None)
+
 
 # Cache settings
 
@@ -332,6 +344,18 @@ CACHE_CONTROL_S_MAXAGE = env.int("CACHE_CONTROL_S_MAXAGE", 3600)
 # Set feed cache timeout (automatic cache refresh).
 FEED_CACHE_TIMEOUT = 600
 
+# Number of compiled form definitions (form_fields) kept in memory per process.
+FORM_SCHEMA_CACHE_SIZE = env.int("FORM_SCHEMA_CACHE_SIZE", 256)
+
+# Seconds the status, fund, round, lead and tag counts of the submission list are cached.
+SUBMISSION_FACETS_CACHE_TIMEOUT = env.int("SUBMISSION_FACETS_CACHE_TIMEOUT", 60)
+
+# Seconds the task list of a staff user is cached.
+TASK_LIST_CACHE_TIMEOUT = env.int("TASK_LIST_CACHE_TIMEOUT", 300)
+
+# Seconds the rendered answers of a submission revision are cached.
+RENDERED_ANSWERS_CACHE_TIMEOUT = env.int("RENDERED_ANSWERS_CACHE_TIMEOUT", 86400)
+
 # Set X-Frame-Options header for every outgoing HttpResponse
 X_FRAME_OPTIONS = "SAMEORIGIN"
 
@@ -345,6 +369,7 @@ CACHES = {
 # Use a more permanent cache for django-file-form.
 # It uses it to store metadata about files while they are being uploaded.
 # This might reduce the likelihood of any interruptions on heroku.
+# It stays in the database when the default cache is moved to Redis.
 # NB It doesn't matter what the `KEY_PREFIX` is,
 # `clear_cache` will clear all caches with the same `LOCATION`.
 CACHES["django_file_form"] = {
@@ -544,6 +569,27 @@ REDIS_URL = env.str("REDIS_URL", None)
 # Used to set the cert verification mode - needs to be `CERT_REQUIRED`, `CERT_OPTIONAL` or `CERT_NONE`
 REDIS_SSL_CERT_REQS = env.str("REDIS_SSL_CERT_REQS", "CERT_REQUIRED")
 
+REDIS_CERT_PARAM = ""
+if REDIS_URL and REDIS_URL.startswith("rediss") and REDIS_SSL_CERT_REQS:
+    check_hostname = str(REDIS_SSL_CERT_REQS != "CERT_NONE").lower()
+    REDIS_CERT_PARAM = (
+        f"?ssl_cert_reqs={REDIS_SSL_CERT_REQS}&ssl_check_hostname={check_hostname}"
+    )
+
+# Use Redis for the default cache when it is available, with a small cache in each process in front of it.
+# Database 1 is used so clearing the cache doesn't touch the Celery queues.
+if REDIS_URL and env.bool("REDIS_CACHE_ENABLED", True):
+    CACHES["default"] = {
+        "BACKEND": "hypha.core.cache.TieredCache",
+        "LOCATION": f"{REDIS_URL}/1{REDIS_CERT_PARAM}",
+        "OPTIONS": {
+            # Number of values kept in each process.
+            "LOCAL_SIZE": env.int("CACHE_LOCAL_SIZE", 1024),
+            # Seconds a value is read from the process before asking Redis again.
+            "LOCAL_TIMEOUT": env.int("CACHE_LOCAL_TIMEOUT", 5),
+        },
+    }
+
 # Celery settings
 # Sync by default - set `CELERY_TASK_ALWAYS_EAGER` to false and the celery broker URLs to the configured broker to enabled async
 # https://docs.celeryq.dev/en/stable/getting-started/first-steps-with-celery.html
@@ -554,14 +600,8 @@ CELERY_RESULT_BACKEND = env.str("CELERY_RESULT_BACKEND", None)
 # Logic is somewhat Heroku specific as Heroku's Key-Value Store addon auto sets the REDIS_URL env var.
 # If `CELERY_BROKER_URL` or `CELERY_RESULT_BACKEND` is set, it will ignore `REDIS_URL`
 if REDIS_URL and not (CELERY_BROKER_URL or CELERY_RESULT_BACKEND):
-    cert_param = ""
-    if REDIS_URL.startswith("rediss") and REDIS_SSL_CERT_REQS:
-        check_hostname = str(REDIS_SSL_CERT_REQS != "CERT_NONE").lower()
-        cert_param = (
-            f"?ssl_cert_reqs={REDIS_SSL_CERT_REQS}&ssl_check_hostname={check_hostname}"
-        )
-    CELERY_BROKER_URL = f"{REDIS_URL}/0{cert_param}"
-    CELERY_RESULT_BACKEND = f"{REDIS_URL}{cert_param}"
+    CELERY_BROKER_URL = f"{REDIS_URL}/0{REDIS_CERT_PARAM}"
+    CELERY_RESULT_BACKEND = f"{REDIS_URL}{REDIS_CERT_PARAM}"
     # Manipulation of the environ vars is needed due to how celery processes & prioritizes settings
     # for more info, see https://github.com/celery/celery/issues/4284
     os.environ["CELERY_BROKER_URL"] = CELERY_BROKER_URL
@@ -601,6 +641,9 @@ APPLY_NAV_MENU_ITEMS = env.json("APPLY_NAV_MENU_ITEMS", {})
 APPLY_NAV_SUBMISSIONS_ITEMS = env.json("APPLY_NAV_SUBMISSIONS_ITEMS", {})
 APPLY_NAV_PROJECTS_ITEMS = env.json("APPLY_NAV_PROJECTS_ITEMS", {})
 
+# Number of role combinations whose navigation items are kept in memory per process.
+NAVIGATION_CACHE_SIZE = env.int("NAVIGATION_CACHE_SIZE", 64)
+
 # Basic auth settings
 if env.bool("BASIC_AUTH_ENABLED", False):
     MIDDLEWARE.insert(0, "baipw.middleware.BasicAuthIPWhitelistMiddleware")
@@ -92,6 +92,7 @@ MIDDLEWARE = [
     "hypha.apply.users.middleware.SocialAuthExceptionMiddleware",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
     "hypha.apply.middleware.HandleProtectionErrorMiddleware",
+    "hypha.apply.middleware.PermissionCacheMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
     "hypha.core.middleware.htmx.HtmxMessageMiddleware",
     "hypha.core.middleware.htmx.HtmxAuthRedirectMiddleware",